@@ -1,10 +1,12 @@
-from kafka import KafkaProducer
+from confluent_kafka import Producer
 from minio import Minio
-import pandas as pd
-import json
+import pyarrow.parquet as pq
+import orjson
 import io
+import logging
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # -----------------------------
 # Load config từ env
@@ -14,9 +16,28 @@ MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY")
 MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY")
 MINIO_BUCKET = os.getenv("MINIO_BUCKET")
 MINIO_PREFIX = os.getenv("MINIO_PREFIX", "data-source")
+MINIO_FETCH_WORKERS = int(os.getenv("MINIO_FETCH_WORKERS", "16"))
+PARQUET_BATCH_SIZE = int(os.getenv("PARQUET_BATCH_SIZE", "10000"))
+CHECKPOINT_FILE = os.getenv("CHECKPOINT_FILE", "last_processed.txt")
 
 KAFKA_BOOTSTRAP = os.getenv("KAFKA_BOOTSTRAP")
 KAFKA_TOPIC = os.getenv("KAFKA_TOPIC")
+KAFKA_POLL_EVERY = int(os.getenv("KAFKA_POLL_EVERY", "1000"))
+KAFKA_QUEUE_MAX_MESSAGES = 100000
+# Force an interim flush before the local queue is full (avoid client OOM)
+KAFKA_FLUSH_THRESHOLD = int(KAFKA_QUEUE_MAX_MESSAGES * 0.8)
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+# -----------------------------
+# Logging
+# -----------------------------
+logging.basicConfig(
+    level=LOG_LEVEL,
+    format="%(asctime)s %(levelname)s: %(message)s",
+    handlers=[logging.StreamHandler()],
+)
+logger = logging.getLogger("minio_to_kafka")
 
 # -----------------------------
 # MinIO client
@@ -29,17 +50,38 @@ minio_client = Minio(
 )
 
 # -----------------------------
-# Kafka producer
+# Kafka producer (librdkafka)
 # -----------------------------
-producer = KafkaProducer(
-    bootstrap_servers=KAFKA_BOOTSTRAP,
-    value_serializer=lambda v: json.dumps(v).encode('utf-8')
-)
+producer = Producer({
+    "bootstrap.servers": KAFKA_BOOTSTRAP,
+    "linger.ms": 20,
+    "batch.num.messages": 20000,
+    "compression.type": "lz4",
+    "acks": 0,
+    "queue.buffering.max.kbytes": 65536,
+    "queue.buffering.max.messages": KAFKA_QUEUE_MAX_MESSAGES,
+})
 
 # -----------------------------
-# Memory-based tracking processed files
+# Cursor-based tracking processed files
 # -----------------------------
-processed_files = set()
+# MinIO lists keys in lexicographic order, so the greatest handled key is
+# enough to resume with `start_after`; keys must sort by arrival (e.g. dated
+# prefixes) for new files to land after the cursor.
+def load_checkpoint():
+    try:
+        with open(CHECKPOINT_FILE, "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def save_checkpoint(object_name):
+    tmp_path = f"{CHECKPOINT_FILE}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(object_name)
+    os.replace(tmp_path, CHECKPOINT_FILE)
+
+last_processed = load_checkpoint()
 
 # -----------------------------
 # Helper: read object from MinIO
@@ -52,54 +94,131 @@ def read_file_from_minio(bucket, object_name):
     return data
 
 # -----------------------------
-# Main loop
+# Helper: produce a batch of records to Kafka
 # -----------------------------
-while True:
-    try:
-        objects = minio_client.list_objects(MINIO_BUCKET, prefix=MINIO_PREFIX, recursive=True)
-
-        for obj in objects:
-            if obj.object_name in processed_files:
-                continue
-
-            print(f"Processing new file: {obj.object_name}")
-            data = read_file_from_minio(MINIO_BUCKET, obj.object_name)
-
-            records = []
-
-            if obj.object_name.endswith(".json"):
-                try:
-                    parsed = json.loads(data.decode("utf-8"))
-                    if isinstance(parsed, dict):
-                        records = [parsed]
-                    elif isinstance(parsed, list):
-                        records = parsed
-                except Exception as e:
-                    print(f"Failed to parse JSON {obj.object_name}: {e}")
-                    continue
-
-            elif obj.object_name.endswith(".parquet"):
-                try:
-                    df = pd.read_parquet(io.BytesIO(data))
-                    records = df.to_dict(orient="records")
-                except Exception as e:
-                    print(f"Failed to parse Parquet {obj.object_name}: {e}")
-                    continue
-
+def produce_records(records):
+    count = 0
+    # Per-record logging only when explicitly enabled; it is costly on the hot path
+    debug = logger.isEnabledFor(logging.DEBUG)
+    for count, r in enumerate(records, 1):
+        value = orjson.dumps(r, default=str)
+        try:
+            producer.produce(KAFKA_TOPIC, value=value)
+        except BufferError:
+            # Local queue full: serve delivery callbacks and retry once
+            producer.poll(1)
+            producer.produce(KAFKA_TOPIC, value=value)
+        if debug:
+            logger.debug("Sent record: %s", r)
+        if count % KAFKA_POLL_EVERY == 0:
+            if len(producer) >= KAFKA_FLUSH_THRESHOLD:
+                producer.flush(timeout=30)
             else:
-                print(f"Unknown file type, skipping: {obj.object_name}")
-                continue
+                producer.poll(0)
+    return count
 
-            for r in records:
-                producer.send(KAFKA_TOPIC, value=r)
-                print(f"Sent record: {r}")
+# -----------------------------
+# Worker: fetch + parse + produce one object
+# -----------------------------
+def process_object(object_name):
+    logger.debug("Processing new file: %s", object_name)
+    data = read_file_from_minio(MINIO_BUCKET, object_name)
+    sent = 0
+
+    if object_name.endswith(".json"):
+        try:
+            parsed = orjson.loads(data)
+        except Exception as e:
+            logger.warning("Failed to parse JSON %s: %s", object_name, e)
+            return None
+        if isinstance(parsed, dict):
+            sent = produce_records([parsed])
+        elif isinstance(parsed, list):
+            sent = produce_records(parsed)
+
+    elif object_name.endswith(".parquet"):
+        try:
+            # Stream row groups so peak memory stays O(batch) instead of O(file)
+            parquet_file = pq.ParquetFile(io.BytesIO(data))
+            for batch in parquet_file.iter_batches(batch_size=PARQUET_BATCH_SIZE):
+                sent += produce_records(batch.to_pylist())
+        except Exception as e:
+            logger.warning("Failed to parse Parquet %s: %s", object_name, e)
+            return None
+
+    else:
+        logger.info("Unknown file type, skipping: %s", object_name)
+        return None
+
+    logger.info("file=%s sent=%d", object_name, sent)
+    return object_name
 
-            producer.flush()
-            print(f"Finished file: {obj.object_name}")
+# -----------------------------
+# Batch processing + checkpointing
+# -----------------------------
+executor = ThreadPoolExecutor(max_workers=MINIO_FETCH_WORKERS)
+
+def process_batch(names):
+    """Process objects concurrently, flush once, then advance the cursor.
+
+    Returns False when an object failed; the cursor then stops before it so the
+    next drain retries it (and anything after it).
+    """
+    global last_processed
+
+    names = sorted(names)
+    futures = [executor.submit(process_object, name) for name in names]
+
+    cursor = last_processed
+    ok = True
+    for name, future in zip(names, futures):
+        try:
+            future.result()
+        except Exception as e:
+            logger.error("Error processing %s: %s", name, e)
+            ok = False
+            continue
+        if ok and (cursor is None or name > cursor):
+            cursor = name
+
+    # One flush per batch (not per file) before the cursor moves forward
+    if names:
+        remaining = producer.flush(timeout=30)
+        if remaining:
+            logger.warning("%d messages still queued after flush; keeping cursor", remaining)
+            return False
+
+    if cursor != last_processed:
+        save_checkpoint(cursor)
+        last_processed = cursor
+    return ok
+
+def drain_backlog():
+    objects = minio_client.list_objects(
+        MINIO_BUCKET, prefix=MINIO_PREFIX, recursive=True, start_after=last_processed
+    )
+    return process_batch([obj.object_name for obj in objects])
 
-            processed_files.add(obj.object_name)
+# -----------------------------
+# Main loop: subscribe, drain backlog, then drain again on every notification
+# -----------------------------
+# Notifications are only a wake-up signal: each one triggers a `start_after`
+# drain instead of processing the notified keys directly. An object created
+# before the subscription took effect has no event of its own, and the cursor
+# only moves forward through ordered listings, so the next drain still picks
+# it up instead of skipping past it.
+while True:
+    try:
+        with minio_client.listen_bucket_notification(
+            MINIO_BUCKET, prefix=MINIO_PREFIX, events=["s3:ObjectCreated:*"]
+        ) as events:
+            if drain_backlog():
+                for event in events:
+                    if event.get("Records") and not drain_backlog():
+                        # Retry the failed object after a pause
+                        break
 
     except Exception as e:
-        print(f"Error in main loop: {e}")
+        logger.error("Error in main loop: %s", e)
 
     time.sleep(10)
@@ -1,20 +1,18 @@
 from kafka import KafkaProducer
-import json
+import orjson
 import time
 
 bootstrap_servers = 'kafka-cluster-kafka-bootstrap:9092'  # Kafka service trong k8s
 topic_name = 'test'
 
-producer = KafkaProducer(
-    bootstrap_servers=bootstrap_servers,
-    key_serializer=lambda k: k.encode('utf-8'),
-    value_serializer=lambda v: json.dumps(v).encode('utf-8')
-)
+# Keys/values are serialized to bytes in the calling thread, so the sender
+# thread never calls back into Python serializers.
+producer = KafkaProducer(bootstrap_servers=bootstrap_servers)
 
 for i in range(20):
     key = f"user-{i}"
     value = {"id": i, "name": f"User {i}"}
-    producer.send(topic_name, key=key, value=value)
+    producer.send(topic_name, key=key.encode('utf-8'), value=orjson.dumps(value))
     print(f"Sent: {key} -> {value}")
     time.sleep(1)
 
@@ -6,7 +6,7 @@ Generate a CSV metadata catalog from a rooted data folder. This module is writte
 English with clear docstrings, type annotations and a small CLI for reuse in pipelines.
 
 Primary function:
-- generate_metadata(root_dir: str | Path, out_csv: str | Path) -> int
+- generate_metadata(root_dir, out_csv, max_workers=None, keys_cache_path=None) -> int
 
 It detects whether each unit folder contains a data.json and screenshot file(s),
 collects top-level JSON keys, and writes a metadata CSV containing one row per unit.
@@ -18,16 +18,28 @@ Notes:
 from __future__ import annotations
 
 import csv
-import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
+
+import orjson
 
 # Mappings and defaults (kept from original repository)
 SOURCE_SYSTEM = os.environ.get("SOURCE_SYSTEM", "vncredittrust")
 
+# Image suffixes (lowercase) that count as a unit screenshot
+SCREENSHOT_EXT = (".png", ".jpg", ".jpeg", ".webp")
+
+# Sidecar cache of parsed data.json keys: path -> [st_size, st_mtime_ns, keys]
+DEFAULT_KEYS_CACHE = os.environ.get(
+    "METADATA_KEYS_CACHE", str(Path.home() / ".cache" / "vncredittrust" / "metadata_keys.json")
+)
+KeysCache = Dict[str, list]
+
 # Organization mapping (category -> Vietnamese uppercase display name)
 organization_name_mapping = {
     "cong_ty_tai_chinh": "CÔNG TY TÀI CHÍNH",
@@ -121,6 +133,18 @@ unit_name_mapping = {
 }
 
 
+@lru_cache(maxsize=None)
+def organization_display_name(category_name: str) -> str:
+    """Return the display name for a category, uppercasing unknown codes once."""
+    return organization_name_mapping.get(category_name) or category_name.upper()
+
+
+@lru_cache(maxsize=None)
+def unit_display_name(unit_code: str) -> str:
+    """Return the display name for a unit, uppercasing unknown codes once."""
+    return unit_name_mapping.get(unit_code) or unit_code.upper()
+
+
 # Configure simple logging
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger("generate_metadata")
@@ -137,8 +161,7 @@ def find_json_keys(json_path: str | Path) -> List[str]:
         return []
 
     try:
-        with path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = orjson.loads(path.read_bytes())
     except Exception:
         return []
 
@@ -152,9 +175,71 @@ def find_json_keys(json_path: str | Path) -> List[str]:
     return sorted(keys)
 
 
-def generate_metadata(root_dir: str | Path, out_csv: str | Path) -> int:
+def load_keys_cache(cache_path: str | Path) -> KeysCache:
+    """Load the json-keys sidecar cache; a missing or corrupt file yields {}."""
+    try:
+        cache = orjson.loads(Path(cache_path).read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_keys_cache(cache_path: str | Path, cache: KeysCache) -> None:
+    """Atomically persist the json-keys sidecar cache."""
+    path = Path(cache_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(orjson.dumps(cache))
+    os.replace(tmp_path, path)
+
+
+def _scan_unit(unit: Path, keys_cache: Optional[KeysCache] = None) -> Tuple[bool, bool, List[str], Optional[list]]:
+    """Return (has_json, has_screenshot, json_keys, cache_entry) for a single unit folder.
+
+    When keys_cache is given, data.json is only parsed if its (size, mtime_ns)
+    differs from the cached entry; cache_entry is the up-to-date entry to store.
+    """
+    # Single readdir pass; DirEntry.is_file() reuses the cached d_type
+    json_entry: Optional[os.DirEntry] = None
+    has_screenshot = False
+    with os.scandir(unit) as it:
+        for entry in it:
+            if not entry.is_file():
+                continue
+            if entry.name == "data.json":
+                json_entry = entry
+                continue
+            name_lower = entry.name.lower()
+            if name_lower.endswith(SCREENSHOT_EXT) and "screenshot" in name_lower:
+                has_screenshot = True
+
+    if json_entry is None:
+        return False, has_screenshot, [], None
+
+    if keys_cache is None:
+        return True, has_screenshot, find_json_keys(json_entry.path), None
+
+    st = json_entry.stat()
+    cached = keys_cache.get(json_entry.path)
+    if cached is not None and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+        return True, has_screenshot, cached[2], cached
+
+    json_keys = find_json_keys(json_entry.path)
+    return True, has_screenshot, json_keys, [st.st_size, st.st_mtime_ns, json_keys]
+
+
+def generate_metadata(
+    root_dir: str | Path,
+    out_csv: str | Path,
+    max_workers: Optional[int] = None,
+    keys_cache_path: str | Path | None = None,
+) -> int:
     """Walk the root_dir and generate a metadata CSV stored at out_csv.
 
+    Unit folders are scanned concurrently (readdir + JSON parsing are I/O bound);
+    rows keep the sorted (category, unit) order so ids stay deterministic.
+    When keys_cache_path is set, unchanged data.json files are not re-parsed.
+
     Returns the number of rows written.
     Raises FileNotFoundError if root_dir does not exist.
     """
@@ -164,49 +249,15 @@ def generate_metadata(root_dir: str | Path, out_csv: str | Path) -> int:
     if not root.is_dir():
         raise FileNotFoundError(f"root_dir not found: {root}")
 
-    rows = []
     ingestion_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    id_counter = 1
 
-    for category in sorted(p for p in root.iterdir() if p.is_dir()):
-        category_name = category.name
-        organization_code = category_name
-        organization_name = organization_name_mapping.get(category_name, category_name.upper())
+    units = [
+        (category, unit)
+        for category in sorted(p for p in root.iterdir() if p.is_dir())
+        for unit in sorted(p for p in category.iterdir() if p.is_dir())
+    ]
 
-        for unit in sorted(p for p in category.iterdir() if p.is_dir()):
-            unit_name_on_disk = unit.name
-            rel_unit_path = f"{category_name}/{unit_name_on_disk}/"
-
-            data_json_path = unit / "data.json"
-            has_json = data_json_path.exists()
-
-            has_screenshot = any(
-                (f.name.lower().endswith(('.png', '.jpg', '.jpeg', '.webp')) and 'screenshot' in f.name.lower())
-                for f in unit.iterdir()
-                if f.is_file()
-            )
-
-            json_keys = find_json_keys(data_json_path) if has_json else []
-
-            unit_display_name = unit_name_mapping.get(unit_name_on_disk, unit_name_on_disk.upper())
-
-            rows.append({
-                "id": id_counter,
-                "organization_code": organization_code,
-                "organization_name": organization_name,
-                "unit_code": unit_name_on_disk,
-                "unit_name": unit_display_name,
-                "source_system": SOURCE_SYSTEM,
-                "ingestion_date": ingestion_date,
-                "relative_path": rel_unit_path,
-                "has_json": str(has_json),
-                "has_screenshot": str(has_screenshot),
-                "json_keys": json.dumps(json_keys, ensure_ascii=False),
-            })
-
-            id_counter += 1
-
-    fieldnames = [
+    fieldnames = (
         "id",
         "organization_code",
         "organization_name",
@@ -218,16 +269,46 @@ def generate_metadata(root_dir: str | Path, out_csv: str | Path) -> int:
         "has_json",
         "has_screenshot",
         "json_keys",
-    ]
+    )
 
-    out.parent.mkdir(parents=True, exist_ok=True)
-    with out.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+    keys_cache = load_keys_cache(keys_cache_path) if keys_cache_path else None
+    fresh_cache: KeysCache = {}
 
-    logger.info("metadata written to: %s (rows: %d)", out, len(rows))
-    return len(rows)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    row_count = 0
+    workers = max_workers or (os.cpu_count() or 1) * 4
+    with out.open("w", newline="", encoding="utf-8") as f, ThreadPoolExecutor(max_workers=workers) as executor:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+
+        # Rows are written as scans complete (in order), never held in memory
+        scans = executor.map(lambda unit: _scan_unit(unit, keys_cache), (unit for _, unit in units))
+        for row_count, ((category, unit), (has_json, has_screenshot, json_keys, cache_entry)) in enumerate(zip(units, scans), 1):
+            category_name = category.name
+            unit_name_on_disk = unit.name
+            if cache_entry is not None:
+                fresh_cache[os.path.join(unit, "data.json")] = cache_entry
+
+            writer.writerow((
+                row_count,
+                category_name,
+                organization_display_name(category_name),
+                unit_name_on_disk,
+                unit_display_name(unit_name_on_disk),
+                SOURCE_SYSTEM,
+                ingestion_date,
+                f"{category_name}/{unit_name_on_disk}/",
+                str(has_json),
+                str(has_screenshot),
+                orjson.dumps(json_keys).decode("utf-8"),
+            ))
+
+    # Only entries seen this run are kept, so removed units drop out of the cache
+    if keys_cache_path:
+        save_keys_cache(keys_cache_path, fresh_cache)
+
+    logger.info("metadata written to: %s (rows: %d)", out, row_count)
+    return row_count
 
 
 if __name__ == "__main__":
@@ -236,10 +317,12 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Generate metadata CSV from a folder tree")
     parser.add_argument("root_dir", nargs="?", default=str(Path.cwd() / "data"), help="Root folder containing categories")
     parser.add_argument("out_csv", nargs="?", default=str(Path.cwd() / "metadata.csv"), help="Output CSV path")
+    parser.add_argument("--workers", type=int, default=None, help="Number of threads scanning unit folders (default: 4 x CPU count)")
+    parser.add_argument("--keys-cache", default=DEFAULT_KEYS_CACHE, help="Sidecar cache of parsed data.json keys (empty string disables it)")
     args = parser.parse_args()
 
     try:
-        rows = generate_metadata(args.root_dir, args.out_csv)
+        rows = generate_metadata(args.root_dir, args.out_csv, max_workers=args.workers, keys_cache_path=args.keys_cache or None)
         print(f"Wrote {rows} rows to {args.out_csv}")
     except Exception as exc:
         logger.error("Failed to generate metadata: %s", exc)
@@ -11,45 +11,113 @@ from __future__ import annotations
 
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
+import certifi
+import urllib3
 from minio import Minio
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger("upload_to_minio")
 
+DEFAULT_CONCURRENCY = 32
+# Multipart tuning for large objects; small files (< part size) stay single-PUT
+DEFAULT_PART_SIZE = 64 * 1024 * 1024
+DEFAULT_PARALLEL_PART_UPLOADS = 4
+# Same as the minio-py defaults, except for the pool size
+HTTP_TIMEOUT_SECONDS = 300
 
-def make_minio_client(endpoint: str, access_key: str, secret_key: str, secure: bool = False) -> Minio:
+
+def make_minio_client(
+    endpoint: str,
+    access_key: str,
+    secret_key: str,
+    secure: bool = False,
+    max_connections: int = DEFAULT_CONCURRENCY * DEFAULT_PARALLEL_PART_UPLOADS,
+) -> Minio:
     """Create and return a configured Minio client.
 
+    The client's urllib3 pool keeps up to max_connections connections alive;
+    size it to the number of concurrent requests (concurrency *
+    num_parallel_uploads in upload_tree). minio-py's default pool holds 10,
+    so busier uploads would discard connections and open new ones per request.
+
     Do not store credentials in source control; prefer environment variables
     or secret management in CI.
     """
-    return Minio(endpoint, access_key=access_key, secret_key=secret_key, secure=secure)
+    http_client = urllib3.PoolManager(
+        maxsize=max(1, max_connections),
+        timeout=urllib3.util.Timeout(connect=HTTP_TIMEOUT_SECONDS, read=HTTP_TIMEOUT_SECONDS),
+        cert_reqs="CERT_REQUIRED",
+        ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+        retries=urllib3.Retry(total=5, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]),
+    )
+    return Minio(endpoint, access_key=access_key, secret_key=secret_key, secure=secure, http_client=http_client)
+
 
+def _scan_sorted(path: str | Path, want_dir: bool) -> List[os.DirEntry]:
+    """Return the sub-directories (or files) of path sorted by name.
 
-def upload_tree(client: Minio, root_dir: str | Path, bucket: str, prefix: str = "") -> int:
+    Uses os.scandir so type checks reuse the cached d_type and no Path object
+    is allocated per entry.
+    """
+    with os.scandir(path) as it:
+        entries = [e for e in it if (e.is_dir() if want_dir else e.is_file())]
+    entries.sort(key=lambda e: e.name)
+    return entries
+
+
+def upload_tree(
+    client: Minio,
+    root_dir: str | Path,
+    bucket: str,
+    prefix: str = "",
+    concurrency: int = DEFAULT_CONCURRENCY,
+    part_size: int = DEFAULT_PART_SIZE,
+    num_parallel_uploads: int = DEFAULT_PARALLEL_PART_UPLOADS,
+) -> int:
     """Upload files under root_dir to the given bucket using the specified prefix.
 
+    The tree is walked once to collect (local, remote) pairs, then uploads are
+    issued through a bounded thread pool sharing the same (thread-safe) client.
+    Files larger than part_size are sent as multipart uploads with up to
+    num_parallel_uploads parts in flight, so the worst-case thread count is
+    concurrency * num_parallel_uploads; lower one when raising the other, and
+    create the client with make_minio_client(max_connections=...) of that size.
+
     Returns the number of objects uploaded.
     """
     root = Path(root_dir)
     if not root.is_dir():
         raise FileNotFoundError(f"root_dir not found: {root}")
 
-    uploads = 0
     if not client.bucket_exists(bucket):
         logger.info("Bucket '%s' does not exist; creating it.", bucket)
         client.make_bucket(bucket)
 
-    for org in sorted(p for p in root.iterdir() if p.is_dir()):
-        for unit in sorted(p for p in org.iterdir() if p.is_dir()):
-            for f in sorted(p for p in unit.iterdir() if p.is_file()):
-                remote_path = f"{prefix.rstrip('/')}/{org.name}/{unit.name}/{f.name}".lstrip('/')
-                logger.info("Uploading %s → %s/%s", f, bucket, remote_path)
-                client.fput_object(bucket_name=bucket, object_name=remote_path, file_path=str(f))
-                uploads += 1
+    base = prefix.rstrip('/')
+    pairs: List[Tuple[str, str]] = []
+    for org in _scan_sorted(root, want_dir=True):
+        for unit in _scan_sorted(org.path, want_dir=True):
+            for f in _scan_sorted(unit.path, want_dir=False):
+                remote_path = f"{base}/{org.name}/{unit.name}/{f.name}".lstrip('/')
+                pairs.append((f.path, remote_path))
+
+    def _upload(pair: Tuple[str, str]) -> None:
+        local_path, remote_path = pair
+        logger.info("Uploading %s → %s/%s", local_path, bucket, remote_path)
+        client.fput_object(
+            bucket_name=bucket,
+            object_name=remote_path,
+            file_path=local_path,
+            part_size=part_size,
+            num_parallel_uploads=num_parallel_uploads,
+        )
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        uploads = sum(1 for _ in executor.map(_upload, pairs))
     logger.info("Upload completed (%d objects)", uploads)
     return uploads
 
@@ -62,6 +130,7 @@ def main(
     access_key: Optional[str] = None,
     secret_key: Optional[str] = None,
     secure: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
 ):
     endpoint = endpoint or os.environ.get("MINIO_ENDPOINT")
     access_key = access_key or os.environ.get("MINIO_ACCESS_KEY")
@@ -72,8 +141,11 @@ def main(
     if not all([endpoint, access_key, secret_key, bucket]):
         raise ValueError("MINIO_ENDPOINT, MINIO_ACCESS_KEY, MINIO_SECRET_KEY and MINIO_BUCKET must be provided")
 
-    client = make_minio_client(endpoint, access_key, secret_key, secure=secure)
-    count = upload_tree(client, root_dir, bucket, prefix)
+    client = make_minio_client(
+        endpoint, access_key, secret_key, secure=secure,
+        max_connections=concurrency * DEFAULT_PARALLEL_PART_UPLOADS,
+    )
+    count = upload_tree(client, root_dir, bucket, prefix, concurrency=concurrency)
     logger.info("Total uploaded objects: %d", count)
 
 
@@ -88,6 +160,7 @@ if __name__ == "__main__":
     parser.add_argument("--access-key", default=os.environ.get("MINIO_ACCESS_KEY"), help="MinIO access key")
     parser.add_argument("--secret-key", default=os.environ.get("MINIO_SECRET_KEY"), help="MinIO secret key")
     parser.add_argument("--secure", action="store_true", help="Use HTTPS when connecting to MinIO")
+    parser.add_argument("--concurrency", type=int, default=int(os.environ.get("MINIO_CONCURRENCY", DEFAULT_CONCURRENCY)), help="Number of parallel uploads")
     args = parser.parse_args()
 
     main(
@@ -98,4 +171,5 @@ if __name__ == "__main__":
         access_key=args.access_key,
         secret_key=args.secret_key,
         secure=args.secure,
+        concurrency=args.concurrency,
     )
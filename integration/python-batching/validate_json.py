@@ -7,10 +7,11 @@ per unit, and provide a simple comparison report to highlight differences.
 from __future__ import annotations
 
 import csv
-import json
 import logging
 from pathlib import Path
-from typing import Dict, Set
+from typing import Dict, List, Set
+
+import orjson
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger("validate_json")
@@ -32,14 +33,27 @@ def parse_metadata_json_keys(metadata_csv: str | Path) -> Dict[str, Set[str]]:
         reader = csv.DictReader(f)
         for row in reader:
             keys_json = row.get("json_keys", "[]")
+            if keys_json == "[]":
+                unit_keys[row.get("unit_code", "")] = set()
+                continue
             try:
-                keys = set(json.loads(keys_json))
-            except json.JSONDecodeError:
+                keys = set(orjson.loads(keys_json))
+            except (orjson.JSONDecodeError, TypeError):
                 keys = set()
             unit_keys[row.get("unit_code", "")] = keys
     return unit_keys
 
 
+def _keys_from_mask(mask: int, all_keys: List[str]) -> List[str]:
+    """Translate a key bitmask back to key names (sorted, as all_keys is)."""
+    keys = []
+    while mask:
+        low = mask & -mask
+        keys.append(all_keys[low.bit_length() - 1])
+        mask ^= low
+    return keys
+
+
 def compare_units(unit_keys: Dict[str, Set[str]]) -> str:
     """Return a human-readable comparison report for unit JSON keys."""
     lines = []
@@ -55,19 +69,28 @@ def compare_units(unit_keys: Dict[str, Set[str]]) -> str:
         lines.append("Only one unit found. Nothing to compare.")
         return "\n".join(lines)
 
+    # Columnar form: one bit per distinct key, so each diff is a single AND-NOT
+    all_keys = sorted({k for keys in unit_keys.values() for k in keys})
+    index = {k: i for i, k in enumerate(all_keys)}
+    masks = {
+        unit: sum(1 << index[k] for k in keys)
+        for unit, keys in unit_keys.items()
+    }
+
     base_unit = all_units[0]
-    base_keys = unit_keys[base_unit]
+    base_mask = masks[base_unit]
 
     for unit in all_units[1:]:
-        diff1 = base_keys - unit_keys[unit]
-        diff2 = unit_keys[unit] - base_keys
+        unit_mask = masks[unit]
+        diff1 = base_mask & ~unit_mask
+        diff2 = unit_mask & ~base_mask
 
         if diff1 or diff2:
             lines.append(f"\n⚠️ Difference detected between {base_unit} and {unit}:")
             if diff1:
-                lines.append(f"  Keys only in {base_unit}: {sorted(diff1)}")
+                lines.append(f"  Keys only in {base_unit}: {_keys_from_mask(diff1, all_keys)}")
             if diff2:
-                lines.append(f"  Keys only in {unit}: {sorted(diff2)}")
+                lines.append(f"  Keys only in {unit}: {_keys_from_mask(diff2, all_keys)}")
         else:
             lines.append(f"\n✔ {unit} matches {base_unit} exactly (same keys)")
 
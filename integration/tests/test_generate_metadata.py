@@ -1,3 +1,4 @@
+import csv
 import json
 import importlib.util
 from pathlib import Path
@@ -34,3 +35,57 @@ def test_find_json_keys_with_dict_and_list(tmp_path):
 
     keys2 = module.find_json_keys(p2)
     assert sorted(keys2) == ["x", "y", "z"]
+
+
+def test_generate_metadata_detects_json_and_screenshot(tmp_path):
+    module = load_generate_metadata_module()
+
+    root = tmp_path / "data"
+    unit_a = root / "nhtmcp_trong_nuoc" / "acb"
+    unit_b = root / "nhtmcp_trong_nuoc" / "new_bank"
+    unit_a.mkdir(parents=True)
+    unit_b.mkdir(parents=True)
+    (unit_a / "data.json").write_text(json.dumps({"rate": 1, "name": "x"}), encoding="utf-8")
+    (unit_a / "Screenshot_home.PNG").write_bytes(b"")
+    (unit_b / "notes.png").write_bytes(b"")
+
+    out_csv = tmp_path / "metadata.csv"
+    assert module.generate_metadata(root, out_csv) == 2
+
+    with out_csv.open(encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+
+    assert [r["unit_code"] for r in rows] == ["acb", "new_bank"]
+    assert [r["id"] for r in rows] == ["1", "2"]
+    assert rows[0]["organization_name"] == "NGÂN HÀNG TMCP TRONG NƯỚC"
+    assert rows[0]["unit_name"] == "ACB"
+    assert rows[0]["has_json"] == "True"
+    assert rows[0]["has_screenshot"] == "True"
+    assert json.loads(rows[0]["json_keys"]) == ["name", "rate"]
+    assert rows[1]["unit_name"] == "NEW_BANK"
+    assert rows[1]["has_json"] == "False"
+    assert rows[1]["has_screenshot"] == "False"
+    assert json.loads(rows[1]["json_keys"]) == []
+
+
+def test_generate_metadata_reuses_keys_cache_for_unchanged_json(tmp_path, monkeypatch):
+    module = load_generate_metadata_module()
+
+    unit = tmp_path / "data" / "nh_chinh_sach" / "vdb"
+    unit.mkdir(parents=True)
+    (unit / "data.json").write_text(json.dumps({"k": 1}), encoding="utf-8")
+    cache_path = tmp_path / "cache" / "keys.json"
+    out_csv = tmp_path / "metadata.csv"
+
+    module.generate_metadata(tmp_path / "data", out_csv, keys_cache_path=cache_path)
+    assert cache_path.is_file()
+
+    def fail(_path):
+        raise AssertionError("data.json should not be re-parsed")
+
+    monkeypatch.setattr(module, "find_json_keys", fail)
+    module.generate_metadata(tmp_path / "data", out_csv, keys_cache_path=cache_path)
+
+    with out_csv.open(encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert json.loads(rows[0]["json_keys"]) == ["k"]
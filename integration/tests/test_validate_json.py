@@ -0,0 +1,43 @@
+import importlib.util
+from pathlib import Path
+
+
+def load_validate_json_module() -> object:
+    """Dynamically load the validate_json.py module for testing."""
+    repo_root = Path(__file__).parents[1]
+    module_path = repo_root / "python-batching" / "validate_json.py"
+    spec = importlib.util.spec_from_file_location("validate_json", str(module_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_parse_metadata_json_keys(tmp_path):
+    module = load_validate_json_module()
+
+    csv_path = tmp_path / "metadata.csv"
+    csv_path.write_text(
+        'unit_code,json_keys\nacb,"[""a"",""b""]"\nbidv,[]\nvib,not-json\n',
+        encoding="utf-8",
+    )
+
+    assert module.parse_metadata_json_keys(csv_path) == {
+        "acb": {"a", "b"},
+        "bidv": set(),
+        "vib": set(),
+    }
+
+
+def test_compare_units_reports_key_differences():
+    module = load_validate_json_module()
+
+    report = module.compare_units({
+        "acb": {"a", "b", "c"},
+        "bidv": {"a", "b", "c"},
+        "vib": {"c", "a", "z", "d"},
+    })
+
+    assert "✔ bidv matches acb exactly (same keys)" in report
+    assert "Keys only in acb: ['b']" in report
+    assert "Keys only in vib: ['d', 'z']" in report
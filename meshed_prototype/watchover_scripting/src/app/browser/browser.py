@@ -1,15 +1,18 @@
 from __future__ import annotations
 
 import asyncio
+from typing import TYPE_CHECKING
 
 from app.browser.options import get_brower_options
 from app.browser.tab_pool import TabPool
 from app.logger.factory import get_logger
-from app.scrapper.enums import OrgKind
 from app.scrapper.registry import get_org_settings
 from app.scrapper.scrapper import Scrapper
 from app.settings import get_settings
 
+if TYPE_CHECKING:
+    from app.scrapper.enums import OrgKind
+
 
 class Browser:
     def __init__(self, orgs: list[OrgKind]) -> None:
@@ -21,30 +24,41 @@ class Browser:
         self.logger = get_logger("browser")
 
     async def run(self) -> None:
-        num_tabs = len(self.orgs)
+        num_tasks = len(self.orgs)
 
         await self.logger.ainfo(
             "Starting run",
-            tasks=num_tabs,
+            tasks=num_tasks,
             max_tabs=self.settings.worker.max_num,
             orgs=[o.name for o in self.orgs],
         )
 
+        # Open the full pool even for few orgs: idle tabs are borrowed by
+        # scrappers to fetch product pages concurrently
         async with TabPool(
             browser_options=self.options,
-            num_tabs=num_tabs,
+            num_tabs=self.settings.worker.max_num,
             max_tabs=self.settings.worker.max_num,
-        ) as tabs:
-            tasks: list[asyncio.Task[None]] = []
-
-            for index, org in enumerate(self.orgs):
-                tab = tabs[index % num_tabs]
-                org_settings = get_org_settings(org)
-                scrapper = Scrapper(org_settings)
-                tasks.append(asyncio.create_task(scrapper.start(tab)))
+            isolate_contexts=self.settings.worker.isolate_contexts,
+            max_uses=self.settings.worker.max_uses_per_tab,
+        ) as pool:
+            # Orgs wait for an idle tab from the pool, so a fast org never
+            # queues behind a slow one pinned to the same tab. The task group
+            # guarantees every org task is done before the pool closes
+            async with asyncio.TaskGroup() as tg:
+                for org in self.orgs:
+                    tg.create_task(self._scrape(pool, org))
 
-            await self.logger.ainfo("All tasks dispatched", count=len(tasks))
+                await self.logger.ainfo("All tasks dispatched", count=num_tasks)
 
-            await asyncio.gather(*tasks)
+        await self.logger.ainfo("Run completed", tasks=num_tasks)
 
-        await self.logger.ainfo("Run completed", tasks=num_tabs)
+    async def _scrape(self, pool: TabPool, org: OrgKind) -> None:
+        # A failing org is logged rather than raised so the task group does
+        # not cancel every other org still scraping
+        try:
+            async with pool.acquire() as tab:
+                scrapper = Scrapper(get_org_settings(org))
+                await scrapper.start(tab, pool)
+        except Exception as exc:
+            await self.logger.aexception("Org scrape failed", org=org, error=exc)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING
 
 from app.logger.factory import get_logger
@@ -8,6 +10,7 @@ from pydoll.browser import Chrome
 from app.browser.context_pool import ContextPool
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
     from typing import Optional
 
     from pydoll.browser.chromium.base import Browser
@@ -16,40 +19,63 @@ if TYPE_CHECKING:
 
 
 class TabPool:
+    """A single browser whose pre-warmed tabs are handed out through a queue.
+
+    Tabs are recycled (a fresh tab replaces the old one) after `max_uses`
+    acquisitions to bound the memory a long-lived page can accumulate.
+    """
+
     def __init__(
-        self, browser_options: ChromiumOptions, num_tabs: int, max_tabs: int
+        self,
+        browser_options: ChromiumOptions,
+        num_tabs: int,
+        max_tabs: int,
+        isolate_contexts: bool = False,
+        max_uses: int = 50,
     ) -> None:
         self.browser_options = browser_options
         self.num_tabs = max(1, min(num_tabs, max_tabs))
+        self.isolate_contexts = isolate_contexts
+        self.max_uses = max_uses
 
         self.browser: Optional[Browser] = None
         self.context_pool: Optional[ContextPool] = None
         self.workers: list[Tab] = []
 
+        self._idle: asyncio.Queue[Tab] = asyncio.Queue()
+        # Keyed by id(tab): browser context of the tab and how often it was used
+        self._contexts: dict[int, Optional[str]] = {}
+        self._uses: dict[int, int] = {}
+
         self.logger = get_logger("tab_pool")
 
-    async def __aenter__(self) -> list[Tab]:
+    async def __aenter__(self) -> TabPool:
         self.browser = Chrome(self.browser_options)
 
         init_tab = await self.browser.start()
         await self.logger.ainfo("The browser is started")
+        self._track(init_tab, None)
 
-        extra_tabs: list[Tab] = []
+        extra_workers = self.num_tabs - 1
 
-        # Only create a context pool if we actually need extra workers
-        if self.num_tabs > 1:
-            self.context_pool = ContextPool(self.browser, self.num_tabs - 1)
+        # Browser contexts are heavyweight; only pay for them when isolation
+        # between tabs is requested, otherwise share the default context
+        if extra_workers > 0 and self.isolate_contexts:
+            self.context_pool = ContextPool(self.browser, extra_workers)
             await self.context_pool.init()
 
-            extra_workers = self.num_tabs - 1
             for _ in range(extra_workers):
                 ctx = await self.context_pool.acquire()
-                extra_tabs.append(await self.browser.new_tab(ctx))
+                self._track(await self.browser.new_tab(browser_context_id=ctx), ctx)
+        else:
+            for _ in range(extra_workers):
+                self._track(await self.browser.new_tab(), None)
 
-        self.workers = [init_tab] + extra_tabs
+        for tab in self.workers:
+            self._idle.put_nowait(tab)
         await self.logger.ainfo("Tab pool initialized", workers=self.num_tabs)
 
-        return self.workers
+        return self
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
         try:
@@ -65,3 +91,64 @@ class TabPool:
                 finally:
                     self.browser = None
                     self.workers = []
+                    self._contexts.clear()
+                    self._uses.clear()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Tab]:
+        """Wait for an idle tab and return it to the pool afterwards."""
+        tab = await self._idle.get()
+        try:
+            yield tab
+        finally:
+            await self.release(tab)
+
+    def try_acquire(self) -> Optional[Tab]:
+        """Return an idle tab without waiting, or None when all are busy."""
+        try:
+            return self._idle.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+
+    async def release(self, tab: Tab) -> None:
+        key = id(tab)
+        self._uses[key] = self._uses.get(key, 0) + 1
+
+        if self._uses[key] >= self.max_uses and self.browser is not None:
+            try:
+                tab = await self._recycle(tab)
+            except Exception as exc:
+                await self.logger.awarning("Failed to recycle tab", error=exc)
+
+        self._idle.put_nowait(tab)
+
+    def _track(self, tab: Tab, context_id: Optional[str]) -> None:
+        self.workers.append(tab)
+        self._contexts[id(tab)] = context_id
+        self._uses[id(tab)] = 0
+
+    async def _recycle(self, tab: Tab) -> Tab:
+        assert self.browser is not None
+
+        # Open the replacement first so the browser never runs out of tabs.
+        # The pool's bookkeeping only moves to it once the old tab is closed;
+        # on any failure the old tab stays in service and is retried later
+        context_id = self._contexts.get(id(tab))
+        fresh = await self.browser.new_tab(browser_context_id=context_id)
+
+        try:
+            await tab.close()
+        except Exception:
+            try:
+                await fresh.close()
+            except Exception as exc:
+                await self.logger.awarning("Failed to close replacement tab", error=exc)
+            raise
+
+        self._contexts.pop(id(tab), None)
+        self._uses.pop(id(tab), None)
+        self.workers.remove(tab)
+        self._track(fresh, context_id)
+        await self.logger.adebug("Tab recycled", max_uses=self.max_uses)
+
+        return fresh
@@ -1,34 +1,87 @@
 from __future__ import annotations
 
+import asyncio
+from copy import deepcopy
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 import trafilatura
+from lxml.etree import XPath
 from minify_html import minify
+from trafilatura.utils import load_html
 
 if TYPE_CHECKING:
     from typing import Literal
 
+    from lxml.html import HtmlElement
+
+
+@lru_cache(maxsize=128)
+def _compile_xpaths(xpaths: tuple[str, ...]) -> tuple[XPath, ...]:
+    return tuple(XPath(x) for x in xpaths)
+
+
+def _drop_node(node: HtmlElement) -> None:
+    """Remove a node from its parent but keep its tail text in place."""
+    parent = node.getparent()
+    if parent is None:
+        return
+
+    if node.tail:
+        previous = node.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or "") + node.tail
+        else:
+            parent.text = (parent.text or "") + node.tail
+
+    parent.remove(node)
+
 
 class Extractor:
     def __init__(self) -> None:
         self.favor_recall = True
         self.fast = True
 
-    def extract(
-        self,
-        page_source: str,
-        format: Literal["html", "txt"],
-        prune_xpath: str | list[str] | None,
-    ) -> str:
+    async def extract_both(
+        self, page_source: str, prune_xpath: str | list[str] | None
+    ) -> tuple[str, str]:
+        # trafilatura + minify are CPU bound, keep them off the event loop
+        return await asyncio.to_thread(self.extract_both_sync, page_source, prune_xpath)
+
+    def extract_both_sync(
+        self, page_source: str, prune_xpath: str | list[str] | None
+    ) -> tuple[str, str]:
+        """Return (html, txt) from a single parse of the page source.
+
+        The prune XPaths are compiled once per distinct list and applied to the
+        shared tree before trafilatura runs, instead of once per output format.
+        """
+        tree = load_html(page_source)
+        if tree is None:
+            return "", ""
+
+        if prune_xpath:
+            xpaths = (prune_xpath,) if isinstance(prune_xpath, str) else prune_xpath
+            for xpath in _compile_xpaths(tuple(xpaths)):
+                for node in xpath(tree):
+                    _drop_node(node)
+
+        # Copying the parsed tree is much cheaper than parsing the HTML again
+        html = self._extract_tree(deepcopy(tree), "html")
+        txt = self._extract_tree(tree, "txt")
+
+        return html, txt
+
+    def _extract_tree(self, tree: HtmlElement, format: Literal["html", "txt"]) -> str:
         extracted_source = trafilatura.extract(
-            page_source,
-            output_format=format,
-            favor_recall=self.favor_recall,
-            prune_xpath=prune_xpath,
+            tree, output_format=format, favor_recall=self.favor_recall
         )
         if extracted_source is None:
             return ""
 
-        minified = minify(extracted_source)
+        return minify(extracted_source)
+
 
-        return minified
+@lru_cache(typed=True, maxsize=1)
+def get_extractor() -> Extractor:
+    return Extractor()
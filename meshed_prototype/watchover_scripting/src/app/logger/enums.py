@@ -16,10 +16,13 @@ class LogLevel(StrEnum):
 
     @property
     def numeric(self) -> int:
-        return {
-            "debug": logging.DEBUG,
-            "info": logging.INFO,
-            "warning": logging.WARNING,
-            "error": logging.ERROR,
-            "critical": logging.CRITICAL,
-        }[self.value]
+        return _NUMERIC_LEVELS[self]
+
+
+_NUMERIC_LEVELS: dict[LogLevel, int] = {
+    LogLevel.Debug: logging.DEBUG,
+    LogLevel.Info: logging.INFO,
+    LogLevel.Warning: logging.WARNING,
+    LogLevel.Error: logging.ERROR,
+    LogLevel.Critical: logging.CRITICAL,
+}
@@ -1,27 +1,47 @@
 from __future__ import annotations
 
+from typing import Any
 
+import msgspec
 import structlog
 
+from app.logger.enums import LogFormat
 from app.settings import get_settings
 
+# str() anything msgspec cannot encode natively, e.g. exceptions bound as fields
+_json_encoder = msgspec.json.Encoder(enc_hook=str)
+
+
+def _json_dumps(event_dict: dict[str, Any], **_: Any) -> bytes:
+    return _json_encoder.encode(event_dict)
+
 
 def setup_logging() -> None:
     settings = get_settings()
 
+    if settings.logging.format == LogFormat.Json:
+        # Rendered as bytes, so write them as-is instead of through print()
+        renderers = [
+            structlog.processors.dict_tracebacks,
+            structlog.processors.JSONRenderer(serializer=_json_dumps),
+        ]
+        logger_factory = structlog.BytesLoggerFactory()
+    else:
+        renderers = [structlog.dev.set_exc_info, structlog.dev.ConsoleRenderer()]
+        logger_factory = structlog.PrintLoggerFactory()
+
     structlog.configure(
         processors=[
             structlog.contextvars.merge_contextvars,
             structlog.processors.add_log_level,
             structlog.processors.StackInfoRenderer(),
-            structlog.dev.set_exc_info,
             structlog.processors.TimeStamper(
                 fmt=settings.logging.time_format, utc=settings.logging.utc
             ),
-            structlog.dev.ConsoleRenderer(),
+            *renderers,
         ],
         wrapper_class=structlog.make_filtering_bound_logger(settings.logging.level),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
-        cache_logger_on_first_use=False,
+        logger_factory=logger_factory,
+        cache_logger_on_first_use=True,
     )
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import asyncio
+from functools import lru_cache
+
+
+class RateLimiter:
+    """Space out acquisitions so at most `rate` happen per second."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> RateLimiter:
+        if not self.interval:
+            return self
+
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_host_limiter(host: str, rate: float) -> RateLimiter:
+    """One limiter per host, shared by every scrapper hitting that host."""
+    return RateLimiter(rate)
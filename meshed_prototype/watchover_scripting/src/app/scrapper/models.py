@@ -1,16 +1,17 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 
-from pydantic import BaseModel
 
-
-class TinResult(BaseModel):
+@dataclass(slots=True, frozen=True)
+class TinResult:
     url: str
     html_source: str
     text_source: str
 
 
-class ProductResult(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ProductResult:
     url: str
     html_source: str
     text_source: str
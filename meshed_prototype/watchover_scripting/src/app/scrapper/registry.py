@@ -1,17 +1,22 @@
 from __future__ import annotations
 
+import sys
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 from app.settings import get_settings
-from app.scrapper.enums import OrgKind
 
 if TYPE_CHECKING:
+    from app.scrapper.enums import OrgKind
     from app.settings import OrgSettings
 
-settings = get_settings()
 
-ORG_SETTINGS_MAP = {o.name: o for o in settings.orgs}
+@lru_cache(maxsize=1)
+def _org_settings_map() -> dict[str, OrgSettings]:
+    return {sys.intern(o.name): o for o in get_settings().orgs}
 
 
+@lru_cache(maxsize=None)
 def get_org_settings(name: OrgKind) -> OrgSettings:
-    return ORG_SETTINGS_MAP[name]
+    # Key on the plain str value rather than the enum member
+    return _org_settings_map()[str(name)]
@@ -1,91 +1,158 @@
 from __future__ import annotations
 
 import asyncio
+import json
+import random
+import threading
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+import zstandard
+from pydoll.exceptions import (
+    CommandExecutionTimeout,
+    NetworkError,
+    PageLoadTimeout,
+)
+
+from app.extractor import get_extractor
+from app.logger.factory import get_logger
+from app.scrapper.limiter import get_host_limiter
+from app.scrapper.models import ProductResult, TinResult
+from app.settings import get_settings
+from app.utils import canonical_url, is_url, url_slug
 
-from slugify import slugify
+# Upper bound, in seconds, on waiting for a page to become usable
+READY_TIMEOUT = 5
+# Navigation failures worth retrying, as opposed to bugs in the org's config
+RETRYABLE_NAV_ERRORS = (PageLoadTimeout, NetworkError, CommandExecutionTimeout)
+ZSTD_LEVEL = 10
+# Extracted products waiting for the writer; bounds how many sit in memory
+WRITE_QUEUE_SIZE = 16
+# hrefs that never lead to a product page by themselves; the script ones may
+# still navigate when clicked
+SCRIPT_HREFS = ("javascript:", "#")
+NON_PAGE_HREFS = (*SCRIPT_HREFS, "mailto:", "tel:", "data:")
+
+# ZstdCompressor must not be shared between threads, keep one per writer thread
+_zstd = threading.local()
+
+
+def _write_compressed(path: Path, content: str) -> None:
+    compressor = getattr(_zstd, "compressor", None)
+    if compressor is None:
+        compressor = _zstd.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    path.write_bytes(compressor.compress(content.encode("utf-8")))
 
-from app.extractor import Extractor
-from app.scrapper.models import ProductResult, TinResult
-from app.utils import is_url
 
 if TYPE_CHECKING:
     from pydoll.browser.tab import Tab
+    from pydoll.elements.web_element import WebElement
+    from app.browser.tab_pool import TabPool
     from app.settings import OrgSettings
 
 
 class Scrapper:
     def __init__(self, org: OrgSettings) -> None:
         self.org = org
-        self.extractor = Extractor()
+        self.extractor = get_extractor()
+
+        self.out = Path("data").joinpath(self.org.name)
+        self.skip_seen = get_settings().worker.skip_seen_urls
+        self.compress = get_settings().worker.compress_output
+        # canonical product url -> unix time it was last scraped
+        self._seen: dict[str, float] = {}
+
+        self.logger = get_logger("scrapper")
+
+    async def start(self, tab: Tab, pool: TabPool | None = None) -> None:
+        # The tin page is independent of the products, fetch it on an idle tab
+        # alongside them when one is free, else on `tab` once products are done
+        spare = pool.try_acquire() if pool is not None and self.org.base_url else None
+        tin_task = (
+            asyncio.create_task(self._get_tin_borrowed(pool, spare))
+            if spare is not None
+            else None
+        )
 
-    async def start(self, tab: Tab) -> None:
-        if not self.org.base_url:
-            products = []
-        else:
-            urls = await self._get_product_urls(tab)
-            products = [await self._get_product(tab, url) for url in urls]
+        await asyncio.to_thread(self.out.mkdir, parents=True, exist_ok=True)
+
+        try:
+            if self.org.base_url:
+                urls = await self._get_product_urls(tab)
+                self._seen = self._load_seen()
+                if self.skip_seen:
+                    urls = [url for url in urls if url not in self._seen]
+                await self._get_products(tab, urls, pool)
 
-        tin = await self._get_tin(tab)
-        await self._write(products, tin)
+            tin = await tin_task if tin_task is not None else await self._get_tin(tab)
+        finally:
+            # Never leave the borrowed tab in use once this org is over
+            if tin_task is not None and not tin_task.done():
+                tin_task.cancel()
+                await asyncio.gather(tin_task, return_exceptions=True)
 
-    async def _get_product_urls(self, tab: Tab) -> set[str]:
+        await self._write_tin(tin)
+
+    async def _get_product_urls(self, tab: Tab) -> list[str]:
         product_list_url = self.org.base_url + self.org.product_list_url_path
 
         if self.org.product_list_query is None:
-            return {product_list_url}
+            return [product_list_url]
 
         await self._go_to(tab, product_list_url)
-        urls: set[str] = set()
 
         if self.org.product_list_tab_query:
-            urls |= await self._urls_with_tabs(
+            return await self._urls_with_tabs(
                 tab,
                 product_list_url,
                 self.org.product_list_query,
                 self.org.product_list_tab_query,
             )
-        else:
-            urls |= await self._urls_single(
-                tab, product_list_url, self.org.product_list_query
-            )
-
-        return urls
+        return await self._urls_single(
+            tab, product_list_url, self.org.product_list_query
+        )
 
-    async def _urls_single(self, tab: Tab, list_url: str, query: str) -> set[str]:
-        urls: set[str] = set()
+    async def _urls_single(self, tab: Tab, list_url: str, query: str) -> list[str]:
+        # Ordered and unique: pages are then fetched in on-site order
+        urls: dict[str, None] = {}
 
         els = await tab.query(query, find_all=True)
 
         if self.org.product_list_action == "click":
-            for idx in range(len(els)):
-                els = await tab.query(query, find_all=True)
-                el = els[idx]
-                if el.tag_name == "":
-                    continue
-                await el.click()
-                await asyncio.sleep(5)
-                urls.add(await tab.current_url)
+            # Links with an href are taken straight from this snapshot; only
+            # href-less elements need the click + navigate-back dance
+            hrefs, click_only = self._snapshot_links(els)
+            urls.update(dict.fromkeys(hrefs))
+
+            for n, idx in enumerate(click_only):
+                if n > 0:
+                    els = await tab.query(query, find_all=True)
+                new_url = await self._click_through(tab, els[idx])
+                if new_url is not None:
+                    urls[canonical_url(new_url)] = None
                 await self._go_to(tab, list_url)
+                await self._wait_ready(tab, query)
                 await tab.scroll.to_bottom()
         else:
             for el in els:
                 href = el.get_attribute("href")
-                if href:
-                    urls.add(href if is_url(href) else self.org.base_url + href)
+                if self._accept(href):
+                    urls[self._absolute(href)] = None
 
-        return urls
+        return list(urls)
 
     async def _urls_with_tabs(
         self, tab: Tab, list_url: str, query: str, tab_query: str
-    ) -> set[str]:
-        urls: set[str] = set()
+    ) -> list[str]:
+        urls: dict[str, None] = {}
 
         tab_els = await tab.query(tab_query, find_all=True)
 
         for t_idx in range(len(tab_els)):
-            tab_els = await tab.query(tab_query, find_all=True)
+            if t_idx > 0:
+                tab_els = await tab.query(tab_query, find_all=True)
             t = tab_els[t_idx]
             if await t.is_visible():
                 await t.click()
@@ -95,20 +162,23 @@ class Scrapper:
                     await self._go_to(
                         tab, href if is_url(href) else self.org.base_url + href
                     )
-            await asyncio.sleep(5)
+            await self._wait_ready(tab, query)
             await tab.scroll.to_bottom()
 
             link_els = await tab.query(query, find_all=True)
 
             if self.org.product_list_action == "click":
-                for l_idx in range(len(link_els)):
-                    link_els = await tab.query(query, find_all=True)
-                    link = link_els[l_idx]
-                    await link.click()
-                    await asyncio.sleep(5)
-                    urls.add(await tab.current_url)
+                hrefs, click_only = self._snapshot_links(link_els)
+                urls.update(dict.fromkeys(hrefs))
+
+                for n, l_idx in enumerate(click_only):
+                    if n > 0:
+                        link_els = await tab.query(query, find_all=True)
+                    new_url = await self._click_through(tab, link_els[l_idx])
+                    if new_url is not None:
+                        urls[canonical_url(new_url)] = None
                     await self._go_to(tab, list_url)
-                    await asyncio.sleep(5)
+                    await self._wait_ready(tab, tab_query)
                     tab_els = await tab.query(tab_query, find_all=True)
 
                     if await tab_els[t_idx].is_visible():
@@ -120,62 +190,239 @@ class Scrapper:
                                 tab, href if is_url(href) else self.org.base_url + href
                             )
 
+                    await self._wait_ready(tab, query)
                     await tab.scroll.to_bottom()
             else:
                 for el in link_els:
                     href = el.get_attribute("href")
-                    if href:
-                        urls.add(href if is_url(href) else self.org.base_url + href)
+                    if self._accept(href):
+                        urls[self._absolute(href)] = None
 
                 await self._go_to(tab, list_url)
-                await asyncio.sleep(5)
+                await self._wait_ready(tab, tab_query)
+
+        return list(urls)
+
+    async def _get_products(
+        self, tab: Tab, urls: list[str], pool: TabPool | None
+    ) -> None:
+        """Fetch, extract and write every product, streaming them to disk."""
+        pending: asyncio.Queue[str] = asyncio.Queue()
+        for url in urls:
+            pending.put_nowait(url)
+
+        # Borrow idle tabs (never wait for one) so up to `concurrency` pages
+        # load at once; they go back to the pool as soon as the org is done
+        borrowed: list[Tab] = []
+        limit = min(self.org.concurrency, len(urls))
+        while pool is not None and len(borrowed) + 1 < limit:
+            spare = pool.try_acquire()
+            if spare is None:
+                break
+            borrowed.append(spare)
+
+        # Products are written one by one as they are extracted, so memory
+        # holds at most `concurrency` page sources plus the writer's queue
+        written: asyncio.Queue[ProductResult | None] = asyncio.Queue(
+            maxsize=WRITE_QUEUE_SIZE
+        )
+        writer = asyncio.create_task(self._writer(written))
+        slots = asyncio.Semaphore(max(1, self.org.concurrency))
+
+        # Extraction runs in threads while the tab already loads the next url
+        extractions: dict[str, asyncio.Task[None]] = {}
+
+        async def extract(url: str, src: str) -> None:
+            try:
+                await written.put(await self._get_product(url, src))
+            finally:
+                slots.release()
+
+        async def worker(worker_tab: Tab) -> None:
+            while not pending.empty():
+                url = pending.get_nowait()
+                await slots.acquire()
+                try:
+                    src = await self._fetch(worker_tab, url)
+                except Exception as exc:
+                    slots.release()
+                    await self.logger.awarning(
+                        "Failed to get product", org=self.org.name, url=url, error=exc
+                    )
+                    continue
+                extractions[url] = asyncio.create_task(extract(url, src))
+
+        try:
+            await asyncio.gather(worker(tab), *(worker(t) for t in borrowed))
+        finally:
+            for t in borrowed:
+                await pool.release(t)
 
-        return urls
+        results = await asyncio.gather(*extractions.values(), return_exceptions=True)
+        for url, result in zip(extractions, results):
+            if isinstance(result, BaseException):
+                await self.logger.awarning(
+                    "Failed to get product", org=self.org.name, url=url, error=result
+                )
 
-    async def _get_product(self, tab: Tab, url: str) -> ProductResult:
+        await written.put(None)
+        await writer
+
+    async def _fetch(self, tab: Tab, url: str) -> str:
         await self._go_to(tab, url)
-        src = await tab.page_source
-        html = self.extractor.extract(
-            src, format="html", prune_xpath=self.org.product_info_prune_xpaths
-        )
-        txt = self.extractor.extract(
-            src, format="txt", prune_xpath=self.org.product_info_prune_xpaths
+        return await tab.page_source
+
+    async def _get_product(self, url: str, src: str) -> ProductResult:
+        html, txt = await self.extractor.extract_both(
+            src, prune_xpath=self.org.product_info_prune_xpaths
         )
         return ProductResult(url=url, html_source=html, text_source=txt)
 
     async def _get_tin(self, tab: Tab) -> TinResult:
         await tab.go_to(self.org.tin_url)
+        await self._wait_ready(tab)
         src = await tab.page_source
-        html = self.extractor.extract(
-            src, format="html", prune_xpath=self.org.product_info_prune_xpaths
-        )
-        txt = self.extractor.extract(
-            src, format="txt", prune_xpath=self.org.product_info_prune_xpaths
+        html, txt = await self.extractor.extract_both(
+            src, prune_xpath=self.org.product_info_prune_xpaths
         )
         return TinResult(url=self.org.tin_url, html_source=html, text_source=txt)
 
-    async def _write(self, products: list[ProductResult], tin: TinResult) -> None:
-        out = Path("data").joinpath(self.org.name)
-        out.mkdir(parents=True, exist_ok=True)
+    async def _get_tin_borrowed(self, pool: TabPool, tab: Tab) -> TinResult:
+        try:
+            return await self._get_tin(tab)
+        finally:
+            await pool.release(tab)
+
+    def _snapshot_links(self, els: list) -> tuple[list[str], list[int]]:
+        """Split queried elements into absolute hrefs and click-only indexes."""
+        hrefs: list[str] = []
+        click_only: list[int] = []
+
+        for idx, el in enumerate(els):
+            if el.tag_name == "":
+                continue
+            href = el.get_attribute("href")
+            if self._accept(href):
+                hrefs.append(self._absolute(href))
+            elif not href or href.lstrip().lower().startswith(SCRIPT_HREFS):
+                click_only.append(idx)
+
+        return hrefs, click_only
+
+    def _accept(self, href: str | None) -> bool:
+        return bool(href) and not href.lstrip().lower().startswith(NON_PAGE_HREFS)
+
+    def _absolute(self, href: str) -> str:
+        return canonical_url(href if is_url(href) else self.org.base_url + href)
+
+    def _load_seen(self) -> dict[str, float]:
+        try:
+            return json.loads(self.out.joinpath("_seen.json").read_text("utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    async def _writer(self, queue: asyncio.Queue[ProductResult | None]) -> None:
+        ext = ".zst" if self.compress else ""
+
+        while (p := await queue.get()) is not None:
+            slug = url_slug(p.url)[:250]
+            try:
+                await asyncio.gather(
+                    self._write_file(f"product_{slug}.html{ext}", p.html_source),
+                    self._write_file(f"product_{slug}.txt{ext}", p.text_source),
+                )
+            except Exception as exc:
+                await self.logger.awarning(
+                    "Failed to write product", org=self.org.name, url=p.url, error=exc
+                )
+            else:
+                self._seen[p.url] = time.time()
 
-        for p in products:
-            slug = slugify(p.url)[:250]
-            out.joinpath(f"product_{slug}.html").write_text(
-                p.html_source, encoding="utf-8"
-            )
-            out.joinpath(f"product_{slug}.txt").write_text(
-                p.text_source, encoding="utf-8"
-            )
+    async def _write_tin(self, tin: TinResult) -> None:
+        ext = ".zst" if self.compress else ""
+        seen = json.dumps(self._seen, ensure_ascii=False)
+
+        await asyncio.gather(
+            self._write_file(f"tin.html{ext}", tin.html_source),
+            self._write_file(f"tin.txt{ext}", tin.text_source),
+            self._write_file("_seen.json", seen, compress=False),
+        )
 
-        out.joinpath("tin.html").write_text(tin.html_source, encoding="utf-8")
-        out.joinpath("tin.txt").write_text(tin.text_source, encoding="utf-8")
+    async def _write_file(
+        self, name: str, content: str, compress: bool | None = None
+    ) -> None:
+        # Disk writes run in worker threads so other scrappers keep the loop
+        if compress is None:
+            compress = self.compress
+
+        path = self.out.joinpath(name)
+        if compress:
+            await asyncio.to_thread(_write_compressed, path, content)
+        else:
+            await asyncio.to_thread(path.write_text, content, encoding="utf-8")
 
     async def _go_to(self, tab: Tab, url: str) -> None:
+        limiter = get_host_limiter(urlsplit(url).netloc, self.org.rate_per_sec)
+
+        attempts = max(1, self.org.nav_retries)
+
+        for attempt in range(attempts):
+            try:
+                async with limiter:
+                    await self._navigate(tab, url)
+                break
+            except RETRYABLE_NAV_ERRORS as exc:
+                if attempt + 1 >= attempts:
+                    raise
+                delay = min(2**attempt, self.org.nav_backoff_max)
+                await self.logger.awarning(
+                    "Navigation failed, retrying",
+                    org=self.org.name,
+                    url=url,
+                    attempt=attempt + 1,
+                    delay=delay,
+                    error=exc,
+                )
+                await asyncio.sleep(delay + random.uniform(0, 1))
+
+        await self._wait_ready(tab)
+
+        # Fixed delay is a last resort for orgs whose pages keep rendering
+        # after every selector we could wait on is already present
+        if self.org.with_sleep:
+            await asyncio.sleep(5)
+
+    async def _navigate(self, tab: Tab, url: str) -> None:
         if self.org.with_captcha:
             async with tab.expect_and_bypass_cloudflare_captcha():
                 await tab.go_to(url)
         else:
             await tab.go_to(url)
 
-        if self.org.with_sleep:
-            await asyncio.sleep(5)
+    async def _wait_ready(self, tab: Tab, query: str | None = None) -> None:
+        """Wait until `query` (or the org's ready selector) is on the page."""
+        await tab.query(
+            query or self.org.ready_selector or "body",
+            timeout=READY_TIMEOUT,
+            raise_exc=False,
+        )
+
+    async def _click_through(self, tab: Tab, el: WebElement) -> str | None:
+        """Click `el` and return the url it navigated to, or None if it did not."""
+        # Compare against the url shown right before the click, not the list
+        # url we asked for: the tab may have been redirected or normalized
+        before = await tab.current_url
+        await el.click()
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + READY_TIMEOUT
+        while loop.time() < deadline:
+            url = await tab.current_url
+            if url != before:
+                return url
+            await asyncio.sleep(0.25)
+
+        await self.logger.awarning(
+            "Click did not navigate", org=self.org.name, url=before
+        )
+        return None
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import Annotated, Literal
+from pathlib import Path
+from typing import Annotated, Any, Literal
 from glob import glob
 
+import msgspec
 from pydantic import BaseModel, Field
 from pydantic_settings import (
     BaseSettings,
@@ -14,7 +16,7 @@ from pydantic_settings import (
 )
 
 from app import constants
-from app.logger.enums import LogLevel
+from app.logger.enums import LogFormat, LogLevel
 
 
 PYPROJECT_TOML_PATH = constants.PROJECT_DIR.joinpath("pyproject.toml")
@@ -22,6 +24,13 @@ SETTINGS_JSON_PATH = constants.PROJECT_DIR.joinpath("settings.json")
 ORG_JSON_PATHS = glob(f"{constants.PROJECT_DIR}/*.json")
 
 
+class MsgspecJsonConfigSettingsSource(JsonConfigSettingsSource):
+    """JSON settings source decoding straight from bytes with msgspec."""
+
+    def _read_file(self, file_path: Path) -> dict[str, Any]:
+        return msgspec.json.decode(file_path.read_bytes())
+
+
 class OrgSettings(BaseModel):
     name: str
     base_url: str
@@ -33,14 +42,24 @@ class OrgSettings(BaseModel):
     product_list_action: Literal["click"] | None
     product_list_query: str | None
     product_list_tab_query: str | None
+    ready_selector: str | None = None
+    concurrency: int = 4
+    rate_per_sec: float = 2.0
+    nav_retries: int = 5
+    nav_backoff_max: float = 30.0
 
 
 class WorkerSettings(BaseModel):
     max_num: int = 8
+    isolate_contexts: bool = False
+    skip_seen_urls: bool = False
+    max_uses_per_tab: int = 50
+    compress_output: bool = False
 
 
 class LoggingSettings(BaseModel):
     level: LogLevel = LogLevel.Info
+    format: LogFormat = LogFormat.Console
     time_format: str = "%Y-%m-%d %H:%M:%S"
     utc: bool = False
 
@@ -77,7 +96,7 @@ class Settings(BaseSettings):
             PyprojectTomlConfigSettingsSource(
                 settings_cls,
             ),
-            JsonConfigSettingsSource(
+            MsgspecJsonConfigSettingsSource(
                 settings_cls,
             ),
         )
@@ -1,18 +1,54 @@
 from __future__ import annotations
 
-from urllib.parse import urlparse
+import re
+from functools import lru_cache
+from urllib.parse import parse_qsl, quote, urlencode, urlparse, urlsplit, urlunsplit
 
+from slugify import slugify
 
+TRACKING_PARAMS = frozenset({"gclid", "fbclid", "msclkid"})
+_KEBAB_TO_SNAKE = str.maketrans("-", "_")
+_SLUG_DISALLOWED = re.compile(r"[^a-z0-9]+")
+
+
+@lru_cache(maxsize=256)
 def snake_to_pascal_case(filename: str) -> str:
     """Convert snake/kebab to PascalCase."""
 
-    parts = filename.replace("-", "_").split("_")
+    parts = filename.translate(_KEBAB_TO_SNAKE).split("_")
     return "".join(p.capitalize() for p in parts)
 
 
 def is_url(input: str) -> bool:
+    # Nearly every href is either absolute http(s) or a relative path
+    if input.startswith(("http://", "https://")):
+        return True
+    if "://" not in input:
+        return False
     try:
         result = urlparse(input)
         return all([result.scheme, result.netloc])
     except ValueError:
         return False
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL for dedup: drop fragment and tracking params, sort query."""
+    parts = urlsplit(url)
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.startswith("utm_") and k not in TRACKING_PARAMS
+    )
+    return urlunsplit(
+        (parts.scheme, parts.netloc, parts.path, urlencode(query, quote_via=quote), "")
+    )
+
+
+@lru_cache(maxsize=4096)
+def url_slug(url: str) -> str:
+    """Slugify a URL; plain-ASCII URLs skip python-slugify's unicode pipeline."""
+    # `;` may end an HTML entity, which slugify decodes before slugging
+    if not url.isascii() or ";" in url:
+        return slugify(url)
+    return _SLUG_DISALLOWED.sub("-", url.lower()).strip("-")
@@ -1,14 +1,63 @@
 import asyncio
-import json
+import hashlib
 import os
+import re
+from functools import lru_cache
+
+import aiofiles
+import orjson
+from cachetools import LRUCache
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
-from langgraph.graph.message import add_messages
 import context as ctx
-from typing import List, Any, Optional
-from pydantic import BaseModel, Field, ConfigDict
+from typing import Dict, List, Any, Optional
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 
 from utils.common.prompt.prompt_loader import load_prompt_file, render_prompt
 from utils.common.function.gitlab_helpers import get_dbt_model_logic, get_dbt_model_schema
+from utils.common.function.node_cache import bypass_node_cache, cached_node
+
+# Markdown code fence the summary LLM wraps its JSON answer in
+_CODE_FENCE = re.compile(r"\A\s*```(?:json)?\s*|\s*```\s*\Z")
+# Outermost JSON object, for answers that wrap it in prose
+_JSON_OBJECT = re.compile(r"\{.*\}", re.S)
+# Staging table identifiers typed verbatim, optionally schema-qualified
+_STG_RE = re.compile(r"\b((?:[a-z][a-z0-9_]*\.)?(?:stg|staging)_[a-z0-9_]+)\b", re.I)
+
+
+_SQL_LINE_COMMENT = re.compile(r"--.*?$", re.M)
+_SQL_BLOCK_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_INLINE_SPACE = re.compile(r"[ \t]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+_TRUNCATED = "\n/* ...truncated... */\n"
+
+# blake2b of the rendered prompt inputs -> (generated model, generated yaml)
+_SUMMARY_CACHE: LRUCache = LRUCache(maxsize=64)
+
+
+def _truncate(s: str, max_chars: int) -> str:
+    """Keep the head and tail of `s` within `max_chars`."""
+    if len(s) <= max_chars:
+        return s
+    half = max_chars // 2
+    return s[:half] + _TRUNCATED + s[-half:]
+
+
+def _shrink_sql(s: str, max_chars: int) -> str:
+    """Drop comments and redundant whitespace from SQL, then truncate.
+
+    Line breaks are kept so the LLM still sees (and reproduces) readable SQL.
+    """
+    s = _SQL_BLOCK_COMMENT.sub("", s)
+    s = _SQL_LINE_COMMENT.sub("", s)
+    s = _INLINE_SPACE.sub(" ", s)
+    s = _BLANK_LINES.sub("\n", s).strip()
+    return _truncate(s, max_chars)
+
+
+@lru_cache(maxsize=None)
+def _tpl(section: str) -> str:
+    """Prompt section from prompts.md, read and parsed once per process."""
+    return load_prompt_file("prompts.md", section)
 
 
 class MigrationState(BaseModel):
@@ -17,15 +66,22 @@ class MigrationState(BaseModel):
     Stores workflow messages, intermediate results, and final output.
     """
 
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    # Nodes mutate the state in place; skip per-assignment validation and
+    # re-validation of nested message models when LangGraph rebuilds the state
+    model_config = ConfigDict(
+        arbitrary_types_allowed=True,
+        validate_assignment=False,
+        revalidate_instances="never",
+    )
 
     # ============================================================
     # 1. Orchestrator-bound messages (LangGraph uses this field)
     # ============================================================
-    messages: List[BaseMessage] = Field(
-        default_factory=list,
-        json_schema_extra={"add_messages": add_messages}
-    )
+    # Plain last-value channel: nodes return the whole (pruned) list, so an
+    # `add_messages` reducer would only re-merge it and undo the pruning
+    messages: List[BaseMessage] = Field(default_factory=list)
+    # content of the latest HumanMessage, tracked so nodes don't rescan `messages`
+    last_user_text: Optional[str] = Field(default=None, exclude=True)
 
 
     # ============================================================
@@ -39,6 +95,9 @@ class MigrationState(BaseModel):
     # ---------------------------------------------------------
     mapping_sheet_data: Any = None
     pii_sheet_data: Any = None
+    # sheet rows keyed by lower-cased `clickhouse_stg_table`, built once per run
+    mapping_sheet_index: Optional[Dict[str, Any]] = Field(default=None, exclude=True)
+    pii_sheet_index: Optional[Dict[str, Any]] = Field(default=None, exclude=True)
 
     # ---------------------------------------------------------
     # 4. Resolved table identifiers (from text extraction)
@@ -79,6 +138,36 @@ class MigrationState(BaseModel):
     # 9. Control flags
     # ---------------------------------------------------------
     is_orchestrator_ready: bool = False
+    max_messages: int = 20                          # sliding window for `messages`
+
+    @model_validator(mode="after")
+    def _on_human_message(self) -> "MigrationState":
+        # The request arrives with the initial state; afterwards the value is
+        # carried between nodes and this is a no-op
+        if self.last_user_text is None:
+            human = next((m for m in reversed(self.messages) if isinstance(m, HumanMessage)), None)
+            if human is not None:
+                self.last_user_text = str(human.content)
+        return self
+
+    def log(self, content: str) -> None:
+        """Append a SystemMessage and keep `messages` within `max_messages`."""
+        self.messages.append(SystemMessage(content=content))
+        self._prune_messages()
+
+    def _prune_messages(self) -> None:
+        """Keep the last messages plus the first user request and system prompt."""
+        if len(self.messages) <= self.max_messages:
+            return
+
+        head = []
+        for kind in (HumanMessage, SystemMessage):
+            first = next((m for m in self.messages if isinstance(m, kind)), None)
+            if first is not None:
+                head.append(first)
+
+        tail = self.messages[-max(self.max_messages - len(head), 1):]
+        self.messages = [m for m in head if not any(m is t for t in tail)] + tail
 
 
 # Node implementations (adapted from previous agent.py)
@@ -89,7 +178,7 @@ def orchestrator_node(state: MigrationState) -> MigrationState:
         state.pii_sheet_id = ctx.dpx2clickhouse_config['DPX2CLICKHOUSE_PII_COLUMNS_SHEET']
         state.is_orchestrator_ready = True
 
-    pr_tpl = load_prompt_file("prompts.md", "Step for agent to follow")
+    pr_tpl = _tpl("Step for agent to follow")
     pr_tpl_render = render_prompt(
         pr_tpl,
         {
@@ -97,16 +186,21 @@ def orchestrator_node(state: MigrationState) -> MigrationState:
             "pii_sheet_id": state.pii_sheet_id,
         }
     )
-    state.messages.append(SystemMessage(content=pr_tpl_render))
+    state.log(pr_tpl_render)
     return state
 
 
 def extract_stg_table_node(state: MigrationState) -> MigrationState:
-    user_text = " ".join(msg.content for msg in state.messages if isinstance(msg, HumanMessage))
+    user_text = state.last_user_text or (str(state.messages[-1].content) if state.messages else "")
     llm = ctx.llm_google_sheet or (ctx.llm_orchestrator if ctx.llm_orchestrator else None)
 
-    if llm:
-        pr_tpl = load_prompt_file("prompts.md", "Extract Staging ClickHouse Table")
+    # A single unambiguous identifier in the request needs no LLM round-trip
+    candidates = list(dict.fromkeys(m.group(1) for m in _STG_RE.finditer(user_text)))
+    if len(candidates) == 1:
+        state.clickhouse_stg_table = candidates[0]
+        state.log(f"Regex extracted clickhouse_stg_table: `{state.clickhouse_stg_table}`")
+    elif llm:
+        pr_tpl = _tpl("Extract Staging ClickHouse Table")
         pr_tpl_render = render_prompt(
             pr_tpl,
             {
@@ -115,23 +209,32 @@ def extract_stg_table_node(state: MigrationState) -> MigrationState:
         )
         response = llm.invoke(pr_tpl_render)
         state.clickhouse_stg_table = str(response.content).strip().strip('`')
-        state.messages.append(SystemMessage(content=f"LLM extracted clickhouse_stg_table: `{state.clickhouse_stg_table}`"))
+        state.log(f"LLM extracted clickhouse_stg_table: `{state.clickhouse_stg_table}`")
     else:
         state.clickhouse_stg_table = user_text.strip().split()[-1]
 
     return state
 
 
-def query_google_sheet(state: MigrationState, sheet_id_attr: str):
+def _sheet_key(value: Any) -> str:
+    return str(value).strip().lower()
+
+
+async def _load_sheet_indexed(state: MigrationState, sheet_id_attr: str) -> Dict[str, Any]:
+    index_attr = sheet_id_attr.replace("_id", "_index")
+    index = getattr(state, index_attr, None)
+    if index is not None:
+        return index
+
     if not getattr(state, sheet_id_attr):
         raise ValueError(f"{sheet_id_attr} missing in state")
     sheet_id = getattr(state, sheet_id_attr)
     payload = {"spreadsheet_id": sheet_id}
 
-    result = asyncio.run(ctx.mcp.aexecute_tool("google_sheet-server", "google_sheet_query", payload)) if ctx.mcp else []
+    result = await ctx.mcp.aexecute_tool("google_sheet-server", "google_sheet_query", payload) if ctx.mcp else []
     if isinstance(result, str):
         try:
-            data = json.loads(result)
+            data = orjson.loads(result)
         except Exception:
             data = []
     elif isinstance(result, list):
@@ -139,13 +242,30 @@ def query_google_sheet(state: MigrationState, sheet_id_attr: str):
     else:
         data = []
 
-    target_name = state.clickhouse_stg_table
-    matched = [row for row in data if
-               str(row.get("clickhouse_stg_table", "")).strip().lower() == target_name.lower()]
-    return matched[0] if matched else None, data
-
-def query_mapping_stg_dpx_node(state: MigrationState) -> MigrationState:
-    row, _ = query_google_sheet(state, "mapping_sheet_id")
+    index = {}
+    for row in data:
+        # first row wins for duplicated table names
+        index.setdefault(_sheet_key(row.get("clickhouse_stg_table", "")), row)
+    setattr(state, index_attr, index)
+    return index
+
+
+async def query_google_sheet(state: MigrationState, sheet_id_attr: str):
+    index = await _load_sheet_indexed(state, sheet_id_attr)
+    target = state.clickhouse_stg_table
+    # Extracted names are usually already in key form; only normalize on a miss
+    row = index.get(target)
+    if row is None:
+        row = index.get(_sheet_key(target))
+    return row, index
+
+@cached_node(
+    lambda s: (s.mapping_sheet_id, s.clickhouse_stg_table),
+    writes=["clickhouse_raw_table", "dpx_catalog", "dpx_schema", "dpx_table_name", "dpx_table_id",
+            "mapping_sheet_data"],
+)
+async def query_mapping_stg_dpx_node(state: MigrationState) -> MigrationState:
+    row, _ = await query_google_sheet(state, "mapping_sheet_id")
     if not row:
         raise ValueError(f"No mapping found for staging table '{state.clickhouse_stg_table}'")
     state.clickhouse_raw_table = row.get("clickhouse_raw_table")
@@ -154,12 +274,13 @@ def query_mapping_stg_dpx_node(state: MigrationState) -> MigrationState:
     state.dpx_table_name = row.get("dpx_table_name")
     state.dpx_table_id = row.get("dpx_table_id")
     state.mapping_sheet_data = row
-    state.messages.append(SystemMessage(content=f"Found mapping: {row}"))
+    state.log(f"Found mapping: {row}")
     return state
 
 
-def query_pii_node(state: MigrationState) -> MigrationState:
-    row, _ = query_google_sheet(state, "pii_sheet_id")
+@cached_node(lambda s: (s.pii_sheet_id, s.clickhouse_stg_table), writes=["stg_pii_columns", "pii_sheet_data"])
+async def query_pii_node(state: MigrationState) -> MigrationState:
+    row, _ = await query_google_sheet(state, "pii_sheet_id")
     pii_cols = []
     if row:
         raw_cols = row.get("stg_pii_columns", [])
@@ -169,24 +290,26 @@ def query_pii_node(state: MigrationState) -> MigrationState:
             pii_cols = [str(x).strip() for x in raw_cols]
     state.stg_pii_columns = pii_cols
     state.pii_sheet_data = row
-    state.messages.append(SystemMessage(content=f"Found PII columns: {pii_cols}"))
+    state.log(f"Found PII columns: {pii_cols}")
     return state
 
 
-def extract_s3_path_node(state: MigrationState) -> MigrationState:
+@cached_node(lambda s: s.dpx_table_id, writes=["minio_s3_path"])
+async def extract_s3_path_node(state: MigrationState) -> MigrationState:
     if not state.dpx_table_id:
         raise ValueError("dpx_table_id missing in state")
     sql = f"select fs_location from public.active_tables where table_id = '{state.dpx_table_id}'"
     payload = {"sql_query": sql}
-    result = asyncio.run(ctx.mcp.aexecute_tool("airflow_postgres_gcp-server", "postgres_query", payload)) if ctx.mcp else '[]'
+    result = await ctx.mcp.aexecute_tool("airflow_postgres_gcp-server", "postgres_query", payload) if ctx.mcp else '[]'
     try:
-        state.minio_s3_path = "https://s3-dpex.vetc.com.vn/" + json.loads(result)[0]['fs_location']
+        state.minio_s3_path = "https://s3-dpex.vetc.com.vn/" + orjson.loads(result)[0]['fs_location']
     except Exception:
         state.minio_s3_path = None
-    state.messages.append(SystemMessage(content=f"Extracted S3 MinIO path: {state.minio_s3_path}"))
+    state.log(f"Extracted S3 MinIO path: {state.minio_s3_path}")
     return state
 
 
+@cached_node(lambda s: s.clickhouse_stg_table, writes=["stg_table_schema"])
 async def fetch_clickhouse_schema(state: MigrationState) -> MigrationState:
     if not state.stg_table_schema:
         state.stg_table_schema = await get_dbt_model_schema(
@@ -194,102 +317,156 @@ async def fetch_clickhouse_schema(state: MigrationState) -> MigrationState:
             state.clickhouse_stg_table,
             project_id=ctx.dpx2clickhouse_config['DPX2CLICKHOUSE_DBT_CLICKHOUSE_REPO'],
         )
-        state.messages.append(SystemMessage(content=f"[GetDBTClickhouseSchema] Retrieved schema for `{state.clickhouse_stg_table}`"))
+        state.log(f"[GetDBTClickhouseSchema] Retrieved schema for `{state.clickhouse_stg_table}`")
     return state
 
 
+@cached_node(
+    lambda s: (s.clickhouse_stg_table, s.clickhouse_raw_table, s.dpx_table_name, s.dpx_catalog, s.dpx_schema),
+    writes=["stg_sql_logic", "raw_sql_logic", "dpx_sql_logic"],
+)
 async def fetch_dbt_logic(state: MigrationState) -> MigrationState:
     if all([state.stg_sql_logic, state.raw_sql_logic, state.dpx_sql_logic]):
         return state
 
     if not ctx.llm_gitlab_vetc:
-        state.messages.append(SystemMessage(content="[QueryGitlabDBT] No llm_gitlab_vetc available"))
+        state.log("[QueryGitlabDBT] No llm_gitlab_vetc available")
         return state
 
     required_fields = [state.clickhouse_stg_table, state.clickhouse_raw_table, state.dpx_table_name,
                        state.dpx_catalog, state.dpx_schema, state.dpx_table_id]
     if all(required_fields):
-        state.stg_sql_logic = await get_dbt_model_logic(
-            ctx.mcp,
-            model_name=state.clickhouse_stg_table,
-            project_id=ctx.dpx2clickhouse_config['DPX2CLICKHOUSE_DBT_CLICKHOUSE_REPO'],
-            path='models/staging',
-        )
-        state.raw_sql_logic = await get_dbt_model_logic(
-            ctx.mcp,
-            model_name=state.clickhouse_raw_table,
-            project_id=ctx.dpx2clickhouse_config['DPX2CLICKHOUSE_DBT_CLICKHOUSE_REPO'],
-            path='models/raw',
-        )
-        state.dpx_sql_logic = await get_dbt_model_logic(
-            ctx.mcp,
-            model_name=state.dpx_table_name,
-            project_id=ctx.dpx2clickhouse_config['DPX2CLICKHOUSE_DBT_TRINO_REPO'],
-            path=f'models/{state.dpx_catalog}/{state.dpx_schema}',
-            ref='production',
+        clickhouse_repo = ctx.dpx2clickhouse_config['DPX2CLICKHOUSE_DBT_CLICKHOUSE_REPO']
+        # The three models are independent, fetch only the missing ones concurrently
+        requests = {
+            "stg_sql_logic": dict(model_name=state.clickhouse_stg_table, project_id=clickhouse_repo,
+                                  path='models/staging'),
+            "raw_sql_logic": dict(model_name=state.clickhouse_raw_table, project_id=clickhouse_repo,
+                                  path='models/raw'),
+            "dpx_sql_logic": dict(model_name=state.dpx_table_name,
+                                  project_id=ctx.dpx2clickhouse_config['DPX2CLICKHOUSE_DBT_TRINO_REPO'],
+                                  path=f'models/{state.dpx_catalog}/{state.dpx_schema}', ref='production'),
+        }
+        pending = [field for field in requests if not getattr(state, field)]
+        results = await asyncio.gather(
+            *(get_dbt_model_logic(ctx.mcp, **requests[field]) for field in pending),
+            return_exceptions=True,
         )
-        state.messages.append(SystemMessage(content="[QueryGitlabDBT] Retrieved dbt logic for ClickHouse and DPX tables"))
+
+        failed = []
+        for field, result in zip(pending, results):
+            if isinstance(result, Exception):
+                failed.append(f"{field}: {result}")
+            else:
+                setattr(state, field, result)
+
+        if failed:
+            state.log("[QueryGitlabDBT] Failed to fetch dbt logic:\n- " + "\n- ".join(failed))
+        else:
+            state.log("[QueryGitlabDBT] Retrieved dbt logic for ClickHouse and DPX tables")
     else:
-        state.messages.append(SystemMessage(content="[QueryGitlabDBT] Missing required fields to fetch dbt logic"))
+        state.log("[QueryGitlabDBT] Missing required fields to fetch dbt logic")
     return state
 
 
 async def summarize_migration_node(state: MigrationState) -> MigrationState:
+    # e.g. a resumed checkpoint that already got through this step
+    if state.generated_stg_dbt_model and state.generated_stg_schema_yaml:
+        state.log("[Summary] Generated logic + schema already present, skipping")
+        return state
+
     if not ctx.llm_summary:
-        state.messages.append(SystemMessage(content="[Summary] No llm_summary available"))
+        state.log("[Summary] No llm_summary available")
         return state
 
-    # load prompt template and render with state values
-    mapping = {
-        "clickhouse_stg_table": state.clickhouse_stg_table or "",
+    # Large SQL/YAML inputs are shrunk to a per-field budget to bound prompt tokens
+    max_chars = int(ctx.dpx2clickhouse_config.get("DPX2CLICKHOUSE_SUMMARY_MAX_CHARS_PER_FIELD") or 4000)
+    sources = {
         "stg_sql_logic": state.stg_sql_logic or "",
         "raw_sql_logic": state.raw_sql_logic or "",
         "dpx_sql_logic": state.dpx_sql_logic or "",
-        "minio_s3_path": state.minio_s3_path or "",
         "stg_table_schema": state.stg_table_schema or "",
+    }
+    shrunk = {
+        k: _truncate(v, max_chars) if k == "stg_table_schema" else _shrink_sql(v, max_chars)
+        for k, v in sources.items()
+    }
+    before = sum(len(v) for v in sources.values())
+    after = sum(len(v) for v in shrunk.values())
+    if after < before:
+        state.log(f"[Summary] Shrunk prompt inputs from {before} to {after} chars")
+
+    # load prompt template and render with state values
+    mapping = {
+        "clickhouse_stg_table": state.clickhouse_stg_table or "",
+        **shrunk,
+        "minio_s3_path": state.minio_s3_path or "",
         "stg_pii_columns": ", ".join(state.stg_pii_columns or []),
     }
 
-    pr_tpl = load_prompt_file("prompts.md", "Summarize and Rewrite Staging DBT Logic & YAML")
+    digest = hashlib.blake2b(orjson.dumps(mapping, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+    cached = None if bypass_node_cache.get() else _SUMMARY_CACHE.get(digest)
+    if cached is not None:
+        state.generated_stg_dbt_model, state.generated_stg_schema_yaml = cached
+        state.log("[Summary] Reused generated logic + schema for identical inputs")
+        return state
+
+    pr_tpl = _tpl("Summarize and Rewrite Staging DBT Logic & YAML")
     pr_tpl_render = render_prompt(
         pr_tpl,
         mapping
     )
     raw_response = ctx.llm_summary.invoke(pr_tpl_render).content.strip()
-    state.messages.append(SystemMessage(content="[Summary] Raw LLM response:"))
+    state.log("[Summary] Raw LLM response:")
 
     try:
-        cleaned = raw_response.strip("```json").strip("```").strip()
-        rs_json = json.loads(cleaned)
+        cleaned = _CODE_FENCE.sub("", raw_response).strip()
+        try:
+            rs_json = orjson.loads(cleaned)
+        except orjson.JSONDecodeError:
+            found = _JSON_OBJECT.search(cleaned)
+            if found is None:
+                raise
+            rs_json = orjson.loads(found.group(0))
         state.generated_stg_dbt_model = rs_json.get("generated_stg_dbt_model")
         state.generated_stg_schema_yaml = rs_json.get("generated_stg_schema_yaml")
-        state.messages.append(SystemMessage(content="[Summary] Successfully parsed new logic + schema"))
-    except json.JSONDecodeError as e:
-        state.messages.append(SystemMessage(content=f"[Summary] JSON decode error: {e}\nRaw response:\n{raw_response}"))
+        if state.generated_stg_dbt_model and state.generated_stg_schema_yaml:
+            _SUMMARY_CACHE[digest] = (state.generated_stg_dbt_model, state.generated_stg_schema_yaml)
+        state.log("[Summary] Successfully parsed new logic + schema")
+    except orjson.JSONDecodeError as e:
+        state.log(f"[Summary] JSON decode error: {e}\nRaw response:\n{raw_response}")
     return state
 
 
-def write_output_node(state: MigrationState) -> MigrationState:
+@lru_cache(maxsize=None)
+def _output_dir(base_dir: Optional[str]) -> str:
+    """Resolve (and create, once per process) the directory output files go to."""
+    output_dir = os.path.join(base_dir or os.path.dirname(__file__), 'output_files')
+    os.makedirs(output_dir, exist_ok=True)
+    return output_dir
+
+
+async def _write_text(path: str, content: str) -> None:
+    async with aiofiles.open(path, "w", encoding="utf-8") as f:
+        await f.write(content)
+
+
+async def write_output_node(state: MigrationState) -> MigrationState:
     if not state.generated_stg_dbt_model or not state.generated_stg_schema_yaml:
-        state.messages.append(SystemMessage(content="[WriteOutputFiles] Missing logic or schema to write"))
+        state.log("[WriteOutputFiles] Missing logic or schema to write")
         return state
 
-    if ctx.output_dir:
-        output_dir = os.path.join(ctx.output_dir, 'output_files')
-        os.makedirs(output_dir, exist_ok=True)
-    else:
-        output_dir = os.path.join(os.path.dirname(__file__), 'output_files')
-        os.makedirs(output_dir, exist_ok=True)
+    output_dir = _output_dir(ctx.output_dir)
 
     sql_file = os.path.join(output_dir, f"dpx_{state.clickhouse_stg_table}.sql")
     yaml_file = os.path.join(output_dir, f"dpx_{state.clickhouse_stg_table}_schema.yaml")
 
-    with open(sql_file, "w", encoding="utf-8") as f:
-        f.write(state.generated_stg_dbt_model)
-    with open(yaml_file, "w", encoding="utf-8") as f:
-        f.write(state.generated_stg_schema_yaml)
+    await asyncio.gather(
+        _write_text(sql_file, state.generated_stg_dbt_model),
+        _write_text(yaml_file, state.generated_stg_schema_yaml),
+    )
 
-    state.messages.append(SystemMessage(content=f"[WriteOutputFiles] Wrote files:\n- SQL: {sql_file}\n- YAML: {yaml_file}"))
+    state.log(f"[WriteOutputFiles] Wrote files:\n- SQL: {sql_file}\n- YAML: {yaml_file}")
     return state
 
 # router is built in agentic/graph.py
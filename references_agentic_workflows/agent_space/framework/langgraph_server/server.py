@@ -16,14 +16,21 @@ Notes about Langsmith / tracing:
 """
 from __future__ import annotations
 
+import asyncio
+import importlib
 import importlib.util
-import json
+import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import orjson
+
+from utils.common.function.node_cache import bypass_node_cache, clear_node_cache
 
 try:
     from fastapi import FastAPI, HTTPException
     from fastapi import Body
+    from fastapi.responses import StreamingResponse
     from pydantic import BaseModel
 except Exception:
     # If FastAPI is not installed, export a helpful message on import
@@ -56,22 +63,36 @@ def discover_agent_graphs() -> Dict[str, Path]:
     return agents
 
 
-def load_graph_module(graph_path: Path):
-    """Dynamically import a graph module by path and return the module object."""
+async def load_graph_module(graph_path: Path):
+    """Dynamically import a graph module by path and return the module object.
+
+    The module body (LangGraph compile, LLM/MCP client setup, ...) runs in a
+    worker thread so the event loop keeps serving other requests meanwhile.
+    """
     name = f"agents_graph_{graph_path.parent.name}"
     spec = importlib.util.spec_from_file_location(name, str(graph_path))
     module = importlib.util.module_from_spec(spec)
     loader = spec.loader
     assert loader is not None
-    loader.exec_module(module)
+    await asyncio.get_running_loop().run_in_executor(None, loader.exec_module, module)
     return module
 
 
-async def run_graph_and_collect(graph_module, initial_state: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-    """Run the graph's compiled `app` by streaming `app.astream(initial_state)` and collect step outputs.
+def purge_agent_modules(agent_name: str) -> None:
+    """Forget an agent's imported package and cached node results.
 
-    Returns a list of step dicts: [{node_name: { ... node state ...}}, ...]
+    The graph module imports its siblings (`agents.<name>.node_functions`, ...)
+    as regular modules; dropping them from `sys.modules` makes the next graph
+    import load their current source too.
     """
+    package = f"agents.{agent_name}"
+    for name in [m for m in sys.modules if m == package or m.startswith(package + ".")]:
+        del sys.modules[name]
+    clear_node_cache(package)
+
+
+def get_compiled_app(graph_module):
+    """Return the graph's compiled `app` (or `workflow`) object."""
     # Attempt to find a compiled app in the module (common name is `app`)
     app_obj = getattr(graph_module, "app", None)
     if app_obj is None:
@@ -79,40 +100,56 @@ async def run_graph_and_collect(graph_module, initial_state: Optional[Dict[str,
         app_obj = getattr(graph_module, "workflow", None)
     if app_obj is None:
         raise ValueError("Graph module does not define a compiled 'app' or 'workflow' object")
+    return app_obj
+
+
+# Values orjson encodes as-is, no serializability probe needed
+_JSON_OK = (str, int, float, bool, type(None))
+
+
+def to_jsonable(v: Any) -> Any:
+    """Convert a node-state value to something JSON-serializable, by type."""
+    if isinstance(v, _JSON_OK):
+        return v
+    if isinstance(v, (list, tuple)):
+        return [to_jsonable(x) for x in v]
+    if isinstance(v, dict):
+        return {k: to_jsonable(x) for k, x in v.items()}
+    # messages are often objects (HumanMessage/SystemMessage): keep their `.content`
+    if hasattr(v, "content"):
+        return v.content
+    try:
+        return orjson.loads(orjson.dumps(v))
+    except Exception:
+        # fallback to string repr for non-serializable values
+        return str(v)
+
+
+def normalize_step(step: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize one `astream` step ({node_name: node_state}) for JSON output."""
+    to_json = to_jsonable  # local lookup inside the comprehensions
+    return {
+        node_name: {k: to_json(v) for k, v in node_state.items()}
+        for node_name, node_state in step.items()
+    }
+
+
+async def run_graph_and_collect(graph_module, initial_state: Optional[Dict[str, Any]] = None,
+                                no_cache: bool = False) -> List[Dict[str, Any]]:
+    """Run the graph's compiled `app` by streaming `app.astream(initial_state)` and collect step outputs.
+
+    Returns a list of step dicts: [{node_name: { ... node state ...}}, ...]
+    """
+    app_obj = get_compiled_app(graph_module)
+    bypass_node_cache.set(no_cache)
 
-    steps = []
+    steps: List[Dict[str, Any]] = []
+    append, normalize = steps.append, normalize_step
 
     # The graph library yields async iterator of step dicts via app.astream
     try:
         async for step in app_obj.astream(initial_state or {}):
-            # Normalize messages for JSON
-            normalized = {}
-            for node_name, node_state in step.items():
-                # node_state is typically a dict
-                ns = {}
-                # copy selected fields for inspectability
-                for k, v in node_state.items():
-                    # messages are often objects (HumanMessage/SystemMessage). Extract `.content` if present.
-                    if k == "messages" and isinstance(v, list):
-                        msgs = []
-                        for m in v:
-                            try:
-                                content = getattr(m, "content", m)
-                            except Exception:
-                                content = str(m)
-                            msgs.append(content)
-                        ns[k] = msgs
-                    else:
-                        # try json serializable conversion
-                        try:
-                            json.dumps(v)
-                            ns[k] = v
-                        except Exception:
-                            # fallback to string repr for non-serializable values
-                            ns[k] = str(v)
-                normalized[node_name] = ns
-
-            steps.append(normalized)
+            append(normalize(step))
     except Exception as e:
         # capture exception as a final step
         steps.append({"__error__": str(e)})
@@ -120,32 +157,106 @@ async def run_graph_and_collect(graph_module, initial_state: Optional[Dict[str,
     return steps
 
 
+async def stream_graph_steps(agent_name: str, app_obj, initial_state: Optional[Dict[str, Any]] = None,
+                             no_cache: bool = False) -> AsyncIterator[bytes]:
+    """Yield NDJSON lines: an `{"agent": ...}` header, then one line per graph step.
+
+    Only the current step is held in memory; a failure is sent as a final
+    `{"__error__": ...}` line since the response has already started.
+    """
+    bypass_node_cache.set(no_cache)
+    yield orjson.dumps({"agent": agent_name}) + b"\n"
+    try:
+        async for step in app_obj.astream(initial_state or {}):
+            yield orjson.dumps(normalize_step(step), default=str) + b"\n"
+    except Exception as e:
+        yield orjson.dumps({"__error__": str(e)}) + b"\n"
+
+
+@app.on_event("startup")
+async def prime_agent_cache() -> None:
+    """Discover agents once; graph modules are imported on their first run."""
+    app.state.agents = discover_agent_graphs()
+    app.state.modules = {}
+    app.state.module_locks = {}
+
+
+async def get_graph_module(agent_name: str, graph_path: Path):
+    """Return the cached graph module for an agent, importing it at most once."""
+    module = app.state.modules.get(agent_name)
+    if module is not None:
+        return module
+
+    # One lock per agent: different agents import in parallel, the same one once
+    async with app.state.module_locks.setdefault(agent_name, asyncio.Lock()):
+        module = app.state.modules.get(agent_name)
+        if module is None:
+            module = await load_graph_module(graph_path)
+            app.state.modules[agent_name] = module
+    return module
+
+
+@app.on_event("shutdown")
+async def close_mcp_sessions() -> None:
+    """Close the persistent MCP sessions agents opened while serving runs."""
+    try:
+        from framework.mcp_adapters.server import MCPClientWrapper
+    except Exception:
+        return
+    await MCPClientWrapper.aclose_all()
+
+
 @app.get("/agents")
 async def list_agents() -> Dict[str, Any]:
     """Return available agents (folders containing `graph.py`)."""
+    return {"agents": list(app.state.agents.keys())}
+
+
+@app.post("/agents/reload")
+async def reload_agents() -> Dict[str, Any]:
+    """Rescan `agents/` and drop cached graph modules so they are imported afresh."""
     agents = discover_agent_graphs()
-    return {"agents": list(agents.keys())}
+    for agent_name in set(agents) | set(app.state.agents):
+        purge_agent_modules(agent_name)
+    importlib.invalidate_caches()
+    app.state.agents = agents
+    app.state.modules = {}
+    app.state.module_locks = {}
+    return {"agents": list(app.state.agents.keys())}
 
 
 @app.post("/run/{agent_name}")
-async def run_agent(agent_name: str, request: RunRequest = Body(...)) -> Dict[str, Any]:
-    """Run the named agent and return the sequence of steps.
+async def run_agent(agent_name: str, request: RunRequest = Body(...), buffered: bool = False,
+                    no_cache: bool = False) -> Any:
+    """Run the named agent and stream its steps as NDJSON.
 
     Body: { initial_state?: {...} }
+    Query: `?buffered=1` returns the old single `{agent, steps}` JSON document instead;
+    `?no_cache=1` re-runs nodes whose results would otherwise come from the node cache.
     """
-    agents = discover_agent_graphs()
+    agents = app.state.agents
     if agent_name not in agents:
         raise HTTPException(status_code=404, detail=f"Agent '{agent_name}' not found")
 
     graph_path = agents[agent_name]
 
     try:
-        module = load_graph_module(graph_path)
+        module = await get_graph_module(agent_name, graph_path)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to load graph module: {e}")
 
+    if not buffered:
+        try:
+            app_obj = get_compiled_app(module)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error running graph: {e}")
+        return StreamingResponse(
+            stream_graph_steps(agent_name, app_obj, request.initial_state, no_cache),
+            media_type="application/x-ndjson",
+        )
+
     try:
-        steps = await run_graph_and_collect(module, request.initial_state)
+        steps = await run_graph_and_collect(module, request.initial_state, no_cache)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error running graph: {e}")
 
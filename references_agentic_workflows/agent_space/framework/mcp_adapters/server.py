@@ -1,9 +1,55 @@
 import asyncio
-from typing import Any, Dict, List, Optional, Union
+import re
+import threading
+import weakref
+from typing import Any, Dict, List, Optional, Tuple, Union
 import inspect
+import httpx
+import orjson
+from cachetools import TTLCache
+from utils.common.function.node_cache import bypass_node_cache
 from variables.helper import ConfigLoader
 from variables.mcp import MCPConfig
 from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import load_mcp_tools
+
+try:
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+# Read-only tools whose results are cached by `aexecute_tool` by default;
+# anything else (SQL queries, batches) is only cached when the caller opts in
+_CACHEABLE_TOOLS = frozenset({
+    "get_repository_tree",
+    "get_file_contents",
+    "google_sheet_query",
+    "google_sheet_tabs",
+    "google_sheet_title",
+})
+
+# MCP_SERVER_<NAME>_URL -> <name>-server
+_SERVER_KEY_RE = re.compile(r"MCP_SERVER_(.+)_URL")
+
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+
+def _pooled_http_client(
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[httpx.Timeout] = None,
+    auth: Optional[httpx.Auth] = None,
+) -> httpx.AsyncClient:
+    """httpx client for MCP transports: keep-alive pool, bounded connect
+    timeout and HTTP/2 when `h2` is installed."""
+    return httpx.AsyncClient(
+        headers=headers,
+        timeout=timeout or httpx.Timeout(30.0, connect=5.0),
+        auth=auth,
+        limits=_HTTP_LIMITS,
+        http2=_HTTP2,
+        follow_redirects=True,
+    )
 
 
 class MCPClientWrapper:
@@ -13,39 +59,63 @@ class MCPClientWrapper:
 
     This wrapper sanitizes schemas returned by MCP servers to remove
     `additionalProperties` keys from plain Python dict/list structures.
+
+    Tool execution goes through one long-lived session per server (opened on
+    first use and kept until `aclose()`), instead of a new connection and
+    handshake for every call. Each session owns one pooled httpx client
+    (see `_pooled_http_client`), so its requests share keep-alive connections.
     """
 
-    def __init__(self) -> None:
+    _instances: "weakref.WeakSet[MCPClientWrapper]" = weakref.WeakSet()
+
+    def __init__(self, result_ttl: float = 60.0, result_cache_size: int = 512) -> None:
         raw_config = ConfigLoader.load_single(MCPConfig)
         self.server_map = self._discover_servers(raw_config)
         self.client = MultiServerMCPClient(self.server_map)
+        # server name -> (owning loop, session-bound tool index, stop event, holder task)
+        self._sessions: Dict[str, Tuple[asyncio.AbstractEventLoop, Dict[str, Any], asyncio.Event, asyncio.Task]] = {}
+        # (server name, loop) -> lock serializing session setup on that loop
+        self._session_locks: Dict[Tuple[str, asyncio.AbstractEventLoop], asyncio.Lock] = {}
+        # server name -> tools from `client.get_tools`, and their name index
+        self._tool_list_cache: Dict[str, List[Any]] = {}
+        self._tool_index: Dict[str, Dict[str, Any]] = {}
+        # server name -> True when its cached listing has no dict/list tools
+        self._plain_tool_lists: Dict[str, bool] = {}
+        # (server, tool, canonical payload) -> result of a recent identical call
+        self._exec_cache: Optional[TTLCache] = (
+            TTLCache(maxsize=result_cache_size, ttl=result_ttl) if result_ttl > 0 else None
+        )
+        # id -> tool already checked to have an async `arun`
+        self._async_tools: Dict[int, Any] = {}
+        # background loop for the sync wrappers, started on first use
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        MCPClientWrapper._instances.add(self)
 
     # ------------------------------------------------------------------
-    def _discover_servers(self, config: Dict[str, Optional[str]]) -> Dict[str, Dict[str, str]]:
+    def _discover_servers(self, config: Dict[str, Optional[str]]) -> Dict[str, Dict[str, Any]]:
         """
         Build the server map from configuration variables, ignoring entries
         whose URL value is None or empty. This prevents runtime errors when
         libraries expect a string URL.
         """
-        server_map: Dict[str, Dict[str, str]] = {}
+        server_map: Dict[str, Dict[str, Any]] = {}
 
         for key, value in config.items():
-            if key.startswith("MCP_SERVER_") and key.endswith("_URL"):
-                name = (
-                    key.replace("MCP_SERVER_", "")
-                       .replace("_URL", "")
-                       .lower()
-                )
-                # Skip entries that are None or empty strings
-                if value is None or (isinstance(value, str) and value.strip() == ""):
-                    # don't include servers without an URL
-                    # keep behavior explicit: skip silently (but could log)
-                    continue
-
-                server_map[f"{name}-server"] = {
-                    "transport": "streamable_http",
-                    "url": value
-                }
+            m = _SERVER_KEY_RE.fullmatch(key)
+            if m is None:
+                continue
+            # Skip entries that are None or empty strings
+            if value is None or (isinstance(value, str) and value.strip() == ""):
+                # don't include servers without an URL
+                # keep behavior explicit: skip silently (but could log)
+                continue
+
+            server_map[f"{m.group(1).lower()}-server"] = {
+                "transport": "streamable_http",
+                "url": value,
+                "httpx_client_factory": _pooled_http_client,
+            }
 
         if not server_map:
             raise RuntimeError("No MCP server URLs found in configuration.")
@@ -53,30 +123,121 @@ class MCPClientWrapper:
 
     # ------------------------------------------------------------------
     # --- helper: sanitize returned structures ---
+    @staticmethod
+    def _contains_additional_properties(obj: Any) -> bool:
+        """Return True if any nested dict has an 'additionalProperties' key."""
+        stack = [obj]
+        while stack:
+            o = stack.pop()
+            if isinstance(o, dict):
+                if "additionalProperties" in o:
+                    return True
+                stack.extend(o.values())
+            elif isinstance(o, list):
+                stack.extend(o)
+        return False
+
     def _remove_additional_properties(self, obj: Any) -> Any:
-        """Recursively remove 'additionalProperties' keys from dicts/lists.
+        """Remove 'additionalProperties' keys from nested dicts/lists.
 
         Only operates on plain Python dict/list structures. Other object types
         (proto messages, class instances, etc.) are returned unchanged so we
-        don't accidentally mutate library types.
+        don't accidentally mutate library types. When no such key exists the
+        input is returned as-is, without copying.
         """
-        if isinstance(obj, dict):
-            cleaned: Dict[Any, Any] = {}
-            for k, v in obj.items():
-                if k == "additionalProperties":
-                    # drop this key
-                    continue
-                cleaned[k] = self._remove_additional_properties(v)
-            return cleaned
-        if isinstance(obj, list):
-            return [self._remove_additional_properties(v) for v in obj]
-        return obj
-
-    def _matches_tool_name(self, tool: Any, name: str) -> bool:
-        """Return True if the given tool (dict or object) matches the name."""
+        if not isinstance(obj, (dict, list)) or not self._contains_additional_properties(obj):
+            return obj
+
+        # Iterative copy: each work item fills slot `key` of `parent`
+        root: List[Any] = [None]
+        stack: List[Tuple[Any, Any, Any]] = [(root, 0, obj)]
+        while stack:
+            parent, key, value = stack.pop()
+            if isinstance(value, dict):
+                cleaned: Dict[Any, Any] = {}
+                for k, v in value.items():
+                    if k == "additionalProperties":
+                        # drop this key
+                        continue
+                    cleaned[k] = v
+                    if isinstance(v, (dict, list)):
+                        stack.append((cleaned, k, v))
+                parent[key] = cleaned
+            else:
+                items = list(value)
+                for i, v in enumerate(items):
+                    if isinstance(v, (dict, list)):
+                        stack.append((items, i, v))
+                parent[key] = items
+        return root[0]
+
+    @staticmethod
+    def _tool_key(tool: Any) -> Tuple[Optional[str], Optional[str]]:
+        """Return (name, title) of a dict or object tool; objects only match by name."""
         if isinstance(tool, dict):
-            return (tool.get("name") == name) or (tool.get("title") == name)
-        return getattr(tool, "name", None) == name
+            return tool.get("name"), tool.get("title")
+        return getattr(tool, "name", None), None
+
+    def _build_tool_index(self, tools: List[Any]) -> Dict[str, Any]:
+        """Map tool names (and dict `title` aliases) to tools; the first match wins."""
+        index: Dict[str, Any] = {}
+        setdefault = index.setdefault
+        for t in tools:
+            name, title = self._tool_key(t)
+            if name is not None:
+                setdefault(name, t)
+            if title is not None:
+                setdefault(title, t)
+        return index
+
+    async def _load_server_tools(self, server_name: str) -> Tuple[List[Any], Dict[str, Any]]:
+        """Return the server's tool list and name index, fetching them once."""
+        tools = self._tool_list_cache.get(server_name)
+        if tools is None:
+            tools = await self.client.get_tools(server_name=server_name)
+            self._tool_list_cache[server_name] = tools
+            self._tool_index[server_name] = self._build_tool_index(tools)
+            self._plain_tool_lists[server_name] = not any(isinstance(t, (dict, list)) for t in tools)
+        return tools, self._tool_index[server_name]
+
+    def invalidate(self, server_name: Optional[str] = None) -> None:
+        """Drop cached tool listings and results for one server (or all), e.g. after a redeploy."""
+        if server_name is None:
+            self._tool_list_cache.clear()
+            self._tool_index.clear()
+            self._plain_tool_lists.clear()
+            if self._exec_cache is not None:
+                self._exec_cache.clear()
+        else:
+            self._tool_list_cache.pop(server_name, None)
+            self._tool_index.pop(server_name, None)
+            self._plain_tool_lists.pop(server_name, None)
+            if self._exec_cache is not None:
+                for key in [k for k in self._exec_cache if k[0] == server_name]:
+                    self._exec_cache.pop(key, None)
+
+    async def _load_many(self, server_names: List[str]) -> List[Any]:
+        """Fetch several servers' tools concurrently; failures come back as exceptions."""
+        for s in server_names:
+            self._validate_server_name(s)
+        return await asyncio.gather(
+            *(self._load_server_tools(s) for s in server_names),
+            return_exceptions=True,
+        )
+
+    def _sanitized(self, tool: Any) -> Any:
+        return self._remove_additional_properties(tool) if isinstance(tool, (dict, list)) else tool
+
+    def _sanitize_list(self, tools: List[Any], server_name: Optional[str] = None) -> List[Any]:
+        """Sanitize a tool list; lists of plain tool objects (the usual langchain
+        case) are returned without per-element work. For a cached server listing
+        that check is done once, when the listing is fetched."""
+        plain = self._plain_tool_lists.get(server_name) if server_name is not None else None
+        if plain is None:
+            plain = not any(isinstance(t, (dict, list)) for t in tools)
+        if plain:
+            return list(tools)
+        return [self._sanitized(t) for t in tools]
 
     # NOTE: The dedicated `aget_tool` helper was removed. All searching
     # functionality is implemented in `aget_tools` below; use that for
@@ -98,6 +259,8 @@ class MCPClientWrapper:
         - aget_tools(server_name=["s1","s2"], tool_name="t") -> return all matches of 't' across the servers list or raise ValueError if none found.
         - aget_tools(server_name=["s1","s2"], tool_name=["t1","t2"]) -> return flattened list of matches for each requested tool across the servers list; raise ValueError for any missing tool.
 
+        Per-server listings are cached after the first fetch (see `invalidate`).
+
         Note: calling with tool_name but without server_name is invalid and will raise
         ValueError: caller must specify server scope when requesting specific tool(s).
         """
@@ -111,37 +274,31 @@ class MCPClientWrapper:
         if server_name is None and tool_name is None:
             tools = await self.client.get_tools()
             try:
-                return [self._remove_additional_properties(t) if isinstance(t, (dict, list)) else t for t in tools]
+                return self._sanitize_list(tools)
             except Exception:
                 return tools
 
         # Case 2: server_name is list, no tool_name -> aggregate tools from list
         elif server_is_list and tool_name is None:
             combined: List[Any] = []
-            for s in server_name:  # type: ignore[arg-type]
-                self._validate_server_name(s)
-                try:
-                    tools = await self.client.get_tools(server_name=s)
-                except Exception:
+            for s, loaded in zip(server_name, await self._load_many(server_name)):  # type: ignore[arg-type]
+                if isinstance(loaded, Exception):
                     continue
-                for t in tools:
-                    combined.append(self._remove_additional_properties(t) if isinstance(t, (dict, list)) else t)
+                combined.extend(self._sanitize_list(loaded[0], s))
             return combined
 
         # Case 3: server_name is list, tool_name provided -> search requested tool(s) across the provided servers
         elif server_is_list and tool_name is not None:
             requested_names = [tool_name] if isinstance(tool_name, str) else list(tool_name)  # type: ignore[arg-type]
             found_map: Dict[str, List[Any]] = {name: [] for name in requested_names}
-            for s in server_name:  # type: ignore[arg-type]
-                self._validate_server_name(s)
-                try:
-                    tools = await self.client.get_tools(server_name=s)
-                except Exception:
+            for loaded in await self._load_many(server_name):  # type: ignore[arg-type]
+                if isinstance(loaded, Exception):
                     continue
-                for t in tools:
-                    for name in requested_names:
-                        if self._matches_tool_name(t, name):
-                            found_map[name].append(self._remove_additional_properties(t) if isinstance(t, (dict, list)) else t)
+                index = loaded[1]
+                for name in requested_names:
+                    t = index.get(name)
+                    if t is not None:
+                        found_map[name].append(self._sanitized(t))
             # single tool_name -> return matches list or raise
             if isinstance(tool_name, str):
                 matches = found_map.get(tool_name, [])
@@ -160,39 +317,35 @@ class MCPClientWrapper:
         # Case 4: server_name is single string, no tool_name -> full list for server
         elif isinstance(server_name, str) and tool_name is None:
             self._validate_server_name(server_name)
-            tools = await self.client.get_tools(server_name=server_name)
+            tools, _ = await self._load_server_tools(server_name)
             try:
-                return [self._remove_additional_properties(t) if isinstance(t, (dict, list)) else t for t in tools]
+                return self._sanitize_list(tools, server_name)
             except Exception:
                 return tools
 
         # Case 5: server_name is string and tool_name provided
         elif isinstance(server_name, str) and tool_name is not None:
             self._validate_server_name(server_name)
-            tools = await self.client.get_tools(server_name=server_name)
+            _, index = await self._load_server_tools(server_name)
             # single tool requested
             if isinstance(tool_name, str):
-                for t in tools:
-                    if self._matches_tool_name(t, tool_name):
-                        return self._remove_additional_properties(t) if isinstance(t, (dict, list)) else t
-                raise ValueError(f"Tool '{tool_name}' not found on server '{server_name}'")
+                t = index.get(tool_name)
+                if t is None:
+                    raise ValueError(f"Tool '{tool_name}' not found on server '{server_name}'")
+                return self._sanitized(t)
             # list of tools requested
             if isinstance(tool_name, list):
                 found: List[Any] = []
                 missing: List[str] = []
                 for name in tool_name:
-                    matched = None
-                    for t in tools:
-                        if self._matches_tool_name(t, name):
-                            matched = self._remove_additional_properties(t) if isinstance(t, (dict, list)) else t
-                            break
-                    if matched is None:
+                    t = index.get(name)
+                    if t is None:
                         missing.append(name)
                     else:
-                        found.append(matched)
+                        found.append(t)
                 if missing:
                     raise ValueError(f"Tools not found on server '{server_name}': {missing}")
-                return found
+                return self._sanitize_list(found)
 
         # Should not reach here
         else:
@@ -213,6 +366,33 @@ class MCPClientWrapper:
 
     # ------------------------------------------------------------------
     # SYNC wrappers (terminal-safe, not recommended for notebook)
+    #
+    # They all run on one background event loop owned by this wrapper, so
+    # sessions and connection pools survive between calls.
+
+    def _run_sync(self, coro: Any) -> Any:
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="mcp-client-loop", daemon=True).start()
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def close(self) -> None:
+        """Close sessions opened through the sync wrappers and stop their loop."""
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is None or loop.is_closed():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.aclose(), loop).result(timeout=10)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+
+    def __del__(self) -> None:
+        loop = getattr(self, "_loop", None)
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(loop.stop)
 
     def get_tools(
         self,
@@ -224,13 +404,13 @@ class MCPClientWrapper:
         server_name and tool_name may each be a string or a list of strings
         (see `aget_tools` for semantics).
         """
-        return asyncio.run(self.aget_tools(server_name=server_name, tool_name=tool_name))
+        return self._run_sync(self.aget_tools(server_name=server_name, tool_name=tool_name))
 
     def get_resources(self, server_name: str) -> List[Any]:
-        return asyncio.run(self.aget_resources(server_name))
+        return self._run_sync(self.aget_resources(server_name))
 
     def get_prompts(self, server_name: str, prompt_name: str) -> List[Any]:
-        return asyncio.run(self.aget_prompts(server_name, prompt_name))
+        return self._run_sync(self.aget_prompts(server_name, prompt_name))
 
     # `get_tool` helper removed; use `get_tools(server_name=..., tool_name=...)` instead.
 
@@ -243,30 +423,44 @@ class MCPClientWrapper:
         """Return the underlying MultiServerMCPClient instance (sync)."""
         return self.client
 
-    def list_tools(self) -> List[str]:
+    async def aget_tool_names(self, server_name: Optional[str] = None) -> List[str]:
+        """Return tool names for one server (or all), without sanitizing schemas."""
+        if server_name is not None:
+            self._validate_server_name(server_name)
+            tools, _ = await self._load_server_tools(server_name)
+        else:
+            tools = []
+            for loaded in await self._load_many(self.list_servers()):
+                if isinstance(loaded, Exception):
+                    raise loaded
+                tools.extend(loaded[0])
+        # StructuredTool from langchain has `name` attribute
+        return [
+            t.get("name", str(t)) if isinstance(t, dict) else getattr(t, "name", str(t))
+            for t in tools
+        ]
+
+    def list_tools(self, server_name: Optional[str] = None) -> List[str]:
         """Return a list of tool names (sync)."""
-        tools = self.get_tools()
-        try:
-            # StructuredTool from langchain has `name` attribute
-            return [getattr(t, "name", str(t)) for t in tools]
-        except Exception:
-            return [str(t) for t in tools]
-
-    def get_all_resources(self) -> Dict[str, Any]:
-        """Retrieve resources from all configured servers and return a mapping.
-
-        This runs each `get_resources` sequentially (sync wrapper) and collects
-        results per-server. It is kept sync for convenience in scripts.
-        """
+        return self._run_sync(self.aget_tool_names(server_name))
+
+    async def aget_all_resources(self) -> Dict[str, Any]:
+        """Retrieve resources from all configured servers concurrently and return a mapping."""
+        servers = self.list_servers()
+        fetched = await asyncio.gather(
+            *(self.aget_resources(s) for s in servers),
+            return_exceptions=True,
+        )
         results: Dict[str, Any] = {}
-        for server in self.list_servers():
-            try:
-                results[server] = self.get_resources(server)
-            except Exception as e:
-                # capture exception per-server instead of failing whole call
-                results[server] = {"error": repr(e)}
+        for server, result in zip(servers, fetched):
+            # capture exception per-server instead of failing whole call
+            results[server] = {"error": repr(result)} if isinstance(result, Exception) else result
         return results
 
+    def get_all_resources(self) -> Dict[str, Any]:
+        """Sync wrapper around `aget_all_resources`, kept for convenience in scripts."""
+        return self._run_sync(self.aget_all_resources())
+
     # ------------------------------------------------------------------
     # --- Unified async tool execution (direct run via tool.arun) ---
     async def aexecute_tool(
@@ -275,39 +469,60 @@ class MCPClientWrapper:
         tool_name: str,
         payload: Optional[Dict[str, Any]] = None,
         sanitize: bool = True,
+        cache: Optional[bool] = None,
     ) -> Any:
         """
         Execute a tool from a specific MCP server by running its `arun()` method.
 
+        Identical calls to read-only tools (GitLab tree/file reads, sheet reads)
+        within `result_ttl` seconds reuse the earlier result; other tools are
+        always called unless `cache=True`.
+
         Args:
             server_name: MCP server name (e.g., "google-sheet-server")
             tool_name: Tool name (e.g., "call_google_sheet_tool")
-            payload: Dict of arguments passed to the tool
+            payload: Dict of arguments passed to the tool; a truthy `_no_cache`
+                key skips the result cache and is not sent to the tool
             sanitize: Whether to clean result from 'additionalProperties'
+            cache: True to cache this call, False to never cache it; None
+                caches only the read-only tools listed in `_CACHEABLE_TOOLS`
 
         Returns:
             Any: Result from tool.arun(payload)
         """
         self._validate_server_name(server_name)
         payload = payload or {}
-
-        tools = await self.aget_tools(server_name=server_name)
-        matched_tool = next(
-            (t for t in tools if self._matches_tool_name(t, tool_name)),
-            None
-        )
+        if cache is None:
+            cache = tool_name in _CACHEABLE_TOOLS
+        if "_no_cache" in payload:
+            payload = dict(payload)
+            cache = cache and not payload.pop("_no_cache")
+
+        key = None
+        if cache and self._exec_cache is not None and not bypass_node_cache.get():
+            key = (server_name, tool_name, sanitize,
+                   orjson.dumps(payload, option=orjson.OPT_SORT_KEYS, default=str))
+            hit = self._exec_cache.get(key)
+            if hit is not None:
+                return hit
+
+        index = await self._session_tools(server_name)
+        matched_tool = index.get(tool_name)
 
         if matched_tool is None:
             raise ValueError(
                 f"Tool '{tool_name}' not found on server '{server_name}'. "
-                f"Available: {[getattr(t, 'name', None) for t in tools]}"
+                f"Available: {list(index)}"
             )
 
-        if not hasattr(matched_tool, "arun") or not inspect.iscoroutinefunction(matched_tool.arun):
-            raise RuntimeError(
-                f"Tool '{tool_name}' from server '{server_name}' "
-                f"does not implement async method 'arun(payload)'."
-            )
+        # The tool is kept alongside its id so a recycled id can't match
+        if self._async_tools.get(id(matched_tool)) is not matched_tool:
+            if not hasattr(matched_tool, "arun") or not inspect.iscoroutinefunction(matched_tool.arun):
+                raise RuntimeError(
+                    f"Tool '{tool_name}' from server '{server_name}' "
+                    f"does not implement async method 'arun(payload)'."
+                )
+            self._async_tools[id(matched_tool)] = matched_tool
 
         try:
             result = await matched_tool.arun(payload)
@@ -316,7 +531,83 @@ class MCPClientWrapper:
                 f"Execution of tool '{tool_name}' on server '{server_name}' failed: {e}"
             ) from e
 
-        return self._remove_additional_properties(result) if sanitize else result
+        result = self._remove_additional_properties(result) if sanitize else result
+        if key is not None:
+            self._exec_cache[key] = result
+        return result
+
+    # ------------------------------------------------------------------
+    # --- persistent sessions ---
+    async def _session_tools(self, server_name: str) -> Dict[str, Any]:
+        """Return the name index of tools bound to the server's persistent session,
+        opening it if needed.
+
+        Sessions belong to the event loop that opened them; a call from another
+        loop (e.g. a later `asyncio.run`) opens a fresh one.
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._sessions.get(server_name)
+        if entry is not None and entry[0] is loop and not entry[3].done():
+            return entry[1]
+
+        # One lock per (server, loop), created once and never replaced, so
+        # concurrent first calls wait for a single session instead of each
+        # opening their own
+        lock = self._session_locks.get((server_name, loop))
+        if lock is None:
+            for key in [k for k in self._session_locks if k[1].is_closed()]:
+                del self._session_locks[key]
+            lock = self._session_locks.setdefault((server_name, loop), asyncio.Lock())
+
+        async with lock:
+            entry = self._sessions.get(server_name)
+            if entry is not None and entry[0] is loop and not entry[3].done():
+                return entry[1]
+
+            ready: asyncio.Future = loop.create_future()
+            stop = asyncio.Event()
+            task = loop.create_task(self._hold_session(server_name, ready, stop))
+            index = self._build_tool_index(await ready)
+            self._sessions[server_name] = (loop, index, stop, task)
+            return index
+
+    async def _hold_session(self, server_name: str, ready: asyncio.Future, stop: asyncio.Event) -> None:
+        # The session context is entered and exited by this one task, as the
+        # underlying transport requires
+        try:
+            async with self.client.session(server_name) as session:
+                tools = await load_mcp_tools(session, server_name=server_name)
+                ready.set_result(tools)
+                await stop.wait()
+        except Exception as e:
+            # Before setup this fails the caller; afterwards the session is
+            # simply dropped and the next call opens a new one
+            if not ready.done():
+                ready.set_exception(e)
+        finally:
+            if not ready.done():
+                ready.cancel()
+            entry = self._sessions.get(server_name)
+            if entry is not None and entry[2] is stop:
+                self._sessions.pop(server_name, None)
+                for t in entry[1].values():
+                    self._async_tools.pop(id(t), None)
+
+    async def aclose(self) -> None:
+        """Close every persistent session opened on the running event loop."""
+        loop = asyncio.get_running_loop()
+        holders = []
+        for server_name, (owner, _, stop, task) in list(self._sessions.items()):
+            if owner is loop:
+                stop.set()
+                holders.append(task)
+        if holders:
+            await asyncio.gather(*holders, return_exceptions=True)
+
+    @classmethod
+    async def aclose_all(cls) -> None:
+        """Close the persistent sessions of every live wrapper (for app shutdown)."""
+        await asyncio.gather(*(w.aclose() for w in list(cls._instances)), return_exceptions=True)
 
     def _validate_server_name(self, name: str) -> None:
         if name not in self.server_map:
@@ -1,38 +1,123 @@
-import json
+import asyncio
 import base64
+from typing import Any, Dict, List, Tuple
+
+from cachetools import TTLCache
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # stdlib parser when orjson isn't installed
+    import json
+    _loads = json.loads
+
+# (project_id, path, ref) -> (tree items, blob name -> path); first path wins per name
+_TREE_CACHE: TTLCache = TTLCache(maxsize=64, ttl=300)
+# fetches in progress, so concurrent callers share one request
+_TREE_INFLIGHT: Dict[Tuple[str, str, str], asyncio.Task] = {}
+# base64 payloads above this size are decoded in a worker thread
+_OFFLOOP_DECODE_CHARS = 64_000
+
+
+def _as_data(raw_result: Any) -> Any:
+    # Adapters may already hand back parsed objects
+    if isinstance(raw_result, (dict, list)):
+        return raw_result
+    return _loads(raw_result)
+
+
+def _b64_to_text(content: str) -> str:
+    return base64.b64decode(content).decode("utf-8")
 
 
 async def _get_repository_tree(mcp, project_id: str, path: str, ref: str, recursive: bool, per_page: int):
     payload = {"project_id": project_id, "path": path, "ref": ref, "recursive": recursive, "per_page": per_page}
     result = await mcp.aexecute_tool("gitlab_vetc-server", "get_repository_tree", payload)
-    return json.loads(result)
+    return _as_data(result)
+
+
+async def _fetch_tree_index(mcp, project_id: str, path: str, ref: str) -> Tuple[List[dict], Dict[str, str]]:
+    tree = await _get_repository_tree(mcp, project_id, path, ref, recursive=True, per_page=500)
+    index: Dict[str, str] = {}
+    for item in tree:
+        if item.get("type") == "blob":
+            index.setdefault(item.get("name"), item["path"])
+    return tree, index
+
+
+async def _get_tree_index(mcp, project_id: str, path: str, ref: str) -> Tuple[List[dict], Dict[str, str]]:
+    """Recursive tree of `path` plus a blob name -> path index, cached for a few minutes."""
+    key = (project_id, path, ref)
+    cached = _TREE_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    task = _TREE_INFLIGHT.get(key)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_fetch_tree_index(mcp, project_id, path, ref))
+        _TREE_INFLIGHT[key] = task
+    try:
+        result = await asyncio.shield(task)
+    finally:
+        if task.done() and _TREE_INFLIGHT.get(key) is task:
+            _TREE_INFLIGHT.pop(key, None)
+    _TREE_CACHE[key] = result
+    return result
 
 
 async def _get_file_content(mcp, project_id: str, file_path: str, ref: str = "main") -> str:
     payload = {"project_id": project_id, "file_path": file_path, "ref": ref}
     raw_result = await mcp.aexecute_tool("gitlab_vetc-server", "get_file_contents", payload)
-    data = json.loads(raw_result)
+    data = _as_data(raw_result)
     if isinstance(data, str):
         return data
     if data.get("encoding") == "base64":
-        return base64.b64decode(data["content"]).decode("utf-8")
+        content = data["content"]
+        if len(content) > _OFFLOOP_DECODE_CHARS:
+            return await asyncio.to_thread(_b64_to_text, content)
+        return _b64_to_text(content)
     return data.get("content", "")
 
 
 async def get_dbt_model_logic(mcp, model_name: str, project_id: str, path: str = "models/staging", ref: str = "main"):
     target_file = f"{model_name}.sql"
-    tree = await _get_repository_tree(mcp, project_id, path, ref, recursive=True, per_page=500)
-    matched_files = [item for item in tree if item.get("type") == "blob" and item.get("name") == target_file]
-    if not matched_files:
+    _, index = await _get_tree_index(mcp, project_id, path, ref)
+    file_path = index.get(target_file)
+    if file_path is None:
         raise FileNotFoundError(f"Không tìm thấy file model '{target_file}' trong path '{path}'")
-    file_path = matched_files[0]["path"]
     return await _get_file_content(mcp, project_id, file_path, ref)
 
 
 async def get_dbt_model_schema(mcp, model_name: str, project_id: str, path: str = "models/staging", ref: str = "main"):
     possible_files = [f"schema_{model_name}.yaml", f"{model_name}_schema.yaml", f"schema_{model_name}.yml", f"{model_name}_schema.yml"]
-    tree = await _get_repository_tree(mcp, project_id, path, ref, recursive=True, per_page=500)
-    matched_files = [item for item in tree if item.get("type") == "blob" and item.get("name") in possible_files]
-    if not matched_files:
+    _, index = await _get_tree_index(mcp, project_id, path, ref)
+    file_path = next((index[name] for name in possible_files if name in index), None)
+    if file_path is None:
         raise FileNotFoundError(f"Không tìm thấy schema file cho model '{model_name}' trong path '{path}'")
-    return await _get_file_content(mcp, project_id, matched_files[0]["path"], ref)
+    return await _get_file_content(mcp, project_id, file_path, ref)
+
+
+async def get_dbt_models_bulk(mcp, model_names: List[str], project_id: str, path: str = "models/staging", ref: str = "main") -> Dict[str, str]:
+    """SQL logic for several models: one tree lookup, file contents fetched concurrently."""
+    _, index = await _get_tree_index(mcp, project_id, path, ref)
+    missing = [m for m in model_names if f"{m}.sql" not in index]
+    if missing:
+        raise FileNotFoundError(f"Không tìm thấy file model {missing} trong path '{path}'")
+    contents = await asyncio.gather(*(_get_file_content(mcp, project_id, index[f"{m}.sql"], ref) for m in model_names))
+    return dict(zip(model_names, contents))
+
+
+async def get_dbt_schemas_bulk(mcp, model_names: List[str], project_id: str, path: str = "models/staging", ref: str = "main") -> Dict[str, str]:
+    """Schema YAML for several models: one tree lookup, file contents fetched concurrently."""
+    _, index = await _get_tree_index(mcp, project_id, path, ref)
+    paths: Dict[str, str] = {}
+    for m in model_names:
+        possible_files = [f"schema_{m}.yaml", f"{m}_schema.yaml", f"schema_{m}.yml", f"{m}_schema.yml"]
+        file_path = next((index[name] for name in possible_files if name in index), None)
+        if file_path is not None:
+            paths[m] = file_path
+    missing = [m for m in model_names if m not in paths]
+    if missing:
+        raise FileNotFoundError(f"Không tìm thấy schema file cho model {missing} trong path '{path}'")
+    contents = await asyncio.gather(*(_get_file_content(mcp, project_id, paths[m], ref) for m in model_names))
+    return dict(zip(model_names, contents))
@@ -0,0 +1,48 @@
+import functools
+from contextvars import ContextVar
+from typing import Any, Callable, Hashable, Optional, Sequence
+
+from cachetools import TTLCache
+
+# Results of idempotent graph nodes, shared by every run in this process
+_NODE_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=600)
+
+# Set to True (e.g. by the server's `?no_cache=1`) to skip the cache for a run
+bypass_node_cache: ContextVar[bool] = ContextVar("bypass_node_cache", default=False)
+
+
+def cached_node(key_fn: Callable[[Any], Hashable], writes: Sequence[str]):
+    """Cache the state attributes an async node writes, keyed by its inputs.
+
+    On a hit the cached attributes are copied onto the state and the node is
+    skipped. Only complete results (every attribute in `writes` set) are cached.
+    """
+    def deco(fn):
+        @functools.wraps(fn)
+        async def wrap(state):
+            key = (fn.__module__, fn.__name__, key_fn(state))
+            hit = None if bypass_node_cache.get() else _NODE_CACHE.get(key)
+            if hit is not None:
+                for attr, val in hit.items():
+                    setattr(state, attr, val)
+                log = getattr(state, "log", None)
+                if log is not None:
+                    log(f"[Cache] Reused {fn.__name__} result")
+                return state
+
+            out = await fn(state)
+            values = {attr: getattr(out, attr, None) for attr in writes}
+            if all(v is not None for v in values.values()):
+                _NODE_CACHE[key] = values
+            return out
+        return wrap
+    return deco
+
+
+def clear_node_cache(package: Optional[str] = None) -> None:
+    """Drop cached node results, only those of nodes defined under `package` if given."""
+    if package is None:
+        _NODE_CACHE.clear()
+        return
+    for key in [k for k in _NODE_CACHE if k[0] == package or k[0].startswith(package + ".")]:
+        _NODE_CACHE.pop(key, None)
@@ -1,6 +1,10 @@
 import re
+from functools import lru_cache
 from pathlib import Path
 
+_H1 = re.compile(r"^#\s+(.+)$")
+_H2 = re.compile(r"^##\s+(.+)$")
+
 
 def _parse_prompts_md(path: Path):
     """
@@ -8,38 +12,57 @@ def _parse_prompts_md(path: Path):
     Supports:
       - # Heading  (agent-level sections, e.g. step guide)
       - ## Heading (prompt-level sections)
-    Returns dict: {section_name: section_text}
+    Returns ({section_name: section_text}, {lowercased_name: section_name})
+
+    Results are cached per (path, mtime), so an edited file is re-parsed.
     """
-    text = path.read_text(encoding="utf-8")
+    return _parse_prompts_md_cached(str(path.resolve()), path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=128)
+def _parse_prompts_md_cached(path_str: str, mtime_ns: int):
+    text = Path(path_str).read_text(encoding="utf-8")
 
     sections = {}
     current = None
     buf = []
 
-    for line in text.splitlines():
-        # Match "## <title>"
-        m2 = re.match(r"^##\s+(.+)$", line)
-        m1 = re.match(r"^#\s+(.+)$", line)
+    def flush():
+        if current:
+            sections[current] = "\n".join(buf).strip()
 
-        if m2:  # prompt-level
-            if current:
-                sections[current] = "\n".join(buf).strip()
-            current = m2.group(1).strip()
-            buf = []
-        elif m1:  # agent-level section
+    for line in text.splitlines():
+        if not line.startswith("#"):
             if current:
-                sections[current] = "\n".join(buf).strip()
-            current = m1.group(1).strip()
-            buf = []
+                buf.append(line)
+            continue
+
+        # "## <title>" (prompt-level) or "# <title>" (agent-level section);
+        # lines with other whitespace after the hashes go through the regexes
+        if line.startswith("## ") and len(line) > 3:
+            title = line[3:]
+        elif line.startswith("# ") and len(line) > 2:
+            title = line[2:]
         else:
+            m = _H2.match(line) or _H1.match(line)
+            title = m.group(1) if m else None
+
+        if title is None:
             if current:
                 buf.append(line)
+            continue
+
+        flush()
+        current = title.strip()
+        buf = []
 
     # Save last section
-    if current:
-        sections[current] = "\n".join(buf).strip()
+    flush()
 
-    return sections
+    lower_titles = {}
+    for title in sections:
+        lower_titles.setdefault(title.lower(), title)
+    return sections, lower_titles
 
 
 def load_prompt_file(path: str | Path, prompt_name: str | None = None) -> str:
@@ -56,22 +79,35 @@ def load_prompt_file(path: str | Path, prompt_name: str | None = None) -> str:
     if prompt_name is None:
         return path.read_text(encoding="utf-8")
 
-    sections = _parse_prompts_md(path)
+    sections, lower_titles = _parse_prompts_md(path)
 
     # exact match
     if prompt_name in sections:
         return sections[prompt_name]
 
     # substring match fallback
-    for k, v in sections.items():
-        if prompt_name.lower() in k.lower():
-            return v
+    target = prompt_name.lower()
+    for low_title, title in lower_titles.items():
+        if target in low_title:
+            return sections[title]
 
     raise KeyError(f"Prompt '{prompt_name}' not found in {path}")
 
 
+@lru_cache(maxsize=64)
+def _placeholder_pattern(keys: tuple) -> re.Pattern:
+    # Longest first so overlapping names resolve like the full placeholder text
+    return re.compile("|".join(re.escape(f"{{{k}}}") for k in sorted(keys, key=len, reverse=True)))
+
+
 def render_prompt(template: str, mapping: dict) -> str:
-    out = template
-    for k, v in mapping.items():
-        out = out.replace(f"{{{k}}}", str(v))
-    return out
+    """Substitute `{key}` placeholders in one pass.
+
+    Other braces (e.g. JSON examples in the prompt) are left alone, and
+    substituted values are not scanned for further placeholders.
+    """
+    if not mapping:
+        return template
+    values = {f"{{{k}}}": str(v) for k, v in mapping.items()}
+    pattern = _placeholder_pattern(tuple(mapping))
+    return pattern.sub(lambda m: values[m.group(0)], template)
@@ -1,6 +1,5 @@
-import os
 import logging
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 # Quiet known converter warnings from langchain-google-genai
 try:
@@ -24,7 +23,8 @@ class GeminiLLM:
       - Service Account key
 
     The class exposes a `.get_llm()` method callable by LangGraph that returns
-    an instantiated ChatGoogleGenerativeAI client configured per request.
+    a ChatGoogleGenerativeAI client configured per request; clients are cached
+    per parameter set, so repeated calls with the same settings share one.
 
     Example:
         gem = GeminiLLM(load_mode="API")
@@ -62,6 +62,8 @@ class GeminiLLM:
             else google_cfg["GOOGLE_GEMINI_SERVICE_ACCOUNT"]
         )
         self.model = model
+        # (max_tokens, timeout, max_retries, temperature, model) -> client
+        self._client_cache: Dict[Tuple, ChatGoogleGenerativeAI] = {}
 
     def get_llm(
         self,
@@ -71,7 +73,8 @@ class GeminiLLM:
         temperature: float = 0.0,
     ) -> ChatGoogleGenerativeAI:
         """
-        Create a configured LangChain ChatGoogleGenerativeAI client instance.
+        Return a configured LangChain ChatGoogleGenerativeAI client instance,
+        built on first use for each parameter set.
 
         Args:
             max_tokens (Optional[int]): Maximum number of tokens to generate.
@@ -82,15 +85,19 @@ class GeminiLLM:
         Returns:
             ChatGoogleGenerativeAI: A fully configured LLM client.
         """
-        os.environ["GOOGLE_API_KEY"] = self.credential
-
-        return ChatGoogleGenerativeAI(
-            model=self.model,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            timeout=timeout,
-            max_retries=max_retries,
-        )
+        key = (max_tokens, timeout, max_retries, temperature, self.model)
+        llm = self._client_cache.get(key)
+        if llm is None:
+            # Pass the credential directly rather than through os.environ
+            llm = self._client_cache[key] = ChatGoogleGenerativeAI(
+                model=self.model,
+                google_api_key=self.credential,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=timeout,
+                max_retries=max_retries,
+            )
+        return llm
 
     def chat(self, message: str) -> str:
         """
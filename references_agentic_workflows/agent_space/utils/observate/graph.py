@@ -1,9 +1,31 @@
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
 from langchain_core.runnables.graph import MermaidDrawMethod
 
+# sha256 of (draw method, mermaid source) -> rendered PNG
+_PNG_CACHE: Dict[str, bytes] = {}
+
+
+def _render_png(app, draw_method: MermaidDrawMethod) -> bytes:
+    """Render the app's graph, reusing the PNG of an identical mermaid source."""
+    graph = app.get_graph()
+    key = hashlib.sha256(f"{draw_method}\n{graph.draw_mermaid()}".encode("utf-8")).hexdigest()
+    png_data = _PNG_CACHE.get(key)
+    if png_data is None:
+        png_data = _PNG_CACHE[key] = graph.draw_mermaid_png(draw_method=draw_method)
+    return png_data
+
+
 def export_workflow_graph(app, output_path: str = "workflow.png", draw_method: MermaidDrawMethod = MermaidDrawMethod.API) -> str:
     """
     Export the execution graph of a LangChain application to a PNG file.
 
+    Unchanged graphs are rendered once per process; later exports reuse the PNG
+    instead of calling the Mermaid API again.
+
     Args:
         app: A LangChain application or workflow object that implements the `get_graph()` method.
         output_path (str): The destination path for the PNG file. Defaults to "workflow.png".
@@ -19,10 +41,29 @@ def export_workflow_graph(app, output_path: str = "workflow.png", draw_method: M
         >>> export_workflow_graph(app, "workflow_graph.png")
         ✅ Workflow graph exported to: workflow_graph.png
     """
-    png_data = app.get_graph().draw_mermaid_png(draw_method=draw_method)
+    png_data = _render_png(app, draw_method)
 
     with open(output_path, "wb") as f:
         f.write(png_data)
 
     print(f"✅ Workflow graph exported to: {output_path}")
     return output_path
+
+
+async def aexport_workflow_graph(app, output_path: str = "workflow.png", draw_method: MermaidDrawMethod = MermaidDrawMethod.API) -> str:
+    """Async `export_workflow_graph`: rendering and the file write run in worker threads."""
+    png_data = await asyncio.to_thread(_render_png, app, draw_method)
+    await asyncio.to_thread(Path(output_path).write_bytes, png_data)
+
+    print(f"✅ Workflow graph exported to: {output_path}")
+    return output_path
+
+
+async def aexport_workflow_graphs(
+    jobs: Iterable[Tuple[object, str]],
+    draw_method: MermaidDrawMethod = MermaidDrawMethod.API,
+) -> List[str]:
+    """Export several `(app, output_path)` graphs concurrently."""
+    return list(await asyncio.gather(
+        *(aexport_workflow_graph(app, path, draw_method) for app, path in jobs)
+    ))
@@ -9,4 +9,5 @@ class Dpx2Clickhouse(BaseConfig):
         "DPX2CLICKHOUSE_PII_COLUMNS_SHEET",
         "DPX2CLICKHOUSE_DBT_CLICKHOUSE_REPO",
         "DPX2CLICKHOUSE_DBT_TRINO_REPO",
+        "DPX2CLICKHOUSE_SUMMARY_MAX_CHARS_PER_FIELD",
     ]
@@ -16,21 +16,34 @@ Usage:
 """
 
 import asyncio
-import json
+import hashlib
 import logging
-from mcp.server.fastmcp import FastMCP
+import os
+import re
+from collections import defaultdict
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+from cachetools import TTLCache
+from mcp.server.fastmcp import Context, FastMCP
 from tools.clickhouse.clickhouse_tools import (
     query_clickhouse_logic,
+    query_clickhouse_stream,
     query_clickhouse_schema_logic,
-    query_airflow_dags_by_dbt_table,
-    query_dbt_tables_by_airflow_dag
+    query_airflow_dbt_mapping,
 )
+from utils.batch import run_batch
+from utils.catalog import cache_tool_catalog
+from utils.connector.warmup import warmup
+from utils.jsonify import ResponseFormat, df_to_json, dumps
+from utils.log import configure_logging
+from utils.serving import error_response, serve
 
 # ---------------------------------------------------------------------------
 # Logger Setup
 # ---------------------------------------------------------------------------
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+configure_logging(logging.INFO)
 
 # ---------------------------------------------------------------------------
 # MCP Server Initialization
@@ -38,31 +51,140 @@ logging.basicConfig(level=logging.INFO)
 mcp = FastMCP("ClickHouse MCP Server", host="0.0.0.0", port=8080)
 
 # ---------------------------------------------------------------------------
-# MCP Tools Registration
+# Metadata Cache
+# ---------------------------------------------------------------------------
+# Schema rows change on the order of minutes, so the serialized responses are
+# reused for a short while; errors are never cached.
+_metadata_cache: TTLCache = TTLCache(maxsize=512, ttl=60)
+
+# ---------------------------------------------------------------------------
+# Airflow/dbt Lineage
 # ---------------------------------------------------------------------------
+# The whole mapping table is loaded on the first lineage lookup and refreshed
+# in the background every _LINEAGE_REFRESH_SECONDS; lookups are dict reads.
+_LINEAGE_REFRESH_SECONDS = 300
+_LINEAGE: Dict[str, Dict[str, List[str]]] = {"a2d": {}, "d2a": {}}
+_lineage_lock = asyncio.Lock()
+_lineage_task: Optional[asyncio.Task] = None
+
+
+def _load_lineage() -> Dict[str, Dict[str, List[str]]]:
+    """Build the `airflow_dag -> [dbt_table]` and `dbt_table -> [airflow_dag]` maps."""
+    df = query_airflow_dbt_mapping()
+    a2d: Dict[str, List[str]] = defaultdict(list)
+    d2a: Dict[str, List[str]] = defaultdict(list)
+    for dag, table in zip(df["airflow_dag"].tolist(), df["dbt_table"].tolist()):
+        a2d[dag].append(table)
+        d2a[table].append(dag)
+    return {"a2d": dict(a2d), "d2a": dict(d2a)}
+
+
+async def _refresh_lineage_forever() -> None:
+    while True:
+        await asyncio.sleep(_LINEAGE_REFRESH_SECONDS)
+        try:
+            _LINEAGE.update(await asyncio.to_thread(_load_lineage))
+        except Exception as err:
+            logger.warning("Lineage refresh failed, keeping the previous mapping: %s", err)
+
+
+async def _lineage() -> Dict[str, Dict[str, List[str]]]:
+    """Return the lineage maps, loading them and starting the refresher on first use."""
+    global _lineage_task
+    if _lineage_task is None:
+        async with _lineage_lock:
+            if _lineage_task is None:
+                _LINEAGE.update(await asyncio.to_thread(_load_lineage))
+                _lineage_task = asyncio.create_task(_refresh_lineage_forever())
+    return _LINEAGE
 
 
-@mcp.tool()
-async def clickhouse_query(sql_query: str) -> str:
+# Ad-hoc query responses, keyed by a hash of the SQL text and response format.
+# CLICKHOUSE_QUERY_CACHE_TTL (seconds, default 60) sets the lifetime; 0 disables it.
+_QUERY_CACHE_TTL = float(os.getenv("CLICKHOUSE_QUERY_CACHE_TTL", "60"))
+_query_cache: TTLCache = TTLCache(maxsize=256, ttl=_QUERY_CACHE_TTL or 1)
+
+# Only plain reads are cached; anything touching system tables or
+# time/random functions returns different results from one call to the next
+_CACHEABLE_SQL = re.compile(r"\s*(?:select|with)\b", re.IGNORECASE)
+_VOLATILE_SQL = re.compile(
+    r"\bsystem\.|\b(?:insert|alter|now|now64|today|yesterday|rand\w*|generateUUIDv4)\b",
+    re.IGNORECASE,
+)
+
+
+def _query_cache_key(sql_query: str, response_format: str) -> Optional[str]:
+    """Return the cache key for `sql_query`, or None if it must not be cached."""
+    if not _QUERY_CACHE_TTL or not _CACHEABLE_SQL.match(sql_query) or _VOLATILE_SQL.search(sql_query):
+        return None
+    # Only surrounding whitespace and a trailing semicolon are normalized:
+    # case and inner spacing can be significant inside string literals
+    normalized = sql_query.strip().rstrip(";").strip()
+    digest = hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+    return f"{response_format}:{digest}"
+
+
+def _stream_ndjson(sql_query: str, on_progress: Callable[[int], None]) -> str:
+    """Serialize a streamed query as JSON Lines, calling `on_progress(rows_so_far)` per block."""
+    lines = []
+    for columns, rows in query_clickhouse_stream(sql_query):
+        lines.extend(dumps(dict(zip(columns, row))) for row in rows)
+        on_progress(len(lines))
+    return "\n".join(lines)
+
+# ---------------------------------------------------------------------------
+# MCP Tools Registration
+# ---------------------------------------------------------------------------
+# Tools return ready-made JSON text; structured_output=False keeps FastMCP from
+# validating it and sending a second, escaped copy as `{"result": ...}`.
+
+@mcp.tool(structured_output=False)
+async def clickhouse_query(
+    sql_query: str,
+    response_format: ResponseFormat = "records",
+    stream: bool = False,
+    ctx: Optional[Context] = None
+) -> str:
     """
     Executes a read-only SQL query on ClickHouse.
 
     Args:
         sql_query (str): The SQL query string to execute.
+        response_format (str, optional): "records" (list of row objects),
+            "split" (schema + one array per column, smaller for wide results),
+            or "arrow" (base64 Arrow IPC stream).
+        stream (bool, optional): Read the result block by block without building
+            a DataFrame and return JSON Lines (one row object per line);
+            `response_format` is ignored. Rows read so far are reported as
+            progress notifications when the client sent a progress token. The
+            whole JSON Lines text is still built in memory before it is
+            returned. Not accepted inside `batch_execute`.
+
+    Identical read queries (SELECT/WITH, no system tables or time/random
+    functions) are answered from an in-process cache for
+    `CLICKHOUSE_QUERY_CACHE_TTL` seconds (default 60, 0 disables it).
 
     Returns:
-        str: JSON string of query results (records list) or error message.
+        str: JSON string of query results or error message.
     """
-    try:
-        logger.info(f"Executing ClickHouse query via MCP: {sql_query}")
-        df = query_clickhouse_logic(sql_query)
-        return df.to_json(orient="records", date_format="iso")
-    except Exception as err:
-        logger.error(f"ClickHouse query failed: {err}")
-        return json.dumps({"status": "ERROR", "message": str(err)})
+    logger.info("Executing ClickHouse query via MCP: %s", sql_query)
+    if stream:
+        loop = asyncio.get_running_loop()
+
+        def on_block(rows: int) -> None:
+            if ctx is not None:
+                asyncio.run_coroutine_threadsafe(ctx.report_progress(rows), loop)
+
+        return await serve(_stream_ndjson, sql_query, serialize=None, on_progress=on_block)
+
+    return await serve(
+        query_clickhouse_logic, sql_query,
+        serialize=partial(df_to_json, response_format=response_format),
+        cache=_query_cache, cache_key=_query_cache_key(sql_query, response_format),
+    )
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def clickhouse_table_schema(table_name: str) -> str:
     """
     Retrieves schema metadata (columns and data types) for a ClickHouse table.
@@ -73,16 +195,14 @@ async def clickhouse_table_schema(table_name: str) -> str:
     Returns:
         str: JSON string of schema info or error message.
     """
-    try:
-        logger.info(f"Fetching ClickHouse schema for table: {table_name}")
-        df = query_clickhouse_schema_logic(table_name)
-        return df.to_json(orient="records")
-    except Exception as err:
-        logger.error(f"Failed to fetch ClickHouse schema: {err}")
-        return json.dumps({"status": "ERROR", "message": str(err)})
+    logger.info("Fetching ClickHouse schema for table: %s", table_name)
+    return await serve(
+        query_clickhouse_schema_logic, table_name,
+        cache=_metadata_cache, cache_key=("schema", table_name),
+    )
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def airflow_dags_by_dbt_table(dbt_table: str) -> str:
     """
     Retrieve all Airflow DAGs associated with a dbt table/model.
@@ -93,16 +213,16 @@ async def airflow_dags_by_dbt_table(dbt_table: str) -> str:
     Returns:
         str: JSON-serialized mapping results.
     """
+    logger.info("Fetching Airflow DAGs for dbt table: %s", dbt_table)
     try:
-        logger.info(f"Fetching Airflow DAGs for dbt table: {dbt_table}")
-        df = query_airflow_dags_by_dbt_table(dbt_table)
-        return df.to_json(orient="records", date_format="iso")
+        dags = (await _lineage())["d2a"].get(dbt_table, [])
     except Exception as err:
-        logger.error(f"Failed to query Airflow DAGs: {err}")
-        return json.dumps({"status": "ERROR", "message": str(err)})
+        logger.error("Failed to load Airflow/dbt lineage: %s", err)
+        return error_response(err)
+    return dumps([{"airflow_dag": dag} for dag in dags])
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def dbt_tables_by_airflow_dag(airflow_dag: str) -> str:
     """
     Retrieve all dbt tables/models associated with a specific Airflow DAG.
@@ -113,13 +233,49 @@ async def dbt_tables_by_airflow_dag(airflow_dag: str) -> str:
     Returns:
         str: JSON-serialized mapping results.
     """
+    logger.info("Fetching dbt tables for Airflow DAG: %s", airflow_dag)
     try:
-        logger.info(f"Fetching dbt tables for Airflow DAG: {airflow_dag}")
-        df = query_dbt_tables_by_airflow_dag(airflow_dag)
-        return df.to_json(orient="records", date_format="iso")
+        tables = (await _lineage())["a2d"].get(airflow_dag, [])
     except Exception as err:
-        logger.error(f"Failed to query dbt tables: {err}")
-        return json.dumps({"status": "ERROR", "message": str(err)})
+        logger.error("Failed to load Airflow/dbt lineage: %s", err)
+        return error_response(err)
+    return dumps([{"dbt_table": table} for table in tables])
+
+
+# Tools callable through `batch_execute`
+DISPATCH = {
+    "clickhouse_query": clickhouse_query,
+    "clickhouse_table_schema": clickhouse_table_schema,
+    "airflow_dags_by_dbt_table": airflow_dags_by_dbt_table,
+    "dbt_tables_by_airflow_dag": dbt_tables_by_airflow_dag,
+}
+
+
+@mcp.tool(structured_output=False)
+async def batch_execute(
+    operations: list[dict],
+    max_concurrent: int = 8,
+    stop_on_error: bool = False
+) -> str:
+    """
+    Runs several tool calls of this server concurrently in one request.
+
+    Args:
+        operations (list[dict]): Items like {"tool": "clickhouse_query", "args": {...}};
+            `stream` is not accepted.
+        max_concurrent (int, optional): Maximum number of calls running at once.
+        stop_on_error (bool, optional): Cancel remaining calls after the first failure.
+
+    Returns:
+        str: JSON array of {"tool", "status", "result" | "message"}, in request order.
+    """
+    logger.info("[MCP] Running batch of %s operations", len(operations))
+    return await run_batch(DISPATCH, operations, max_concurrent, stop_on_error)
+
+
+cache_tool_catalog(mcp, "clickhouse", __file__)
+
 
 if __name__ == "__main__":
+    warmup("clickhouse")
     mcp.run(transport="streamable-http")
\ No newline at end of file
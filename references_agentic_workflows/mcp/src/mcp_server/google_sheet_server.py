@@ -14,10 +14,9 @@ Usage:
     $ python mcp_google_sheet_server.py
 """
 
-import asyncio
 import json
 import logging
-from typing import Optional
+from typing import Optional, Union
 from mcp.server.fastmcp import FastMCP
 
 from tools.google_sheet.google_sheet_tools import (
@@ -25,12 +24,18 @@ from tools.google_sheet.google_sheet_tools import (
     query_google_sheet_tabs,
     query_google_sheet_title_logic,
 )
+from utils.batch import run_batch
+from utils.catalog import cache_tool_catalog
+from utils.connector.warmup import warmup
+from utils.jsonify import ResponseFormat, df_to_json, dfs_to_json
+from utils.log import configure_logging
+from utils.serving import serve
 
 # ---------------------------------------------------------------------------
 # Logger Setup
 # ---------------------------------------------------------------------------
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+configure_logging(logging.INFO)
 
 # ---------------------------------------------------------------------------
 # MCP Server Initialization
@@ -42,43 +47,53 @@ mcp = FastMCP("Google Sheet MCP Server", host="0.0.0.0", port=8082)
 # ---------------------------------------------------------------------------
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def google_sheet_query(
     spreadsheet_id: str,
-    range_name: Optional[str] = None,
+    range_name: Optional[Union[str, list[str]]] = None,
     use_json_path: bool = False,
-    header: bool = True
+    header: bool = True,
+    response_format: ResponseFormat = "records"
 ) -> str:
     """
     Reads a defined range from a Google Sheet and returns structured data.
 
     Args:
         spreadsheet_id (str): The Google Spreadsheet ID (from sheet URL).
-        range_name (str, optional): A1 notation (e.g., "Sheet1!A1:D50").
+        range_name (str | list[str], optional): A1 notation (e.g., "Sheet1!A1:D50"),
+            or a list of ranges read together in one `batchGet` call.
         use_json_path (bool, optional): Authenticate via JSON credential file path.
         header (bool, optional): Treat first row as headers.
+        response_format (str, optional): "records" (list of row objects),
+            "split" (schema + one array per column),
+            or "arrow" (base64 Arrow IPC stream).
 
     Returns:
-        str: JSON-serialized rows list.
+        str: JSON-serialized rows list (or split object). For a list of
+        ranges, a JSON object mapping each range to that result.
 
     Example:
         >>> google_sheet_query("1Hmd...", "Data!A1:C100")
+        >>> google_sheet_query("1Hmd...", ["Data!A1:C100", "Config"])
     """
-    try:
-        logger.info(f"[MCP] Reading Google Sheet: {spreadsheet_id}, range={range_name}")
-        df = query_google_sheet_data(
-            spreadsheet_id=spreadsheet_id,
-            range_name=range_name,
-            use_json_path=use_json_path,
-            header=header
-        )
-        return df.to_json(orient="records", date_format="iso")
-    except Exception as err:
-        logger.error(f"[MCP] Google Sheet read failed: {err}")
-        return json.dumps({"status": "ERROR", "message": str(err)})
-
-
-@mcp.tool()
+    logger.info("[MCP] Reading Google Sheet: %s, range=%s", spreadsheet_id, range_name)
+
+    def serialize(result) -> str:
+        if isinstance(result, dict):
+            return dfs_to_json(result, response_format)
+        return df_to_json(result, response_format)
+
+    return await serve(
+        query_google_sheet_data,
+        spreadsheet_id=spreadsheet_id,
+        range_name=range_name,
+        use_json_path=use_json_path,
+        header=header,
+        serialize=serialize,
+    )
+
+
+@mcp.tool(structured_output=False)
 async def google_sheet_tabs(
     spreadsheet_id: str,
     use_json_path: bool = False
@@ -97,16 +112,11 @@ async def google_sheet_tabs(
         >>> google_sheet_tabs("1Hmd...")
         ["Sheet1", "Config", "Mapping"]
     """
-    try:
-        logger.info(f"[MCP] Fetching sheet tabs from: {spreadsheet_id}")
-        tabs = query_google_sheet_tabs(spreadsheet_id, use_json_path)
-        return json.dumps(tabs)
-    except Exception as err:
-        logger.error(f"[MCP] Failed to fetch sheet tabs: {err}")
-        return json.dumps({"status": "ERROR", "message": str(err)})
+    logger.info("[MCP] Fetching sheet tabs from: %s", spreadsheet_id)
+    return await serve(query_google_sheet_tabs, spreadsheet_id, use_json_path, serialize=json.dumps)
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def google_sheet_title(
     spreadsheet_id: str,
     use_json_path: bool = False
@@ -125,17 +135,48 @@ async def google_sheet_title(
         >>> google_sheet_title("1Hmd...")
         "Timeline Project"
     """
-    try:
-        logger.info(f"[MCP] Fetching sheet title for: {spreadsheet_id}")
-        title = query_google_sheet_title_logic(spreadsheet_id, use_json_path)
-        return json.dumps({"title": title})
-    except Exception as err:
-        logger.error(f"[MCP] Failed to fetch sheet title: {err}")
-        return json.dumps({"status": "ERROR", "message": str(err)})
+    logger.info("[MCP] Fetching sheet title for: %s", spreadsheet_id)
+    return await serve(
+        query_google_sheet_title_logic, spreadsheet_id, use_json_path,
+        serialize=lambda title: json.dumps({"title": title}),
+    )
+
+
+# Tools callable through `batch_execute`
+DISPATCH = {
+    "google_sheet_query": google_sheet_query,
+    "google_sheet_tabs": google_sheet_tabs,
+    "google_sheet_title": google_sheet_title,
+}
+
+
+@mcp.tool(structured_output=False)
+async def batch_execute(
+    operations: list[dict],
+    max_concurrent: int = 8,
+    stop_on_error: bool = False
+) -> str:
+    """
+    Runs several tool calls of this server concurrently in one request.
+
+    Args:
+        operations (list[dict]): Items like {"tool": "google_sheet_query", "args": {...}}.
+        max_concurrent (int, optional): Maximum number of calls running at once.
+        stop_on_error (bool, optional): Cancel remaining calls after the first failure.
+
+    Returns:
+        str: JSON array of {"tool", "status", "result" | "message"}, in request order.
+    """
+    logger.info("[MCP] Running batch of %s operations", len(operations))
+    return await run_batch(DISPATCH, operations, max_concurrent, stop_on_error)
+
+
+cache_tool_catalog(mcp, "google_sheet", __file__)
 
 
 # ---------------------------------------------------------------------------
 # Run Server
 # ---------------------------------------------------------------------------
 if __name__ == "__main__":
+    warmup("google_sheet")
     mcp.run(transport="streamable-http")
@@ -8,50 +8,94 @@ to query Postgres for analytics, Airflow DAG monitoring, and Superset metadata l
 Functions exposed:
 - query_postgres_logic
 - query_postgres_airflow_dag_status
+- query_postgres_airflow_dag_status_many
 - query_postgres_superset_clickhouse_dashboards
 """
 
+import asyncio
 import json
 import logging
-from mcp.server.fastmcp import FastMCP
+from functools import partial
+from typing import Callable, Optional, Union
+from mcp.server.fastmcp import Context, FastMCP
 from tools.postgres.postgres_tools import (
     query_postgres_logic,
+    query_postgres_stream,
     query_postgres_airflow_dag_status,
+    query_postgres_airflow_dag_status_many,
     query_postgres_superset_clickhouse_dashboards,
 )
+from utils.batch import run_batch
+from utils.catalog import cache_tool_catalog
+from utils.connector.warmup import warmup
+from utils.jsonify import ResponseFormat, df_to_json, dumps
+from utils.log import configure_logging
+from utils.serving import serve
 
 # Initialize logger
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+configure_logging(logging.INFO)
 
 # Initialize MCP server
 mcp = FastMCP("Postgres MCP Server", host="0.0.0.0", port=8081)
 
+
+def _stream_ndjson(sql_query: str, on_progress: Callable[[int], None]) -> str:
+    """Serialize a chunked query as JSON Lines, calling `on_progress(rows_so_far)` per chunk."""
+    lines = []
+    for chunk in query_postgres_stream(sql_query):
+        columns = list(chunk.columns)
+        values = zip(*(chunk.iloc[:, i].tolist() for i in range(len(columns))))
+        lines.extend(dumps(dict(zip(columns, row))) for row in values)
+        on_progress(len(lines))
+    return "\n".join(lines)
+
 # -------------------------------
 # MCP Tools Registration
 # -------------------------------
 
-@mcp.tool()
-async def postgres_query(sql_query: str) -> str:
+@mcp.tool(structured_output=False)
+async def postgres_query(
+    sql_query: str,
+    response_format: ResponseFormat = "records",
+    stream: bool = False,
+    ctx: Optional[Context] = None
+) -> str:
     """
     Executes an arbitrary SQL query on the PostgreSQL database.
 
     Args:
         sql_query (str): The SQL query string to execute.
+        response_format (str, optional): "records" (list of row objects),
+            "split" (schema + one array per column, smaller for wide results),
+            or "arrow" (base64 Arrow IPC stream).
+        stream (bool, optional): Read the result in chunks through a
+            server-side cursor and return JSON Lines (one row object per
+            line); `response_format` is ignored. Rows read so far are reported
+            as progress notifications when the client sent a progress token.
+            The whole JSON Lines text is still built in memory before it is
+            returned. Not accepted inside `batch_execute`.
 
     Returns:
         str: Query results as a JSON string.
     """
-    try:
-        logger.info("Executing Postgres query via MCP...")
-        df = query_postgres_logic(sql_query)
-        return df.to_json(orient="records", date_format="iso")
-    except Exception as err:
-        logger.error(f"Postgres query failed: {err}")
-        return json.dumps({"status": "ERROR", "message": str(err)})
+    logger.info("Executing Postgres query via MCP...")
+    if stream:
+        loop = asyncio.get_running_loop()
+
+        def on_chunk(rows: int) -> None:
+            if ctx is not None:
+                asyncio.run_coroutine_threadsafe(ctx.report_progress(rows), loop)
 
+        return await serve(_stream_ndjson, sql_query, serialize=None, on_progress=on_chunk)
 
-@mcp.tool()
+    return await serve(
+        query_postgres_logic, sql_query,
+        serialize=partial(df_to_json, response_format=response_format),
+    )
+
+
+@mcp.tool(structured_output=False)
 async def postgres_airflow_dag_status(dag_id: str) -> str:
     """
     Retrieves the most recent execution status of an Airflow DAG from Postgres metadata.
@@ -62,33 +106,86 @@ async def postgres_airflow_dag_status(dag_id: str) -> str:
     Returns:
         str: Latest DAG run info as JSON string, or 'None' if not found.
     """
-    try:
-        logger.info(f"Querying Airflow DAG status for: {dag_id}")
-        result = query_postgres_airflow_dag_status(dag_id)
-        return json.dumps(result or {"message": "No DAG run found."}, default=str)
-    except Exception as err:
-        logger.error(f"Error fetching DAG status for {dag_id}: {err}")
-        return json.dumps({"status": "ERROR", "message": str(err)})
+    logger.info("Querying Airflow DAG status for: %s", dag_id)
+    return await serve(
+        query_postgres_airflow_dag_status, dag_id,
+        serialize=lambda result: json.dumps(result or {"message": "No DAG run found."}, default=str),
+    )
+
+
+@mcp.tool(structured_output=False)
+async def postgres_airflow_dag_statuses(dag_ids: list[str]) -> str:
+    """
+    Retrieves the most recent execution status of several Airflow DAGs in one query.
 
+    Args:
+        dag_ids (list[str]): The Airflow DAG IDs to check.
 
-@mcp.tool()
-async def postgres_superset_dashboards(table_list: str) -> str:
+    Returns:
+        str: JSON object mapping each DAG ID to its latest run, or null if it has none.
+    """
+    logger.info("Querying Airflow DAG status for %s DAGs", len(dag_ids))
+    return await serve(
+        query_postgres_airflow_dag_status_many, dag_ids,
+        serialize=partial(json.dumps, default=str),
+    )
+
+
+@mcp.tool(structured_output=False)
+async def postgres_superset_dashboards(table_list: Union[str, list[str]]) -> str:
     """
     Retrieves Superset dashboards and charts related to one or more ClickHouse tables.
 
+    All tables are matched in a single query, so pass them together rather
+    than calling this tool once per table.
+
     Args:
-        table_list (str): Comma-separated table names.
+        table_list (str | list[str]): Comma-separated table names, or a list of names.
 
     Returns:
         str: Dashboard and chart mappings as JSON string.
     """
-    try:
-        logger.info(f"Querying Superset dashboards for tables: {table_list}")
-        result = query_postgres_superset_clickhouse_dashboards(table_list)
-        return json.dumps(result, default=str)
-    except Exception as err:
-        logger.error(f"Error fetching Superset dashboards: {err}")
-        return json.dumps({"status": "ERROR", "message": str(err)})
+    logger.info("Querying Superset dashboards for tables: %s", table_list)
+    return await serve(
+        query_postgres_superset_clickhouse_dashboards, table_list,
+        serialize=partial(json.dumps, default=str),
+    )
+
+
+# Tools callable through `batch_execute`
+DISPATCH = {
+    "postgres_query": postgres_query,
+    "postgres_airflow_dag_status": postgres_airflow_dag_status,
+    "postgres_airflow_dag_statuses": postgres_airflow_dag_statuses,
+    "postgres_superset_dashboards": postgres_superset_dashboards,
+}
+
+
+@mcp.tool(structured_output=False)
+async def batch_execute(
+    operations: list[dict],
+    max_concurrent: int = 8,
+    stop_on_error: bool = False
+) -> str:
+    """
+    Runs several tool calls of this server concurrently in one request.
+
+    Args:
+        operations (list[dict]): Items like {"tool": "postgres_query", "args": {...}};
+            `stream` is not accepted.
+        max_concurrent (int, optional): Maximum number of calls running at once.
+        stop_on_error (bool, optional): Cancel remaining calls after the first failure.
+
+    Returns:
+        str: JSON array of {"tool", "status", "result" | "message"}, in request order.
+    """
+    logger.info("[MCP] Running batch of %s operations", len(operations))
+    return await run_batch(DISPATCH, operations, max_concurrent, stop_on_error)
+
+
+cache_tool_catalog(mcp, "postgres", __file__)
+
 
 if __name__ == "__main__":
+    warmup("postgres")
     mcp.run(transport="streamable-http")
\ No newline at end of file
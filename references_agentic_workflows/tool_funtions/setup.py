@@ -15,18 +15,28 @@ setup(
     python_requires=">=3.8",
     install_requires=[
         # Core dependencies
-        "pandas",
-        "SQLAlchemy",
+        "pandas>=2.0",
         "clickhouse-driver",
-        "psycopg2-binary",
+        # The postgresql+psycopg (psycopg 3) dialect needs SQLAlchemy 2.0
+        "SQLAlchemy>=2.0",
+        "psycopg[binary]>=3.1",
         "PyYAML",
         "loguru",
         "tqdm",
         "requests",
         "google-api-python-client",
-        "google-auth"
+        "google-auth",
+        "google-auth-httplib2",
+        "httplib2",
+        "orjson>=3.10",
+        "cachetools>=5.3.0",
+        "pyarrow>=12"
     ],
     extras_require={
+        # Faster Postgres reads, enabled with USE_CONNECTORX=1
+        "connectorx": [
+            "connectorx>=0.3",
+        ],
         "dev": [
             "pytest",
             "black",
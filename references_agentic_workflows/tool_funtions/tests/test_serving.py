@@ -0,0 +1,47 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import orjson
+
+# tool_funtions modules import each other as top-level packages (`utils...`)
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from utils import serving  # noqa: E402
+
+
+def _stream_logic(sql_query, on_progress):
+    raise RuntimeError(f"Syntax error near '{sql_query}'")
+
+
+def _call_stream(sql_query: str) -> dict:
+    # Each request builds its own progress closure, as the stream tools do
+    def on_progress(rows: int) -> None:
+        pass
+
+    payload = asyncio.run(
+        serving.serve(_stream_logic, sql_query, serialize=None, on_progress=on_progress)
+    )
+    return orjson.loads(payload)
+
+
+def test_identical_failing_stream_calls_trip_loop_guard():
+    serving._failures.clear()
+
+    statuses = [_call_stream("SELEC 1")["status"] for _ in range(serving.LOOP_LIMIT + 1)]
+
+    assert statuses == ["ERROR"] * serving.LOOP_LIMIT + ["ABORT_LOOP"]
+
+
+def test_transient_errors_do_not_trip_loop_guard():
+    serving._failures.clear()
+
+    def flaky(sql_query):
+        try:
+            raise ConnectionRefusedError("connection refused")
+        except ConnectionError as err:
+            raise RuntimeError(f"query failed: {err}") from err
+
+    for _ in range(serving.LOOP_LIMIT + 1):
+        payload = asyncio.run(serving.serve(flaky, "SELECT 1", serialize=None))
+        assert orjson.loads(payload)["status"] == "ERROR"
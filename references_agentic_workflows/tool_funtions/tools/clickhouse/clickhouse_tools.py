@@ -1,7 +1,8 @@
 # tool-functions/src/clickhouse_logic.py
 
 import pandas as pd
-from utils.connector.clickhouse.providers import clickhouse_execute_query
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+from utils.connector.clickhouse.providers import clickhouse_execute_query, clickhouse_stream_query
 import logging
 
 logger = logging.getLogger(__name__)
@@ -28,13 +29,41 @@ def query_clickhouse_logic(sql_query: str) -> pd.DataFrame:
         >>> print(df.head())
     """
     try:
-        logger.debug(f"Executing ClickHouse query: {sql_query}")
+        logger.debug("Executing ClickHouse query: %s", sql_query)
         return clickhouse_execute_query(sql_query)
     except Exception as e:
-        logger.error(f"ClickHouse query execution failed: {e}")
+        logger.error("ClickHouse query execution failed: %s", e)
         raise RuntimeError(f"ClickHouse query execution failed: {e}") from e
 
 
+def query_clickhouse_stream(
+    sql_query: str,
+    block_size: Optional[int] = None
+) -> Iterator[Tuple[List[str], Sequence[Sequence[Any]]]]:
+    """
+    Executes an arbitrary SQL query on ClickHouse and yields rows block by block.
+
+    Use this instead of `query_clickhouse_logic` for wide or long results that
+    should not be materialized as one DataFrame.
+
+    Args:
+        sql_query (str): The SQL query string to execute.
+        block_size (int, optional): Rows per block (ClickHouse `max_block_size`).
+
+    Yields:
+        tuple[list[str], Sequence[Sequence]]: Column names and the rows of one block.
+
+    Raises:
+        RuntimeError: If the query execution fails.
+
+    Example:
+        >>> for columns, rows in query_clickhouse_stream("SELECT * FROM events_dbt"):
+        ...     print(len(rows))
+    """
+    logger.debug("Streaming ClickHouse query: %s", sql_query)
+    yield from clickhouse_stream_query(sql_query, block_size=block_size)
+
+
 def query_clickhouse_schema_logic(table_name: str) -> pd.DataFrame:
     """
     Retrieves column metadata (name and data type) for a specific ClickHouse table.
@@ -56,19 +85,19 @@ def query_clickhouse_schema_logic(table_name: str) -> pd.DataFrame:
         column_name  data_type
         user_id      UInt64
     """
-    query = f"""
+    query = """
         SELECT 
             name AS column_name,
             type AS data_type
         FROM system.columns
-        WHERE table = '{table_name}'
+        WHERE table = {table_name:String}
         ORDER BY position
     """
     try:
-        logger.debug(f"Fetching schema for table: {table_name}")
-        return clickhouse_execute_query(query)
+        logger.debug("Fetching schema for table: %s", table_name)
+        return clickhouse_execute_query(query, {"table_name": table_name})
     except Exception as e:
-        logger.error(f"Failed to retrieve schema for table '{table_name}': {e}")
+        logger.error("Failed to retrieve schema for table '%s': %s", table_name, e)
         raise RuntimeError(f"Schema query failed for table '{table_name}': {e}") from e
 
 
@@ -99,17 +128,17 @@ def query_dbt_tables_by_airflow_dag(airflow_dag: str) -> pd.DataFrame:
               dbt_table
         0     events_dbt
     """
-    query = f"""
+    query = """
         SELECT dbt_table
         FROM staging_dev.airflow_clickhouse_table_mapping
-        WHERE airflow_dag = '{airflow_dag}'
+        WHERE airflow_dag = {airflow_dag:String}
     """
 
     try:
-        logger.debug(f"[Metadata] Fetching dbt_table for DAG: {airflow_dag}")
-        return clickhouse_execute_query(query)
+        logger.debug("[Metadata] Fetching dbt_table for DAG: %s", airflow_dag)
+        return clickhouse_execute_query(query, {"airflow_dag": airflow_dag})
     except Exception as e:
-        logger.error(f"[Metadata] Failed: DAG='{airflow_dag}' → {e}")
+        logger.error("[Metadata] Failed: DAG='%s' → %s", airflow_dag, e)
         raise RuntimeError(
             f"Metadata lookup failed for DAG '{airflow_dag}': {e}"
         ) from e
@@ -142,17 +171,51 @@ def query_airflow_dags_by_dbt_table(table_name: str) -> pd.DataFrame:
               airflow_dag
         0     dag_notification_event
     """
-    query = f"""
+    query = """
         SELECT airflow_dag
         FROM staging_dev.airflow_clickhouse_table_mapping
-        WHERE dbt_table = '{table_name}'
+        WHERE dbt_table = {table_name:String}
     """
 
     try:
-        logger.debug(f"[Metadata] Fetching airflow_dag for table: {table_name}")
-        return clickhouse_execute_query(query)
+        logger.debug("[Metadata] Fetching airflow_dag for table: %s", table_name)
+        return clickhouse_execute_query(query, {"table_name": table_name})
     except Exception as e:
-        logger.error(f"[Metadata] Failed: dbt_table='{table_name}' → {e}")
+        logger.error("[Metadata] Failed: dbt_table='%s' → %s", table_name, e)
         raise RuntimeError(
             f"Metadata lookup failed for table '{table_name}': {e}"
         ) from e
+
+
+def query_airflow_dbt_mapping() -> pd.DataFrame:
+    """
+    Retrieve the full Airflow DAG ↔ dbt table mapping.
+
+    The mapping table is small and changes infrequently, so callers that serve
+    many lineage lookups can load it once and answer from memory instead of
+    issuing one query per DAG or table.
+
+    Returns:
+        pd.DataFrame:
+            One row per mapping, with `airflow_dag` and `dbt_table` columns.
+
+    Raises:
+        RuntimeError:
+            If the metadata lookup fails due to query execution issues.
+
+    Example:
+        >> query_airflow_dbt_mapping()
+              airflow_dag              dbt_table
+        0     dag_notification_event   events_dbt
+    """
+    query = """
+        SELECT airflow_dag, dbt_table
+        FROM staging_dev.airflow_clickhouse_table_mapping
+    """
+
+    try:
+        logger.debug("[Metadata] Fetching full Airflow/dbt mapping")
+        return clickhouse_execute_query(query)
+    except Exception as e:
+        logger.error("[Metadata] Failed to fetch Airflow/dbt mapping: %s", e)
+        raise RuntimeError(f"Metadata lookup failed for Airflow/dbt mapping: {e}") from e
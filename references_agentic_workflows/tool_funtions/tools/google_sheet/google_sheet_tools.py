@@ -2,10 +2,11 @@
 
 import pandas as pd
 import logging
-from typing import Optional, List
+from typing import Dict, List, Optional, Union
 
 from utils.connector.google_sheet.providers import (
     fetch_google_sheet_as_df,
+    fetch_google_sheets_as_df,
     get_google_sheet_names,
     get_google_sheet_title,
 )
@@ -15,13 +16,16 @@ logger = logging.getLogger(__name__)
 
 def query_google_sheet_data(
     spreadsheet_id: str,
-    range_name: Optional[str] = None,
+    range_name: Optional[Union[str, List[str]]] = None,
     use_json_path: bool = False,
     header: bool = True
-) -> pd.DataFrame:
+) -> Union[pd.DataFrame, Dict[str, pd.DataFrame]]:
     """
     Reads a specific range of values from a Google Sheet and returns a DataFrame.
 
+    Passing a list of ranges reads them all with a single `batchGet` request
+    and returns one DataFrame per range instead.
+
     This function is the primary entry point for interacting with spreadsheet
     tabular data stored in Google Sheets. It is commonly used by LLM agents
     or automation scripts to extract structured information.
@@ -29,9 +33,9 @@ def query_google_sheet_data(
     Args:
         spreadsheet_id (str):
             The Google Spreadsheet ID (from URL).
-        range_name (str, optional):
-            The A1-notation range to read, e.g. "Sheet1!A1:D100".
-            Defaults to None (sheet default).
+        range_name (str | list[str], optional):
+            The A1-notation range to read, e.g. "Sheet1!A1:D100", or a list
+            of ranges. Defaults to None (sheet default).
         use_json_path (bool, optional):
             If True, authenticate using Google credential JSON file path.
             Otherwise expects JSON string in an environment variable.
@@ -39,7 +43,8 @@ def query_google_sheet_data(
             Automatic first-row column headers. Defaults to True.
 
     Returns:
-        pd.DataFrame: DataFrame containing sheet data.
+        pd.DataFrame: DataFrame containing sheet data, or a dict of
+        DataFrames keyed by range when `range_name` is a list.
 
     Raises:
         RuntimeError: If Sheet read fails.
@@ -47,11 +52,20 @@ def query_google_sheet_data(
     Example:
         >>> df = query_google_sheet_data("1Hmd...", "Sheet1!A1:D100")
         >>> print(df.head())
+        >>> dfs = query_google_sheet_data("1Hmd...", ["Sheet1!A1:D100", "Config"])
+        >>> dfs["Config"].head()
     """
     try:
         logger.debug(
-            f"[GoogleSheet] Reading spreadsheet={spreadsheet_id}, range={range_name}"
+            "[GoogleSheet] Reading spreadsheet=%s, range=%s", spreadsheet_id, range_name
         )
+        if isinstance(range_name, list):
+            return fetch_google_sheets_as_df(
+                spreadsheet_id,
+                range_name,
+                use_json_path=use_json_path,
+                header=header
+            )
         return fetch_google_sheet_as_df(
             spreadsheet_id,
             range_name=range_name,
@@ -59,7 +73,7 @@ def query_google_sheet_data(
             header=header
         )
     except Exception as e:
-        logger.error(f"[GoogleSheet] Fetch failed: {e}")
+        logger.error("[GoogleSheet] Fetch failed: %s", e)
         raise RuntimeError(f"Google Sheet query failed: {e}") from e
 
 
@@ -86,11 +100,11 @@ def query_google_sheet_tabs(
         ['Sheet1', 'Config', 'Mapping']
     """
     try:
-        logger.debug(f"[GoogleSheet] Fetching sheet names: {spreadsheet_id}")
+        logger.debug("[GoogleSheet] Fetching sheet names: %s", spreadsheet_id)
         return get_google_sheet_names(spreadsheet_id, use_json_path)
     except Exception as e:
         logger.error(
-            f"[GoogleSheet] Unable to list sheet tabs: {e}"
+            "[GoogleSheet] Unable to list sheet tabs: %s", e
         )
         raise RuntimeError(
             f"Failed to retrieve sheet tabs for '{spreadsheet_id}': {e}"
@@ -121,10 +135,10 @@ def query_google_sheet_title_logic(
         'Timeline Project'
     """
     try:
-        logger.debug(f"[GoogleSheet] Fetching sheet title: {spreadsheet_id}")
+        logger.debug("[GoogleSheet] Fetching sheet title: %s", spreadsheet_id)
         return get_google_sheet_title(spreadsheet_id, use_json_path)
     except Exception as e:
-        logger.error(f"[GoogleSheet] Failed to fetch title: {e}")
+        logger.error("[GoogleSheet] Failed to fetch title: %s", e)
         raise RuntimeError(
             f"Failed to retrieve sheet title for '{spreadsheet_id}': {e}"
         ) from e
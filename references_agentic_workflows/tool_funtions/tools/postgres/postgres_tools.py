@@ -1,12 +1,71 @@
 # tool-functions/src/postgres_logic.py
 
-from typing import List, Dict, Optional, Union
+from typing import FrozenSet, Iterator, List, Dict, Optional, Union
 import pandas as pd
 import logging
-from utils.connector.postgres.providers import postgres_execute_query
+import string
+import threading
+from cachetools import TTLCache
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY, TEXT
+from utils.connector.postgres.providers import (
+    postgres_execute_query,
+    postgres_fetch_all,
+    postgres_fetch_one,
+    postgres_iter_query,
+)
 
 logger = logging.getLogger(__name__)
 
+# Superset lookups keyed by the set of table names; agents ask about the same
+# few table lists over and over, and dashboard definitions change rarely
+_superset_cache: "TTLCache[FrozenSet[str], Union[List[Dict[str, str]], str]]" = TTLCache(maxsize=512, ttl=300)
+_superset_cache_lock = threading.Lock()
+
+# Whitespace and quotes around table names ("'events_dbt'", ' "a" ')
+_TABLE_NAME_STRIP = string.whitespace + "'\""
+
+# Fixed metadata queries, built once. Values are always bound parameters;
+# lists are passed as a single array parameter (not an expanding IN list) so
+# the statement text is the same whatever the number of values.
+_DAG_STATUS_SQL = text("""
+    SELECT 
+        dag_id, 
+        start_date, 
+        end_date, 
+        state
+    FROM public.dag_run
+    WHERE dag_id = :dag_id
+    ORDER BY start_date DESC
+    LIMIT 1;
+""").bindparams(bindparam("dag_id"))
+
+# Latest run of each DAG in one statement: DISTINCT ON keeps the first row
+# per dag_id in ORDER BY order
+_DAG_STATUS_MANY_SQL = text("""
+    SELECT DISTINCT ON (dag_id)
+        dag_id, 
+        start_date, 
+        end_date, 
+        state
+    FROM public.dag_run
+    WHERE dag_id = ANY(:dag_ids)
+    ORDER BY dag_id, start_date DESC;
+""").bindparams(bindparam("dag_ids", type_=ARRAY(TEXT)))
+
+# The Superset join only varies by table list, passed as one text[] argument;
+# the driver prepares it per connection after its first execution
+_SUPERSET_DASHBOARDS_SQL = text("""
+    SELECT 
+        d.dashboard_title AS dashboard_name,
+        s.slice_name AS chart_name
+    FROM public.dashboards d
+    JOIN public.dashboard_slices ds ON d.id = ds.dashboard_id
+    JOIN public.slices s ON ds.slice_id = s.id
+    JOIN public.tables t ON s.datasource_id = t.id AND s.datasource_type = 'table'
+    JOIN public.dbs db ON t.database_id = db.id
+    WHERE t.table_name = ANY(:tables)
+""").bindparams(bindparam("tables", type_=ARRAY(TEXT)))
 
 def query_postgres_logic(sql_query: str) -> pd.DataFrame:
     """
@@ -21,7 +80,8 @@ def query_postgres_logic(sql_query: str) -> pd.DataFrame:
         sql_query (str): The SQL query string to execute.
 
     Returns:
-        pd.DataFrame: Query results as a pandas DataFrame.
+        pd.DataFrame: Query results as a pandas DataFrame with pyarrow-backed
+        dtypes.
 
     Raises:
         RuntimeError: If the SQL query execution fails.
@@ -31,13 +91,42 @@ def query_postgres_logic(sql_query: str) -> pd.DataFrame:
         >>> print(df.head())
     """
     try:
-        logger.debug(f"Executing PostgreSQL query: {sql_query}")
-        return postgres_execute_query(sql_query)
+        logger.debug("Executing PostgreSQL query: %s", sql_query)
+        # Arrow-backed columns are cheaper to build than numpy object columns
+        # and serialize straight to Arrow IPC. No chunksize: a server-side
+        # cursor only accepts SELECT/VALUES, and this runs arbitrary SQL
+        # (EXPLAIN, SHOW, DML ... RETURNING)
+        return postgres_execute_query(sql_query, dtype_backend="pyarrow")
     except Exception as e:
-        logger.error(f"PostgreSQL query execution failed: {e}")
+        logger.error("PostgreSQL query execution failed: %s", e)
         raise RuntimeError(f"PostgreSQL query execution failed: {e}") from e
 
 
+def query_postgres_stream(sql_query: str, chunksize: int = 50_000) -> Iterator[pd.DataFrame]:
+    """
+    Executes an arbitrary SQL query on PostgreSQL and yields the result in chunks.
+
+    Use this instead of `query_postgres_logic` for results too large to hold
+    as one DataFrame; rows come from a server-side cursor.
+
+    Args:
+        sql_query (str): The SQL query string to execute.
+        chunksize (int, optional): Rows per yielded DataFrame.
+
+    Yields:
+        pd.DataFrame: Consecutive chunks of the result, with pyarrow-backed dtypes.
+
+    Raises:
+        RuntimeError: If the query execution fails.
+
+    Example:
+        >>> for chunk in query_postgres_stream("SELECT * FROM public.dag_run"):
+        ...     print(len(chunk))
+    """
+    logger.debug("Streaming PostgreSQL query: %s", sql_query)
+    yield from postgres_iter_query(sql_query, chunksize=chunksize, dtype_backend="pyarrow")
+
+
 def query_postgres_airflow_dag_status(dag_id: str) -> Optional[Dict[str, Union[str, None]]]:
     """
     Retrieves the most recent execution status for a given Airflow DAG from Postgres metadata.
@@ -60,33 +149,58 @@ def query_postgres_airflow_dag_status(dag_id: str) -> Optional[Dict[str, Union[s
         {'dag_id': 'dag_notification_event', 'start_date': '2025-10-25T12:30:00',
          'end_date': '2025-10-25T12:40:00', 'state': 'success'}
     """
-    query = f"""
-        SELECT 
-            dag_id, 
-            start_date, 
-            end_date, 
-            state
-        FROM public.dag_run
-        WHERE dag_id = '{dag_id}'
-        ORDER BY start_date DESC
-        LIMIT 1;
-    """
-
     try:
-        logger.debug(f"Querying latest Airflow DAG run for DAG ID: {dag_id}")
-        df = postgres_execute_query(query)
+        logger.debug("Querying latest Airflow DAG run for DAG ID: %s", dag_id)
+        row = postgres_fetch_one(_DAG_STATUS_SQL, {"dag_id": dag_id})
 
-        if df.empty:
-            logger.info(f"No DAG run records found for DAG ID: {dag_id}")
-            return None
+        if row is None:
+            logger.info("No DAG run records found for DAG ID: %s", dag_id)
 
-        return df.iloc[0].to_dict()
+        return row
 
     except Exception as err:
-        logger.error(f"Failed to query Airflow DAG status for '{dag_id}': {err}")
+        logger.error("Failed to query Airflow DAG status for '%s': %s", dag_id, err)
         raise RuntimeError(f"Postgres query failed for DAG '{dag_id}': {err}") from err
 
 
+def query_postgres_airflow_dag_status_many(
+    dag_ids: List[str]
+) -> Dict[str, Optional[Dict[str, Union[str, None]]]]:
+    """
+    Retrieves the most recent execution status of several Airflow DAGs at once.
+
+    All DAGs are looked up in a single query, so checking N DAGs costs one
+    round trip instead of N calls to `query_postgres_airflow_dag_status`.
+
+    Args:
+        dag_ids (List[str]): The Airflow DAG identifiers.
+
+    Returns:
+        Dict[str, Optional[Dict[str, Union[str, None]]]]: The latest run of each
+        requested DAG (same fields as `query_postgres_airflow_dag_status`),
+        keyed by DAG ID in request order; `None` for DAGs without runs.
+
+    Raises:
+        RuntimeError: If the query execution fails.
+
+    Example:
+        >>> query_postgres_airflow_dag_status_many(["dag_a", "dag_b"])
+        {'dag_a': {'dag_id': 'dag_a', 'start_date': ..., 'state': 'success'}, 'dag_b': None}
+    """
+    dag_ids = list(dict.fromkeys(dag_ids))
+
+    try:
+        logger.debug("Querying latest Airflow DAG runs for DAG IDs: %s", dag_ids)
+        rows = postgres_fetch_all(_DAG_STATUS_MANY_SQL, {"dag_ids": dag_ids})
+
+        runs = {row["dag_id"]: row for row in rows}
+        return {dag_id: runs.get(dag_id) for dag_id in dag_ids}
+
+    except Exception as err:
+        logger.error("Failed to query Airflow DAG statuses for %s: %s", dag_ids, err)
+        raise RuntimeError(f"Postgres query failed for DAGs {dag_ids}: {err}") from err
+
+
 def query_postgres_superset_clickhouse_dashboards(
     table_list: Union[str, List[str]]
 ) -> Union[List[Dict[str, str]], Dict[str, str], str]:
@@ -95,7 +209,12 @@ def query_postgres_superset_clickhouse_dashboards(
 
     This function performs a metadata lookup from the Superset Postgres database,
     mapping ClickHouse tables to dashboards and charts that reference them.
-    It supports both comma-separated strings and Python lists as input.
+    It supports both comma-separated strings and Python lists as input; all
+    tables are matched in one query via a bound array parameter.
+
+    Results are cached for 5 minutes per set of table names (order and
+    duplicates don't matter); errors are not cached. Call
+    `query_postgres_superset_clickhouse_dashboards.cache_clear()` to drop them.
 
     Args:
         table_list (Union[str, List[str]]): A list or comma-separated string of table names.
@@ -119,37 +238,46 @@ def query_postgres_superset_clickhouse_dashboards(
     try:
         # Normalize input
         if isinstance(table_list, str):
-            tables = [t.strip().strip("'").strip('"') for t in table_list.split(",")]
+            tables = [t.strip(_TABLE_NAME_STRIP) for t in table_list.split(",")]
         elif isinstance(table_list, list):
-            tables = [str(t).strip().strip("'").strip('"') for t in table_list]
+            tables = [str(t).strip(_TABLE_NAME_STRIP) for t in table_list]
         else:
             logger.error("Invalid input type for table_list.")
             return {"status": "ERROR", "message": "Invalid input type for table_list."}
 
-        quoted_tables = ", ".join(f"'{t}'" for t in tables)
+        # Drop blanks (e.g. a trailing comma) and duplicates, keeping order
+        tables = list(dict.fromkeys(t for t in tables if t))
+        if not tables:
+            return {"status": "ERROR", "message": "table_list contains no table names."}
 
-        query = f"""
-            SELECT 
-                d.dashboard_title AS dashboard_name,
-                s.slice_name AS chart_name
-            FROM public.dashboards d
-            JOIN public.dashboard_slices ds ON d.id = ds.dashboard_id
-            JOIN public.slices s ON ds.slice_id = s.id
-            JOIN public.tables t ON s.datasource_id = t.id AND s.datasource_type = 'table'
-            JOIN public.dbs db ON t.database_id = db.id
-            WHERE t.table_name IN ({quoted_tables})
-        """
+        key = frozenset(tables)
+        with _superset_cache_lock:
+            cached = _superset_cache.get(key)
+        if cached is not None:
+            logger.debug("[Cache] Reused Superset dashboards for tables: %s", tables)
+            return cached
 
-        logger.debug(f"Querying Superset dashboards for tables: {tables}")
-        df = postgres_execute_query(query)
+        logger.debug("Querying Superset dashboards for tables: %s", tables)
+        rows = postgres_fetch_all(_SUPERSET_DASHBOARDS_SQL, {"tables": tables})
 
-        if df.empty:
-            logger.info(f"No impacted Superset assets found for tables: {tables}")
-            return "No impacted Superset assets found for these tables."
+        if not rows:
+            logger.info("No impacted Superset assets found for tables: %s", tables)
+            result = "No impacted Superset assets found for these tables."
+        else:
+            result = rows
 
-        result_list = df[["dashboard_name", "chart_name"]].to_dict("records")
-        return result_list
+        with _superset_cache_lock:
+            _superset_cache[key] = result
+        return result
 
     except Exception as err:
-        logger.error(f"Failed to query Superset dashboards: {err}")
+        logger.error("Failed to query Superset dashboards: %s", err)
         return {"status": "ERROR", "message": str(err)}
+
+
+def _clear_superset_cache() -> None:
+    with _superset_cache_lock:
+        _superset_cache.clear()
+
+
+query_postgres_superset_clickhouse_dashboards.cache_clear = _clear_superset_cache
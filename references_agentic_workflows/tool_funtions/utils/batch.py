@@ -0,0 +1,112 @@
+"""
+batch.py
+
+Concurrent dispatch of several tool calls in one request, used by the MCP
+servers' `batch_execute` tools.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+ToolFn = Callable[..., Awaitable[Any]]
+
+# Tools catch their own exceptions and return `{"status": ..., "message": ...}`
+# instead of raising; these statuses mean the call failed
+_FAILED_STATUSES = ("ERROR", "ABORT_LOOP")
+
+# Error payloads are short; larger results are never parsed just to check
+_MAX_STATUS_PROBE = 4096
+
+
+class BatchOperationError(Exception):
+    """A tool in the batch returned an error payload instead of raising."""
+
+    def __init__(self, status: str, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _failed_payload(result: Any) -> Any:
+    """Return the tool's error payload as a dict, or None if the call succeeded."""
+    if isinstance(result, str):
+        if len(result) > _MAX_STATUS_PROBE or not result.lstrip().startswith("{"):
+            return None
+        try:
+            result = orjson.loads(result)
+        except orjson.JSONDecodeError:
+            return None
+    if isinstance(result, dict) and result.get("status") in _FAILED_STATUSES:
+        return result
+    return None
+
+
+async def run_batch(
+    dispatch: Dict[str, ToolFn],
+    operations: List[Dict[str, Any]],
+    max_concurrent: int = 8,
+    stop_on_error: bool = False,
+) -> str:
+    """
+    Run `operations` concurrently against the tools in `dispatch`.
+
+    Args:
+        dispatch (dict): Tool name -> async tool function.
+        operations (list[dict]): Items like `{"tool": "<name>", "args": {...}}`.
+        max_concurrent (int): Maximum number of operations running at once.
+        stop_on_error (bool): Cancel the remaining operations after the first failure.
+
+    Returns:
+        str: JSON array with one `{"tool", "status", "result" | "message"}` entry
+        per operation, in request order. Tool results that are already JSON
+        strings are embedded as-is rather than re-encoded. A tool that returns
+        an `ERROR` or `ABORT_LOOP` payload counts as a failure: its entry
+        carries that status and message, and it triggers `stop_on_error`.
+        Operations passing `stream=True` are rejected as errors: their JSON
+        Lines output is not JSON and cannot be embedded in the array.
+    """
+    sem = asyncio.Semaphore(max(1, max_concurrent))
+
+    async def run_one(op: Dict[str, Any]) -> Any:
+        fn = dispatch.get(op.get("tool"))
+        if fn is None:
+            raise ValueError(f"Unknown tool '{op.get('tool')}'. Available: {sorted(dispatch)}")
+        args = op.get("args") or {}
+        if args.get("stream"):
+            raise ValueError("stream=True returns JSON Lines and is not supported in batch_execute")
+        async with sem:
+            result = await fn(**args)
+        failed = _failed_payload(result)
+        if failed is not None:
+            raise BatchOperationError(failed["status"], str(failed.get("message", "")))
+        return result
+
+    tasks = [asyncio.ensure_future(run_one(op)) for op in operations]
+    if stop_on_error:
+        try:
+            await asyncio.gather(*tasks)
+        except Exception:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    else:
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    results: List[Dict[str, Any]] = []
+    for op, t in zip(operations, tasks):
+        entry: Dict[str, Any] = {"tool": op.get("tool")}
+        if t.cancelled():
+            entry["status"] = "CANCELLED"
+        elif t.exception() is not None:
+            err = t.exception()
+            logger.error("Batch operation '%s' failed: %s", op.get("tool"), err)
+            entry.update(status=getattr(err, "status", "ERROR"), message=str(err))
+        else:
+            result = t.result()
+            entry.update(status="OK", result=orjson.Fragment(result) if isinstance(result, str) else result)
+        results.append(entry)
+    return orjson.dumps(results, default=str).decode()
@@ -0,0 +1,72 @@
+"""
+catalog.py
+
+Tool-catalog caching for the MCP servers: `tools/list` is built once per
+process instead of on every request, and the catalog is exported to a JSON
+file keyed by a hash of the server source so local tooling can read it
+without connecting.
+"""
+
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+
+import orjson
+
+if TYPE_CHECKING:  # mcp is a dependency of the servers, not of this package
+    from mcp.server.fastmcp import FastMCP
+    from mcp.types import Tool
+
+logger = logging.getLogger(__name__)
+
+
+def catalog_path(name: str, cache_dir: Optional[str] = None) -> Path:
+    """Location of the exported catalog (`$MCP_TOOL_CATALOG_DIR`, default `~/.cache/mcp`)."""
+    base = cache_dir or os.getenv("MCP_TOOL_CATALOG_DIR") or Path.home() / ".cache" / "mcp"
+    return Path(base) / f"{name}.json"
+
+
+def _export(path: Path, key: str, tools: "List[Tool]") -> None:
+    try:
+        if path.exists() and orjson.loads(path.read_bytes()).get("key") == key:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(orjson.dumps({
+            "key": key,
+            "catalog": [t.model_dump(mode="json", exclude_none=True) for t in tools],
+        }))
+    except (OSError, ValueError) as err:
+        # The export is a convenience; serving tools/list must not depend on it
+        logger.warning("Could not write tool catalog %s: %s", path, err)
+
+
+def cache_tool_catalog(mcp: "FastMCP", name: str, source_path: str, cache_dir: Optional[str] = None) -> None:
+    """
+    Serve `tools/list` for `mcp` from a catalog built once per process.
+
+    Call this after every tool is registered. The first listing also writes
+    `{"key", "catalog"}` to `catalog_path(name)`, where `key` is a blake2b hash
+    of `source_path`; the file is only rewritten when the source changes.
+
+    Args:
+        mcp (FastMCP): The server whose tool listing is cached.
+        name (str): Catalog file name (without extension).
+        source_path (str): The server module, usually `__file__`.
+        cache_dir (str, optional): Overrides the catalog directory.
+    """
+    key = hashlib.blake2b(Path(source_path).read_bytes(), digest_size=16).hexdigest()
+    path = catalog_path(name, cache_dir)
+    tools: "Optional[List[Tool]]" = None
+
+    async def list_tools() -> "List[Tool]":
+        nonlocal tools
+        if tools is None:
+            tools = await mcp.list_tools()
+            _export(path, key, tools)
+        return tools
+
+    # FastMCP registers its own (uncached) list_tools handler on the low-level
+    # server at init; registering again replaces it
+    mcp._mcp_server.list_tools()(list_tools)
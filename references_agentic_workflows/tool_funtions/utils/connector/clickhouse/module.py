@@ -34,6 +34,10 @@ class ClickhouseConnector:
         """
         Creates a ClickHouse client and establishes a connection.
 
+        The client does not bind queries to a server session, so a single
+        instance can run queries from several threads at once. Responses are
+        LZ4-compressed over HTTP.
+
         Returns:
             Client: The ClickHouse client instance.
 
@@ -46,7 +50,9 @@ class ClickhouseConnector:
                 host=self.__host,
                 port=self.__port,
                 user=self.__user,
-                password=self.__password
+                password=self.__password,
+                autogenerate_session_id=False,
+                compress="lz4"
             )
             return client
         except Exception as e:
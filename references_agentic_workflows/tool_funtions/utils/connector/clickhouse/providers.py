@@ -1,22 +1,53 @@
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
 import pandas as pd
 from utils.connector.clickhouse.helper import connect_to_clickhouse
 from variables.clickhouse import ClickHouseConfig
 from variables.helper import ConfigLoader
 
+# One HTTP client (and its urllib3 connection pool) per connection settings,
+# shared by every query instead of reconnecting on each call
+_clients: Dict[Tuple[Any, ...], Any] = {}
+_clients_lock = threading.Lock()
+
+
+def _get_client(clickhouse_config: Dict[str, Any]):
+    """Return the shared ClickHouse client for `clickhouse_config`, creating it once."""
+    key = tuple(clickhouse_config[k] for k in (
+        "CLICKHOUSE_HOST", "CLICKHOUSE_PORT", "CLICKHOUSE_USER", "CLICKHOUSE_PASSWORD"
+    ))
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _clients[key] = connect_to_clickhouse(clickhouse_config).connect_client()
+    return client
 
-def clickhouse_execute_query(query: str) -> pd.DataFrame:
+
+def clickhouse_execute_query(query: str, parameters: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
     """
     Execute an SQL query on ClickHouse and return the result as a pandas DataFrame.
 
     This function loads ClickHouse connection settings from environment variables,
-    establishes a connection, runs the provided SQL query, and converts the result
-    into a pandas DataFrame for further analysis or processing.
+    reuses the process-wide client for those settings (connecting on first use),
+    runs the provided SQL query, and converts the result into a pandas DataFrame
+    for further analysis or processing.
+
+    The result is fetched in Arrow format and converted column-wise, so the
+    DataFrame has pyarrow-backed dtypes (`pd.ArrowDtype`) and no Python
+    object is created per cell.
 
     Args:
         query (str): The SQL query to execute on the ClickHouse database.
+        parameters (dict, optional): Values for `{name:Type}` placeholders in
+            `query`. They are bound server-side, so values are never spliced
+            into the SQL text and the query text stays the same across calls.
 
     Returns:
-        pd.DataFrame: Query result as a DataFrame containing rows and column names.
+        pd.DataFrame: Query result as a DataFrame containing rows and column names,
+        with pyarrow-backed dtypes.
 
     Raises:
         RuntimeError: If the query execution or database connection fails.
@@ -25,21 +56,58 @@ def clickhouse_execute_query(query: str) -> pd.DataFrame:
         >> query = "SELECT * FROM analytics.events LIMIT 10"
         >> df = clickhouse_execute_query(query)
         >> print(df.head())
+        >> clickhouse_execute_query(
+        ..     "SELECT name FROM system.columns WHERE table = {t:String}", {"t": "events"}
+        .. )
     """
     try:
-        # Load configuration and establish a ClickHouse connection
+        # Load configuration and get the pooled ClickHouse client
         clickhouse_config = ConfigLoader.load_single(ClickHouseConfig)
-        conn = connect_to_clickhouse(clickhouse_config)
-        client = conn.connect_client()
+        client = _get_client(clickhouse_config)
 
-        # Execute the query
-        result = client.query(query)
-        rows = result.result_rows
-        columns = result.column_names
+        # Execute the query; use_strings decodes String columns as UTF-8
+        # instead of returning them as Arrow binary
+        table = client.query_arrow(query, parameters=parameters, use_strings=True)
 
         # Convert to DataFrame
-        df = pd.DataFrame(rows, columns=columns)
-        return df
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    except Exception as err:
+        raise RuntimeError(f"ClickHouse query failed: {err}") from err
+
+
+def clickhouse_stream_query(
+    query: str,
+    parameters: Optional[Dict[str, Any]] = None,
+    block_size: Optional[int] = None,
+) -> Iterator[Tuple[List[str], Sequence[Sequence[Any]]]]:
+    """
+    Execute an SQL query on ClickHouse and yield the result block by block.
+
+    Rows are read from the server as they arrive instead of being collected
+    into a DataFrame first; a caller that consumes each block before asking
+    for the next holds only one block of raw rows at a time.
+
+    Args:
+        query (str): The SQL query to execute on the ClickHouse database.
+        parameters (dict, optional): Values for `{name:Type}` placeholders.
+        block_size (int, optional): Rows per block (ClickHouse `max_block_size`).
+
+    Yields:
+        tuple[list[str], Sequence[Sequence]]: Column names and the rows of one block.
+
+    Raises:
+        RuntimeError: If the query execution or database connection fails.
+    """
+    settings = {"max_block_size": block_size} if block_size else None
+    try:
+        clickhouse_config = ConfigLoader.load_single(ClickHouseConfig)
+        client = _get_client(clickhouse_config)
+
+        with client.query_row_block_stream(query, parameters=parameters, settings=settings) as stream:
+            columns = list(stream.source.column_names)
+            for block in stream:
+                yield columns, block
 
     except Exception as err:
         raise RuntimeError(f"ClickHouse query failed: {err}") from err
@@ -1,6 +1,12 @@
-import json
 import logging
+import os
+import threading
+from functools import lru_cache
+from typing import Any, Optional
+import httplib2
+import orjson
 from google.oauth2.service_account import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
 from variables.google_sheet import GoogleSheetConfig
 from variables.helper import ConfigLoader
@@ -9,6 +15,70 @@ logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
+_SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
+
+# Seconds before a Sheets API request is abandoned
+HTTP_TIMEOUT = 30
+
+# Built services wrap an httplib2 connection, which is not thread-safe, so
+# shared clients are kept per thread (credentials are shared process-wide)
+_local = threading.local()
+
+
+def _file_mtime(path: Optional[str]) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns if path else None
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=4)
+def _cached_credentials(use_json_path: bool,
+                        sa_json_str: Optional[str],
+                        sa_json_path: Optional[str],
+                        sa_json_mtime: Optional[int]) -> Credentials:
+    """Parse the service account once per distinct setting (and key file version)."""
+    if use_json_path:
+        if sa_json_path:
+            logger.info("Using GOOGLE_SHEET_SERVICE_ACCOUNT_JSON_PATH: %s", sa_json_path)
+            return Credentials.from_service_account_file(sa_json_path, scopes=_SCOPES)
+        raise ValueError("Flag use_json_path=True but GOOGLE_SHEET_SERVICE_ACCOUNT_JSON_PATH not set.")
+
+    if sa_json_str:
+        logger.info("Using GOOGLE_SHEET_SERVICE_ACCOUNT (JSON string) for authentication.")
+        return Credentials.from_service_account_info(orjson.loads(sa_json_str), scopes=_SCOPES)
+    if sa_json_path:
+        # fallback nếu JSON string không có
+        logger.info("Fallback to GOOGLE_SHEET_SERVICE_ACCOUNT_JSON_PATH: %s", sa_json_path)
+        return Credentials.from_service_account_file(sa_json_path, scopes=_SCOPES)
+    raise ValueError("No Google Sheet credentials provided via env variables.")
+
+
+def load_credentials(use_json_path: bool = False) -> Credentials:
+    """
+    Return the service account credentials for the current configuration.
+
+    The parsed credentials are reused until the env settings or the key file's
+    modification time change.
+    """
+    gs_config = ConfigLoader.load_single(GoogleSheetConfig)
+    sa_json_str = gs_config.get("GOOGLE_SHEET_SERVICE_ACCOUNT", None)
+    sa_json_path = gs_config.get("GOOGLE_SHEET_SERVICE_ACCOUNT_JSON_PATH", None)
+    return _cached_credentials(use_json_path, sa_json_str, sa_json_path, _file_mtime(sa_json_path))
+
+
+def _value_options(unformatted: bool, by_columns: bool) -> dict[str, str]:
+    """Query options of `values.get` / `values.batchGet`; empty means API defaults."""
+    options = {}
+    if unformatted:
+        options["valueRenderOption"] = "UNFORMATTED_VALUE"
+        # Dates would otherwise come back as serial day numbers
+        options["dateTimeRenderOption"] = "FORMATTED_STRING"
+    if by_columns:
+        options["majorDimension"] = "COLUMNS"
+    return options
+
+
 class GoogleSheetClient:
     """
     Client class to authenticate and read data from Google Sheets.
@@ -16,61 +86,94 @@ class GoogleSheetClient:
     Authentication priority:
       1. GOOGLE_SHEET_SERVICE_ACCOUNT (JSON string, default)
       2. GOOGLE_SHEET_SERVICE_ACCOUNT_JSON_PATH (file path, if use_json_path=True)
+
+    Use `GoogleSheetClient.shared()` to reuse the built service across calls.
     """
 
-    def __init__(self, use_json_path: bool = False):
-        gs_config = ConfigLoader.load_single(GoogleSheetConfig)
-
-        sa_json_str = gs_config.get("GOOGLE_SHEET_SERVICE_ACCOUNT", None)
-        sa_json_path = gs_config.get("GOOGLE_SHEET_SERVICE_ACCOUNT_JSON_PATH", None)
-
-        if use_json_path:
-            if sa_json_path:
-                self.credentials = Credentials.from_service_account_file(
-                    sa_json_path,
-                    scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
-                )
-                logger.info(f"Using GOOGLE_SHEET_SERVICE_ACCOUNT_JSON_PATH: {sa_json_path}")
-            else:
-                raise ValueError("Flag use_json_path=True but GOOGLE_SHEET_SERVICE_ACCOUNT_JSON_PATH not set.")
-        else:
-            if sa_json_str:
-                self.credentials = Credentials.from_service_account_info(
-                    json.loads(sa_json_str),
-                    scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
-                )
-                logger.info("Using GOOGLE_SHEET_SERVICE_ACCOUNT (JSON string) for authentication.")
-            elif sa_json_path:
-                # fallback nếu JSON string không có
-                self.credentials = Credentials.from_service_account_file(
-                    sa_json_path,
-                    scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
-                )
-                logger.info(f"Fallback to GOOGLE_SHEET_SERVICE_ACCOUNT_JSON_PATH: {sa_json_path}")
-            else:
-                raise ValueError("No Google Sheet credentials provided via env variables.")
-
-        self.service = build("sheets", "v4", credentials=self.credentials)
+    def __init__(self, use_json_path: bool = False, credentials: Optional[Credentials] = None):
+        self.credentials = credentials or load_credentials(use_json_path)
+        # The discovery document ships with the client library (no HTTP fetch),
+        # and requests go through one keep-alive connection owned by this client
+        http = AuthorizedHttp(self.credentials, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+        self.service = build("sheets", "v4", http=http, cache_discovery=False, static_discovery=True)
         self.sheet = self.service.spreadsheets()
 
-    def read_sheet(self, spreadsheet_id: str, range_name: str) -> list[list[str]]:
+    @classmethod
+    def shared(cls, use_json_path: bool = False) -> "GoogleSheetClient":
+        """
+        Return this thread's client for `use_json_path`, building it on first use.
+
+        The client is rebuilt when the credentials change (see `load_credentials`).
+        """
+        credentials = load_credentials(use_json_path)
+        clients = _local.__dict__.setdefault("clients", {})
+        client = clients.get(use_json_path)
+        if client is None or client.credentials is not credentials:
+            client = clients[use_json_path] = cls(use_json_path, credentials=credentials)
+        return client
+
+    def read_sheet(
+        self,
+        spreadsheet_id: str,
+        range_name: str,
+        unformatted: bool = False,
+        by_columns: bool = False,
+    ) -> list[list[Any]]:
         """
         Read sheet values (sync).
 
         Args:
             spreadsheet_id (str): Google Sheet ID
             range_name (str): Range in A1 notation (e.g., "Sheet1!A1:D100")
+            unformatted (bool): Return typed cell values (numbers, booleans)
+                instead of display strings; dates stay formatted strings.
+            by_columns (bool): Return one list per column instead of per row.
 
         Returns:
-            list[list[str]]: Sheet values
+            list[list]: Sheet values
         """
         try:
-            logger.info(f"Reading Google Sheet {spreadsheet_id}, range {range_name}")
+            logger.info("Reading Google Sheet %s, range %s", spreadsheet_id, range_name)
             result = self.sheet.values().get(
                 spreadsheetId=spreadsheet_id,
-                range=range_name
+                range=range_name,
+                **_value_options(unformatted, by_columns)
             ).execute()
             return result.get("values", [])
         except Exception as err:
-            logger.error(f"Failed to read Google Sheet: {err}")
+            logger.error("Failed to read Google Sheet: %s", err)
+            raise
+
+    def read_sheets(
+        self,
+        spreadsheet_id: str,
+        range_names: list[str],
+        unformatted: bool = False,
+        by_columns: bool = False,
+    ) -> dict[str, list[list[Any]]]:
+        """
+        Read several ranges in a single `values.batchGet` request (sync).
+
+        Args:
+            spreadsheet_id (str): Google Sheet ID
+            range_names (list[str]): Ranges in A1 notation
+            unformatted (bool): Typed cell values, as in `read_sheet`.
+            by_columns (bool): One list per column, as in `read_sheet`.
+
+        Returns:
+            dict[str, list[list]]: Sheet values keyed by the requested range
+        """
+        try:
+            logger.info("Reading Google Sheet %s, ranges %s", spreadsheet_id, range_names)
+            result = self.sheet.values().batchGet(
+                spreadsheetId=spreadsheet_id,
+                ranges=range_names,
+                **_value_options(unformatted, by_columns)
+            ).execute()
+            # valueRanges come back in request order; their own "range" is normalized
+            # by the API (e.g. "Sheet1!A1:D100"), so key by what the caller asked for
+            value_ranges = result.get("valueRanges", [])
+            return {name: vr.get("values", []) for name, vr in zip(range_names, value_ranges)}
+        except Exception as err:
+            logger.error("Failed to batch read Google Sheet: %s", err)
             raise
@@ -1,6 +1,16 @@
 from utils.connector.google_sheet.module import GoogleSheetClient
-from typing import Optional
+from typing import Any, Dict, List, Optional
+import threading
 import pandas as pd
+from cachetools import TTLCache
+
+# Spreadsheet metadata (title, tab names) keyed by (spreadsheet_id,
+# use_json_path); tabs are renamed or added rarely. Failed lookups are not cached.
+_metadata_cache: TTLCache = TTLCache(maxsize=256, ttl=600)
+_metadata_lock = threading.Lock()
+
+# Range read when none is given: the first tab of a Vietnamese-locale sheet
+DEFAULT_RANGE = "Trang tính1"
 
 def fetch_google_sheet(spreadsheet_id: str, range_name: str = None, use_json_path: bool = False) -> list[list[str]]:
     """
@@ -18,9 +28,9 @@ def fetch_google_sheet(spreadsheet_id: str, range_name: str = None, use_json_pat
     """
     # Default range
     if range_name is None:
-        range_name = "Trang tính1"
+        range_name = DEFAULT_RANGE
 
-    client = GoogleSheetClient(use_json_path=use_json_path)
+    client = GoogleSheetClient.shared(use_json_path=use_json_path)
     return client.read_sheet(spreadsheet_id, range_name)
 
 def fetch_google_sheet_as_df(spreadsheet_id: str,
@@ -30,6 +40,9 @@ def fetch_google_sheet_as_df(spreadsheet_id: str,
     """
     Fetch Google Sheet data and return as pandas DataFrame.
 
+    Cells are read unformatted (numbers and booleans keep their type; dates
+    are formatted strings) and column by column.
+
     Args:
         spreadsheet_id (str): Google Sheet ID
         range_name (str, optional): A1 notation range (e.g., 'Sheet1!A1:D100').
@@ -40,23 +53,110 @@ def fetch_google_sheet_as_df(spreadsheet_id: str,
     Returns:
         pd.DataFrame: Sheet values as DataFrame
     """
-    data = fetch_google_sheet(spreadsheet_id, range_name=range_name, use_json_path=use_json_path)
+    if range_name is None:
+        range_name = DEFAULT_RANGE
+
+    client = GoogleSheetClient.shared(use_json_path=use_json_path)
+    columns = client.read_sheet(spreadsheet_id, range_name, unformatted=True, by_columns=True)
+    return _columns_to_df(columns, header)
+
+def fetch_google_sheets(spreadsheet_id: str, range_names: List[str], use_json_path: bool = False) -> Dict[str, list[list[str]]]:
+    """
+    Fetch several ranges of a Google Sheet in one API request.
+
+    Args:
+        spreadsheet_id (str): The Google Sheet ID
+        range_names (list[str]): A1 notation ranges (e.g., ['Sheet1!A1:D100', 'Config'])
+        use_json_path (bool, optional): If True, authenticate using JSON file path.
+
+    Returns:
+        dict[str, list[list[str]]]: Sheet values keyed by range
+    """
+    client = GoogleSheetClient.shared(use_json_path=use_json_path)
+    return client.read_sheets(spreadsheet_id, range_names)
+
+def fetch_google_sheets_as_df(spreadsheet_id: str,
+                              range_names: List[str],
+                              use_json_path: bool = False,
+                              header: bool = True) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch several ranges of a Google Sheet in one API request, as DataFrames.
 
-    if not data:
+    Values are read as in `fetch_google_sheet_as_df`.
+
+    Args:
+        spreadsheet_id (str): Google Sheet ID
+        range_names (list[str]): A1 notation ranges
+        use_json_path (bool, optional): If True, authenticate using JSON file path.
+        header (bool, optional): If True, use first row of each range as column names.
+
+    Returns:
+        dict[str, pd.DataFrame]: One DataFrame per range, keyed by range
+    """
+    client = GoogleSheetClient.shared(use_json_path=use_json_path)
+    data = client.read_sheets(spreadsheet_id, range_names, unformatted=True, by_columns=True)
+    return {name: _columns_to_df(columns, header) for name, columns in data.items()}
+
+def _columns_to_df(columns: list[list[Any]], header: bool) -> pd.DataFrame:
+    if not columns:
         return pd.DataFrame()  # empty DataFrame
 
     if header:
-        # first row as column names
-        df = pd.DataFrame(data[1:], columns=data[0])
+        # first cell of each column as its name
+        names = [col[0] if col else "" for col in columns]
+        columns = [col[1:] for col in columns]
     else:
-        df = pd.DataFrame(data)
-
+        names = list(range(len(columns)))
+
+    # The API drops trailing empty cells, so columns can differ in length
+    length = max(len(col) for col in columns)
+    df = pd.DataFrame({
+        i: _column_array(col + [None] * (length - len(col))) for i, col in enumerate(columns)
+    })
+    df.columns = names
     return df
 
+def _column_array(values: list[Any]) -> Any:
+    """Typed Arrow-backed column, or an object column when cell types are mixed."""
+    import pyarrow as pa
+
+    try:
+        return pd.arrays.ArrowExtensionArray(pa.array(values))
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # e.g. a number column with a text note in one cell
+        return pd.array(values, dtype=object)
+
+def _spreadsheet_metadata(spreadsheet_id: str, use_json_path: bool) -> dict:
+    """Spreadsheet title and tab names, from the cache or one `spreadsheets.get` call."""
+    key = (spreadsheet_id, use_json_path)
+    with _metadata_lock:
+        metadata = _metadata_cache.get(key)
+    if metadata is not None:
+        return metadata
+
+    client = GoogleSheetClient.shared(use_json_path=use_json_path)
+    metadata = (
+        client.service.spreadsheets()
+        .get(spreadsheetId=spreadsheet_id, fields="properties.title,sheets.properties.title")
+        .execute()
+    )
+    with _metadata_lock:
+        _metadata_cache[key] = metadata
+    return metadata
+
+def invalidate_sheet_metadata(spreadsheet_id: str) -> None:
+    """Forget the cached title and tab names of `spreadsheet_id` (e.g. after adding a tab)."""
+    with _metadata_lock:
+        for use_json_path in (False, True):
+            _metadata_cache.pop((spreadsheet_id, use_json_path), None)
+
 def get_google_sheet_names(spreadsheet_id: str, use_json_path: bool = False) -> list[str]:
     """
     Fetch all sheet (tab) names from a Google Spreadsheet.
 
+    Metadata is cached per spreadsheet for 10 minutes (shared with
+    `get_google_sheet_title`); see `invalidate_sheet_metadata`.
+
     Args:
         spreadsheet_id (str): Google Sheet ID
         use_json_path (bool): Authenticate via JSON file path if True
@@ -64,15 +164,9 @@ def get_google_sheet_names(spreadsheet_id: str, use_json_path: bool = False) ->
     Returns:
         list[str]: List of sheet names
     """
-    client = GoogleSheetClient(use_json_path=use_json_path)
-
     # access spreadsheet metadata
     try:
-        response = (
-            client.service.spreadsheets()
-            .get(spreadsheetId=spreadsheet_id)
-            .execute()
-        )
+        response = _spreadsheet_metadata(spreadsheet_id, use_json_path)
 
         sheets = response.get("sheets", [])
         sheet_names = [s["properties"]["title"] for s in sheets]
@@ -87,6 +181,9 @@ def get_google_sheet_title(spreadsheet_id: str, use_json_path: bool = False) ->
     """
     Retrieve the title (file name) of a Google Spreadsheet.
 
+    Metadata is cached per spreadsheet for 10 minutes (shared with
+    `get_google_sheet_names`); see `invalidate_sheet_metadata`.
+
     Args:
         spreadsheet_id (str): The unique Google Spreadsheet ID.
         use_json_path (bool, optional): If True, authenticate using a JSON file path
@@ -95,14 +192,8 @@ def get_google_sheet_title(spreadsheet_id: str, use_json_path: bool = False) ->
     Returns:
         str: The title of the Google Sheet. Returns an empty string if retrieval fails.
     """
-    client = GoogleSheetClient(use_json_path=use_json_path)
-
     try:
-        response = (
-            client.service.spreadsheets()
-            .get(spreadsheetId=spreadsheet_id)
-            .execute()
-        )
+        response = _spreadsheet_metadata(spreadsheet_id, use_json_path)
 
         return response.get("properties", {}).get("title", "")
 
@@ -0,0 +1,55 @@
+"""
+engine.py
+
+Process-wide SQLAlchemy engines for PostgreSQL: one `PostgresConnector`
+(engine + connection pool) per set of connection settings, created on first
+use and shared by every query helper.
+"""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+
+from utils.connector.postgres.module import PostgresConnector
+from variables.helper import ConfigLoader
+from variables.postgres import PostgresConfig
+
+_connectors: Dict[Tuple[Any, ...], PostgresConnector] = {}
+_connectors_lock = threading.Lock()
+
+
+def config_key(postgres_config: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Connection settings that identify one engine."""
+    return tuple(postgres_config[k] for k in (
+        "POSTGRES_HOST", "POSTGRES_PORT", "POSTGRES_USER", "POSTGRES_PASS", "POSTGRES_DB_NAME"
+    ))
+
+
+def get_engine(postgres_config: Optional[Dict[str, Any]] = None) -> Engine:
+    """
+    Return the shared SQLAlchemy engine, creating it once.
+
+    Args:
+        postgres_config (dict, optional): Connection settings; defaults to
+            `PostgresConfig` from the environment.
+
+    Returns:
+        Engine: The pooled engine for these settings.
+    """
+    if postgres_config is None:
+        postgres_config = ConfigLoader.load_single(PostgresConfig)
+    key = config_key(postgres_config)
+    conn = _connectors.get(key)
+    if conn is None:
+        with _connectors_lock:
+            conn = _connectors.get(key)
+            if conn is None:
+                conn = _connectors[key] = PostgresConnector(
+                    host=postgres_config["POSTGRES_HOST"],
+                    port=postgres_config["POSTGRES_PORT"],
+                    user=postgres_config["POSTGRES_USER"],
+                    password=postgres_config["POSTGRES_PASS"],
+                    db=postgres_config["POSTGRES_DB_NAME"],
+                )
+    return conn.connect_engine()
@@ -45,6 +45,15 @@ class PostgresConnector:
         """
         Creates and returns a SQLAlchemy engine for PostgreSQL.
 
+        The engine keeps a pool of 10 connections and opens up to 30 under
+        concurrent load (roughly the size of the worker-thread pool running
+        tool calls). Connections are pinged before reuse and replaced after
+        30 minutes, before server-side idle timeouts drop them.
+
+        The psycopg 3 driver sends parameters server-side and prepares a
+        statement on its second execution on a connection, so repeated
+        queries (the metadata lookups) skip parsing and planning.
+
         Returns:
             Engine: A SQLAlchemy engine instance.
 
@@ -54,10 +63,17 @@ class PostgresConnector:
         try:
             if not self.__engine:
                 conn_str = (
-                    f"postgresql+psycopg2://{self.__user}:{self.__password}"
+                    f"postgresql+psycopg://{self.__user}:{self.__password}"
                     f"@{self.__host}:{self.__port}/{self.__db}"
                 )
-                self.__engine = create_engine(conn_str)
+                self.__engine = create_engine(
+                    conn_str,
+                    pool_size=10,
+                    max_overflow=20,
+                    pool_pre_ping=True,
+                    pool_recycle=1800,
+                    connect_args={"prepare_threshold": 1},
+                )
                 self.__session_factory = sessionmaker(bind=self.__engine)
             return self.__engine
         except SQLAlchemyError as e:
@@ -1,15 +1,170 @@
-from utils.connector.postgres.module import PostgresConnector
+from utils.connector.postgres.engine import get_engine
 from variables.postgres import PostgresConfig
 from variables.helper import ConfigLoader
+from typing import Any, Dict, Iterator, List, Optional, Union
+from urllib.parse import quote
+import os
 import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
 
+# Opt-in faster read path: connectorx decodes the Postgres wire protocol
+# into Arrow buffers in Rust instead of building rows in Python. Only used
+# for queries without bound parameters, which connectorx can't send.
+USE_CONNECTORX = os.getenv("USE_CONNECTORX", "").lower() in ("1", "true", "yes")
 
-def postgres_execute_query(query: str) -> pd.DataFrame:
+
+def _dsn(postgres_config: Dict[str, Any]) -> str:
+    return (
+        f"postgresql://{quote(str(postgres_config['POSTGRES_USER']), safe='')}"
+        f":{quote(str(postgres_config['POSTGRES_PASS']), safe='')}"
+        f"@{postgres_config['POSTGRES_HOST']}:{postgres_config['POSTGRES_PORT']}"
+        f"/{postgres_config['POSTGRES_DB_NAME']}"
+    )
+
+
+def _read_connectorx(postgres_config: Dict[str, Any], query: str, dtype_backend: Optional[str]) -> pd.DataFrame:
+    import connectorx as cx
+
+    if dtype_backend == "pyarrow":
+        table = cx.read_sql(_dsn(postgres_config), query, return_type="arrow")
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    return cx.read_sql(_dsn(postgres_config), query, return_type="pandas")
+
+
+def _iter_chunks(engine, sql, chunksize: int, read_kwargs: Dict[str, Any]) -> Iterator[pd.DataFrame]:
+    # stream_results makes psycopg use a named (server-side) cursor, so
+    # only one chunk at a time is held by the driver
+    with engine.connect().execution_options(stream_results=True) as conn:
+        yield from pd.read_sql(sql, conn, chunksize=chunksize, **read_kwargs)
+
+
+def postgres_iter_query(
+    query: Union[str, TextClause],
+    params: Optional[Dict[str, Any]] = None,
+    chunksize: int = 50_000,
+    dtype_backend: Optional[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Execute a SQL query on PostgreSQL and yield the result `chunksize` rows at a time.
+
+    Rows are read through a server-side cursor, so the driver holds one
+    chunk at a time; the query must be a SELECT (or VALUES).
+
+    Args:
+        query (str | TextClause): SQL query string to execute.
+        params (dict, optional): Values for `:name` placeholders in `query`.
+        chunksize (int, optional): Rows per yielded DataFrame.
+        dtype_backend (str, optional): Passed to `pd.read_sql`.
+
+    Yields:
+        pd.DataFrame: Consecutive chunks of the result (a single empty frame
+        when there are no rows).
+
+    Raises:
+        RuntimeError: If the query execution fails.
+    """
+    try:
+        engine = get_engine()
+
+        sql = text(query) if params is not None and isinstance(query, str) else query
+        read_kwargs: Dict[str, Any] = {"params": params}
+        if dtype_backend is not None:
+            read_kwargs["dtype_backend"] = dtype_backend
+        yield from _iter_chunks(engine, sql, chunksize, read_kwargs)
+
+    except Exception as err:
+        raise RuntimeError(f"PostgreSQL query failed: {err}") from err
+
+
+def postgres_fetch_one(
+    query: Union[str, TextClause],
+    params: Optional[Dict[str, Any]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Execute a SQL query on PostgreSQL and return its first row, without
+    building a DataFrame.
+
+    Args:
+        query (str | TextClause): SQL query with `:name` placeholders.
+        params (dict, optional): Values for the placeholders.
+
+    Returns:
+        dict | None: The first row as a column -> value dict, or None if the
+        query returned no rows.
+
+    Raises:
+        RuntimeError: If the query execution fails.
+    """
+    try:
+        engine = get_engine()
+
+        sql = text(query) if isinstance(query, str) else query
+        with engine.connect() as conn:
+            row = conn.execute(sql, params or {}).mappings().first()
+        return dict(row) if row is not None else None
+
+    except Exception as err:
+        raise RuntimeError(f"PostgreSQL query failed: {err}") from err
+
+
+def postgres_fetch_all(
+    query: Union[str, TextClause],
+    params: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Execute a SQL query on PostgreSQL and return its rows as dicts, without
+    building a DataFrame. Meant for small lookups; use
+    `postgres_execute_query` for analytic results.
+
+    Args:
+        query (str | TextClause): SQL query with `:name` placeholders.
+        params (dict, optional): Values for the placeholders.
+
+    Returns:
+        list[dict]: One column -> value dict per row.
+
+    Raises:
+        RuntimeError: If the query execution fails.
+    """
+    try:
+        engine = get_engine()
+
+        sql = text(query) if isinstance(query, str) else query
+        with engine.connect() as conn:
+            return [dict(row) for row in conn.execute(sql, params or {}).mappings()]
+
+    except Exception as err:
+        raise RuntimeError(f"PostgreSQL query failed: {err}") from err
+
+
+def postgres_execute_query(
+    query: Union[str, TextClause],
+    params: Optional[Dict[str, Any]] = None,
+    chunksize: Optional[int] = None,
+    dtype_backend: Optional[str] = None,
+) -> pd.DataFrame:
     """
     Execute a SQL query on PostgreSQL and return the result as a pandas DataFrame.
 
     Args:
-        query (str): SQL query string to execute.
+        query (str | TextClause): SQL query string to execute, or a prebuilt
+            `text()` construct (e.g. a module-level constant).
+        params (dict, optional): Values for `:name` placeholders in `query`,
+            passed to the driver as bound parameters. Without `params` a
+            query string is sent as-is.
+        chunksize (int, optional): Fetch the result through a server-side
+            cursor, `chunksize` rows at a time, instead of loading it into
+            the driver in one go. The chunks are concatenated before returning.
+            Postgres only declares cursors for SELECT/VALUES queries, so leave
+            this unset for other statements.
+        dtype_backend (str, optional): Passed to `pd.read_sql`
+            ("numpy_nullable" or "pyarrow"); defaults to numpy dtypes.
+
+    With `USE_CONNECTORX=1` (and the `connectorx` extra installed), queries
+    without `params` are read with connectorx instead; `chunksize` does not
+    apply there, since connectorx already builds columns without per-row
+    Python objects.
 
     Returns:
         pd.DataFrame: Query result.
@@ -21,21 +176,23 @@ def postgres_execute_query(query: str) -> pd.DataFrame:
         # Load configuration
         postgres_config = ConfigLoader.load_single(PostgresConfig)
 
-        # Initialize connection
-        conn = PostgresConnector(
-            host=postgres_config["POSTGRES_HOST"],
-            port=postgres_config["POSTGRES_PORT"],
-            user=postgres_config["POSTGRES_USER"],
-            password=postgres_config["POSTGRES_PASS"],
-            db=postgres_config["POSTGRES_DB_NAME"],
-        )
+        if USE_CONNECTORX and params is None and isinstance(query, str):
+            return _read_connectorx(postgres_config, query, dtype_backend)
+
+        # Get the pooled SQLAlchemy engine for these settings
+        engine = get_engine(postgres_config)
 
-        # Get SQLAlchemy engine
-        engine = conn.connect_engine()
+        sql = text(query) if params is not None and isinstance(query, str) else query
+        read_kwargs: Dict[str, Any] = {"params": params}
+        if dtype_backend is not None:
+            read_kwargs["dtype_backend"] = dtype_backend
 
         # Execute query and return DataFrame
-        df = pd.read_sql(query, engine)
-        return df
+        if chunksize is None:
+            return pd.read_sql(sql, engine, **read_kwargs)
+
+        chunks = list(_iter_chunks(engine, sql, chunksize, read_kwargs))
+        return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
 
     except Exception as err:
         raise RuntimeError(f"PostgreSQL query failed: {err}") from err
@@ -0,0 +1,81 @@
+"""
+warmup.py
+
+Start-up hook that opens backend connections before the first tool call:
+the Postgres pool, the ClickHouse HTTP client and the Google service
+account token. Each backend is imported only when it is warmed, so a
+server warms (and depends on) just the drivers it uses.
+"""
+
+import logging
+import threading
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_postgres() -> None:
+    from utils.connector.postgres.engine import get_engine
+
+    # Opens one pooled connection; it goes back to the pool on close()
+    get_engine().connect().close()
+
+
+def _warm_clickhouse() -> None:
+    from utils.connector.clickhouse.providers import _get_client
+    from variables.clickhouse import ClickHouseConfig
+    from variables.helper import ConfigLoader
+
+    _get_client(ConfigLoader.load_single(ClickHouseConfig)).ping()
+
+
+def _warm_google_sheet() -> None:
+    import httplib2
+    from google_auth_httplib2 import Request
+
+    from utils.connector.google_sheet.module import load_credentials
+
+    # Services are built per worker thread, but the credentials (and their
+    # access token) are shared, so fetching the token here is what carries over
+    load_credentials().refresh(Request(httplib2.Http()))
+
+
+_WARMERS: Dict[str, Callable[[], None]] = {
+    "postgres": _warm_postgres,
+    "clickhouse": _warm_clickhouse,
+    "google_sheet": _warm_google_sheet,
+}
+
+
+def _do_warmup(backends: tuple) -> None:
+    for name in backends:
+        try:
+            _WARMERS[name]()
+            logger.info("[Warmup] %s ready", name)
+        except Exception as err:
+            # The first real call connects (and reports errors) as usual
+            logger.warning("[Warmup] %s failed: %s", name, err)
+
+
+def warmup(*backends: str) -> threading.Thread:
+    """
+    Connect to `backends` in a background thread; call once at application start.
+
+    Args:
+        *backends (str): Any of "postgres", "clickhouse", "google_sheet".
+            Defaults to all of them.
+
+    Returns:
+        threading.Thread: The (daemon) warm-up thread, already started.
+
+    Raises:
+        ValueError: If a backend name is unknown.
+    """
+    backends = backends or tuple(_WARMERS)
+    unknown = [name for name in backends if name not in _WARMERS]
+    if unknown:
+        raise ValueError(f"Unknown warmup backend(s): {unknown}. Expected {list(_WARMERS)}.")
+
+    thread = threading.Thread(target=_do_warmup, args=(backends,), name="connector-warmup", daemon=True)
+    thread.start()
+    return thread
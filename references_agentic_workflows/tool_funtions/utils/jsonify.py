@@ -0,0 +1,108 @@
+"""
+jsonify.py
+
+Fast JSON serialization of tool results (DataFrames) with orjson.
+"""
+
+import base64
+import datetime
+from decimal import Decimal
+from typing import Any, Dict, Literal
+
+import numpy as np
+import orjson
+import pandas as pd
+
+# Non-str keys: sheets read without a header row have integer column names
+_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+ResponseFormat = Literal["records", "split", "arrow"]
+
+
+def _default(obj: Any) -> Any:
+    """Handle the pandas/numpy/stdlib values orjson doesn't serialize itself."""
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, (pd.Timestamp, pd.Timedelta, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+def dumps(obj: Any) -> str:
+    """Serialize any tool response payload to a JSON string."""
+    return orjson.dumps(obj, default=_default, option=_OPTIONS).decode()
+
+
+def _arrow_ipc(df: pd.DataFrame) -> bytes:
+    """Encode a DataFrame as an Arrow IPC stream (pyarrow is imported on first use)."""
+    import pyarrow as pa
+
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # An object column mixing value types (e.g. unformatted sheet cells)
+        # has no single Arrow type; send such columns as strings
+        df = df.copy()
+        for i, dtype in enumerate(df.dtypes):
+            if dtype == object:
+                df.isetitem(i, df.iloc[:, i].astype("string"))
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def df_to_json(df: pd.DataFrame, response_format: ResponseFormat = "records") -> str:
+    """
+    Serialize a DataFrame to JSON.
+
+    Args:
+        df (pd.DataFrame): The result to serialize.
+        response_format (str):
+            - "records": JSON array of row objects, equivalent to
+              `df.to_json(orient="records", date_format="iso")` except that
+              timestamps keep microsecond precision.
+            - "split": `{"schema", "columns", "data"}` with one value array per
+              column, so column names aren't repeated for every row.
+            - "arrow": `{"format": "arrow", "encoding": "base64", "data"}`
+              where `data` is a base64 Arrow IPC stream; read it with
+              `pyarrow.ipc.open_stream(base64.b64decode(data)).read_all()`.
+
+    NaN/NaT become null in all formats. orjson already writes NaN and ±inf
+    floats as null, so no separate pass over float columns is needed.
+    """
+    if response_format == "records":
+        # Column-wise tolist() converts numpy scalars in bulk; much cheaper than
+        # df.to_dict(orient="records"), which boxes every cell separately
+        columns = list(df.columns)
+        rows = zip(*(df.iloc[:, i].tolist() for i in range(len(columns))))
+        return dumps([dict(zip(columns, row)) for row in rows])
+    if response_format == "split":
+        return dumps({
+            "schema": df.dtypes.astype(str).to_dict(),
+            "columns": list(df.columns),
+            "data": [df[c].tolist() for c in df.columns],
+        })
+    if response_format == "arrow":
+        return dumps({
+            "format": "arrow",
+            "encoding": "base64",
+            "data": base64.b64encode(_arrow_ipc(df)).decode("ascii"),
+        })
+    raise ValueError(
+        f"Unsupported response_format '{response_format}'. Expected 'records', 'split' or 'arrow'."
+    )
+
+
+def dfs_to_json(dfs: Dict[str, pd.DataFrame], response_format: ResponseFormat = "records") -> str:
+    """Serialize a dict of DataFrames to a JSON object of `key: df_to_json(df)`."""
+    return dumps({
+        key: orjson.Fragment(df_to_json(df, response_format)) for key, df in dfs.items()
+    })
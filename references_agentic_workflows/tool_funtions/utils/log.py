@@ -0,0 +1,42 @@
+"""
+log.py
+
+Non-blocking logging setup for the MCP servers: records are put on a queue by
+the calling thread (usually the event loop) and written by a background
+`QueueListener` thread.
+"""
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """
+    Route root logging through a queue drained by a background thread.
+
+    Handlers already installed on the root logger are moved behind the
+    listener; without any, a stderr handler with the `basicConfig` format is
+    used. Calling this again only updates the level.
+    """
+    global _listener
+    root = logging.getLogger()
+    root.setLevel(level)
+    if _listener is not None:
+        return
+
+    handlers = root.handlers[:] or [logging.StreamHandler()]
+    for handler in handlers:
+        if handler.formatter is None:
+            handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+        root.removeHandler(handler)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    root.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -0,0 +1,160 @@
+"""
+serving.py
+
+Shared body of the MCP servers' tool handlers: run a blocking tool function
+off the event loop, serialize its result, and turn failures into the usual
+`{"status": "ERROR", "message": ...}` response.
+"""
+
+import asyncio
+import hashlib
+import logging
+import socket
+from collections import deque
+from typing import Any, Callable, Deque, Hashable, MutableMapping, Optional
+
+from cachetools import TTLCache
+
+from utils.jsonify import df_to_json, dumps
+
+try:
+    # Present when serving through the MCP SDK; outside it calls share one scope
+    from mcp.server.lowlevel.server import request_ctx
+except ImportError:
+    request_ctx = None
+
+logger = logging.getLogger(__name__)
+
+# Agents tend to retry a failing call verbatim. After LOOP_LIMIT consecutive
+# failures of the same call with the same error in the same MCP session,
+# further identical calls from that session are answered with ABORT_LOOP
+# instead of being executed again; the streak is forgotten LOOP_RESET_SECONDS
+# after its last failure, or on a success. Only deterministic errors (bad SQL,
+# missing tables) count: connection failures and timeouts may pass on retry.
+LOOP_LIMIT = 5
+LOOP_RESET_SECONDS = 300
+_failures: TTLCache = TTLCache(maxsize=1024, ttl=LOOP_RESET_SECONDS)
+
+_TRANSIENT_ERRORS: tuple = (ConnectionError, TimeoutError, socket.gaierror)
+try:
+    from sqlalchemy.exc import DisconnectionError, InterfaceError, OperationalError
+    from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+    _TRANSIENT_ERRORS += (DisconnectionError, InterfaceError, OperationalError, PoolTimeoutError)
+except ImportError:
+    pass
+try:
+    # clickhouse-connect raises OperationalError for transport failures and
+    # DatabaseError for errors reported by the server
+    from clickhouse_connect.driver.exceptions import OperationalError as ClickHouseOperationalError
+    _TRANSIENT_ERRORS += (ClickHouseOperationalError,)
+except ImportError:
+    pass
+
+
+def error_response(err: Exception) -> str:
+    """JSON error payload returned by every tool on failure."""
+    return dumps({"status": "ERROR", "message": str(err)})
+
+
+def _session_key() -> Optional[Hashable]:
+    """Identify the MCP session of the current request (None outside one)."""
+    if request_ctx is None:
+        return None
+    try:
+        ctx = request_ctx.get()
+    except LookupError:
+        return None
+    headers = getattr(ctx.request, "headers", None)
+    session_id = headers.get("mcp-session-id") if headers is not None else None
+    return session_id or id(ctx.session)
+
+
+def _call_key(logic: Callable[..., Any], args: tuple, kwargs: dict) -> str:
+    raw = repr((_session_key(), logic.__module__, logic.__qualname__, args, sorted(kwargs.items())))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _is_transient(err: BaseException) -> bool:
+    """True if `err`, or an error it was raised from, is a connection failure or timeout."""
+    seen = set()
+    while err is not None and id(err) not in seen:
+        if isinstance(err, _TRANSIENT_ERRORS):
+            return True
+        seen.add(id(err))
+        err = err.__cause__ or err.__context__
+    return False
+
+
+def _abort_response(logic: Callable[..., Any], message: str) -> str:
+    return dumps({
+        "status": "ABORT_LOOP",
+        "message": (
+            f"{logic.__name__} failed {LOOP_LIMIT} times in a row with the same "
+            f"arguments and error; not retrying. Last error: {message}"
+        ),
+    })
+
+
+async def serve(
+    logic: Callable[..., Any],
+    *args: Any,
+    serialize: Optional[Callable[[Any], str]] = df_to_json,
+    cache: Optional[MutableMapping[Hashable, str]] = None,
+    cache_key: Optional[Hashable] = None,
+    on_progress: Optional[Callable[[int], None]] = None,
+    **kwargs: Any,
+) -> str:
+    """
+    Run `logic(*args, **kwargs)` in a worker thread and return its JSON response.
+
+    Args:
+        logic (callable): Synchronous tool function (driver call).
+        serialize (callable, optional): Turns the result into the response
+            string. Defaults to `df_to_json`; None when `logic` already
+            returns a string.
+        cache (MutableMapping, optional): Response cache consulted and filled
+            under `cache_key`. Error responses are never cached.
+        cache_key (Hashable, optional): Key for `cache`; None skips caching.
+        on_progress (callable, optional): Progress callback passed on to
+            `logic` as `on_progress=`. It is a fresh closure per request, so
+            it is left out of the key used by the failure-loop guard.
+
+    Returns:
+        str: The serialized result, an error payload if `logic` or
+        `serialize` raised, or an `ABORT_LOOP` payload when the same call
+        from the same MCP session has already failed `LOOP_LIMIT` times in a
+        row with the same deterministic (non connection/timeout) error.
+    """
+    use_cache = cache is not None and cache_key is not None
+    if use_cache:
+        payload = cache.get(cache_key)
+        if payload is not None:
+            logger.debug("[Cache] Reused %s response for %s", logic.__name__, cache_key)
+            return payload
+
+    call_key = _call_key(logic, args, kwargs)
+    streak: Optional[Deque[str]] = _failures.get(call_key)
+    if streak is not None and len(streak) == LOOP_LIMIT and len(set(streak)) == 1:
+        logger.warning("%s is failing in a loop; short-circuiting the call", logic.__name__)
+        return _abort_response(logic, streak[-1])
+
+    if on_progress is not None:
+        kwargs = {**kwargs, "on_progress": on_progress}
+
+    try:
+        result = await asyncio.to_thread(logic, *args, **kwargs)
+        payload = serialize(result) if serialize is not None else result
+    except Exception as err:
+        logger.error("%s failed: %s", logic.__name__, err)
+        if not _is_transient(err):
+            if streak is None:
+                streak = deque(maxlen=LOOP_LIMIT)
+            streak.append(str(err))
+            _failures[call_key] = streak
+        return error_response(err)
+
+    _failures.pop(call_key, None)
+
+    if use_cache:
+        cache[cache_key] = payload
+    return payload
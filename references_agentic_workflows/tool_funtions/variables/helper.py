@@ -9,9 +9,12 @@ Configuration helper module for loading environment variables.
 
 import os
 import json
+import logging
+from functools import lru_cache
 from pathlib import Path
+import orjson
 from dotenv import load_dotenv
-from typing import Type, Dict, Any, List
+from typing import Type, Dict, Any, List, Optional, Tuple
 
 
 # === [1] Load .env file if present ===
@@ -21,6 +24,15 @@ env_path = base_dir / ".env"
 if env_path.exists():
     load_dotenv(env_path)
 
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _warn_missing(config_name: str, missing: Tuple[str, ...]) -> None:
+    """Log unset variables of a config class once per distinct set."""
+    for var in missing:
+        logger.warning("Environment variable '%s' is not set (%s).", var, config_name)
+
 
 # === [2] Base configuration class ===
 class BaseConfig:
@@ -41,6 +53,10 @@ class BaseConfig:
 
     VARIABLES = []  # List of environment variable names to be loaded
 
+    # Parsed JSON variables keyed by (name, raw value): parsed once, and
+    # re-parsed only if the variable is changed
+    _JSON_CACHE: Dict[Tuple[str, str], Any] = {}
+
     @classmethod
     def load(cls, mode: str = 'basic') -> Dict[str, Any]:
         """
@@ -58,16 +74,15 @@ class BaseConfig:
         if mode != 'basic':
             raise ValueError("Invalid 'mode'. Only 'basic' is supported.")
 
-        config = {}
-        for var in cls.VARIABLES:
-            value = cls.get_variable(var)
-            if value is None:
-                print(f"⚠️ Warning: environment variable '{var}' is not set.")
-            config[var] = value
+        env = os.environ
+        config = {var: env.get(var) for var in cls.VARIABLES}
+        missing = tuple(var for var, value in config.items() if value is None)
+        if missing:
+            _warn_missing(cls.__name__, missing)
         return config
 
-    @staticmethod
-    def get_variable(name: str, default_value=None, deserialize_json=False):
+    @classmethod
+    def get_variable(cls, name: str, default_value=None, deserialize_json=False):
         """
         Retrieve an environment variable value.
 
@@ -75,6 +90,8 @@ class BaseConfig:
             name (str): The environment variable name.
             default_value (any, optional): Fallback value if not found. Defaults to None.
             deserialize_json (bool, optional): If True, parse the value as JSON.
+                The parsed object is cached and shared between calls, so treat
+                it as read-only.
 
         Returns:
             str | dict | None: The environment variable value (optionally parsed as JSON).
@@ -84,10 +101,16 @@ class BaseConfig:
         """
         value = os.getenv(name, default_value)
         if deserialize_json and value:
+            key = (name, value)
             try:
-                return json.loads(value)
+                return cls._JSON_CACHE[key]
+            except KeyError:
+                pass
+            try:
+                parsed = cls._JSON_CACHE[key] = orjson.loads(value)
             except json.JSONDecodeError:
                 raise ValueError(f"Invalid JSON format in environment variable '{name}'.")
+            return parsed
         return value
 
 
@@ -108,23 +131,48 @@ class ConfigLoader:
     # Load multiple configs
     >>> merged = ConfigLoader.load_multiple([ClickHouseConfig, AnotherConfig])
     >>> print(merged)
+
+    Each class is loaded from the environment once per process; call
+    `ConfigLoader.reload()` after changing environment variables (e.g. in tests).
     """
 
-    @staticmethod
-    def load_single(config_cls: Type[BaseConfig]) -> Dict[str, Any]:
+    _cache: Dict[Type[BaseConfig], Dict[str, Any]] = {}
+
+    @classmethod
+    def load_single(cls, config_cls: Type[BaseConfig]) -> Dict[str, Any]:
         """
         Load environment variables from a single configuration class.
 
+        The result is cached per class and shared between callers, so treat
+        it as read-only.
+
         Args:
             config_cls (Type[BaseConfig]): The configuration class.
 
         Returns:
             dict: Dictionary of variable names and their values.
         """
-        return config_cls.load()
+        config = cls._cache.get(config_cls)
+        if config is None:
+            config = cls._cache.setdefault(config_cls, config_cls.load())
+        return config
+
+    @classmethod
+    def reload(cls, config_cls: Optional[Type[BaseConfig]] = None) -> None:
+        """
+        Drop cached configs so the next load reads the environment again.
 
-    @staticmethod
-    def load_multiple(config_classes: List[Type[BaseConfig]]) -> Dict[str, Any]:
+        Args:
+            config_cls (Type[BaseConfig], optional): Only forget this class.
+                Defaults to every cached class.
+        """
+        if config_cls is None:
+            cls._cache.clear()
+        else:
+            cls._cache.pop(config_cls, None)
+
+    @classmethod
+    def load_multiple(cls, config_classes: List[Type[BaseConfig]]) -> Dict[str, Any]:
         """
         Load and merge environment variables from multiple configuration classes.
 
@@ -137,5 +185,5 @@ class ConfigLoader:
         """
         merged = {}
         for cfg_cls in config_classes:
-            merged.update(cfg_cls.load())
+            merged.update(cls.load_single(cfg_cls))
         return merged